@@ -17,6 +17,18 @@ class Config:
     STATIC_FOLDER = 'static'
     TEMPLATE_FOLDER = 'templates'
     PLOTS_DIR = os.path.join(STATIC_FOLDER, 'plots')
+    PLOTS_MAX_BYTES = 200 * 1024 * 1024
+    PLOTS_MAX_AGE = 7 * 24 * 3600  # segundos sin uso
+    PLOTS_EVICTION_INTERVAL = 60  # segundos entre limpiezas
+    PLOT_CACHE_MAX_AGE = 365 * 24 * 3600  # Cache-Control para /static/plots
+    PLOT_ASYNC = True  # /calculate no espera a la gráfica
+    PLOT_WORKERS = 2
+    PLOT_JOBS_SIZE = 1024
+    # Cada long-poll o stream SSE ocupa un hilo del servidor mientras espera
+    # (con workers sync de gunicorn, el worker entero): mantenerlo corto
+    PLOT_LONGPOLL_TIMEOUT = 10  # segundos
+    PLOT_POLL_INTERVAL = 0.25  # segundos entre consultas al marcador de otro proceso
+    PLOT_PENDING_MAX_AGE = 120  # segundos tras los que un marcador pendiente se ignora
     
     # Matplotlib
     MATPLOTLIB_STYLE = 'seaborn-v0_8-darkgrid'
@@ -25,9 +37,66 @@ class Config:
     FONT_SIZE = 10
     
     # Integration
-    MAX_PLOT_POINTS = 1000
+    MAX_PLOT_POINTS = 1000  # presupuesto de evaluaciones por curva
     PLOT_MARGIN_PERCENT = 0.2
     DEFAULT_PLOT_RANGE = (-10, 10)
+    PLOT_INITIAL_POINTS = 65  # grilla gruesa antes de refinar
+    PLOT_MAX_DEPTH = 10  # rondas de refinamiento
+    PLOT_TOLERANCE = 1e-3  # desvío de la cuerda, relativo a la altura visible
+    PLOT_JUMP_RATIO = 0.01  # salto mínimo (relativo) para cortar la línea
+    PLOT_VIEW_PERCENTILE = 2  # percentiles que definen la altura visible
+    DEFAULT_INTEGRATION_MODE = 'auto'  # numeric | symbolic | auto
+    QUADRATURE_TOLERANCE = 1e-10
+    QUADRATURE_MAX_INTERVALS = 2048
+    
+    # Verification
+    VERIFICATION_MODE = 'auto'  # numeric | symbolic | auto
+    VERIFICATION_POINTS = 12
+    VERIFICATION_RANGE = 4.0
+    VERIFICATION_TOLERANCE = 1e-8
+    VERIFICATION_PRECISION = 30  # dígitos para mpmath
+    VERIFICATION_SEED = None  # semilla de los puntos aleatorios (None = puntos nuevos en cada verificación)
+    
+    # Engine (pool de procesos para integrar con tiempo límite)
+    ENGINE_ENABLED = True
+    # Al menos 2 workers aun con una sola CPU: con uno, los términos de una
+    # suma no se pueden aislar y un término lento agota toda la petición
+    ENGINE_WORKERS = int(os.environ.get('ENGINE_WORKERS', max(2, min(os.cpu_count() or 2, 4))))
+    ENGINE_START_METHOD = 'forkserver'
+    INTEGRATION_TIMEOUT = float(os.environ.get('INTEGRATION_TIMEOUT', 15))  # segundos
+    PARALLEL_TERMS_MIN = 6  # términos nuevos a partir de los cuales se integran en paralelo
+    TERM_TIMEOUT = float(os.environ.get('TERM_TIMEOUT', 5))  # segundos por término
+    TERM_FAILURE_TTL = 60  # segundos antes de reintentar un término que excedió su tiempo
+    # En modo auto/numeric con límites, la parte simbólica tiene este tiempo
+    # una vez que la cuadratura ya dio el valor
+    AUTO_SYMBOLIC_TIMEOUT = float(os.environ.get('AUTO_SYMBOLIC_TIMEOUT', 3))  # segundos
+    PARTIAL_RESULT_TIMEOUT = float(os.environ.get('PARTIAL_RESULT_TIMEOUT', 3))  # segundos para el resultado parcial numérico
+    
+    # Metrics
+    METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # 0 = desactivado
+    PROFILE_THRESHOLD = float(os.environ.get('PROFILE_THRESHOLD', 2))  # segundos
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    
+    # Batch
+    BATCH_MAX_ITEMS = 500
+    
+    # Value tables
+    TABLE_MAX_VALUES = 100000  # valores explícitos en "x"
+    TABLE_MAX_POINTS = 10000000  # puntos de un rango (sólo en streaming)
+    TABLE_JSON_MAX_POINTS = 10000  # puntos en una respuesta JSON normal
+    TABLE_CHUNK_SIZE = 8192
+    INTERVALS_MAX = 100000  # intervalos por petición en /calculate/intervals
+    SWEEP_MAX_POINTS = 1000000  # puntos de la grilla parámetros x intervalos
+    
+    # Cache
+    RESULT_CACHE_SIZE = 512
+    RESULT_CACHE_TTL = 3600  # segundos
+    PROCEDURE_CACHE_SIZE = 512
+    PARSE_CACHE_SIZE = 1024
+    TERM_CACHE_SIZE = 4096
+    KERNEL_CACHE_SIZE = 512
+    LATEX_CACHE_SIZE = 4096
 
 
 class DevelopmentConfig(Config):
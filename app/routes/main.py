@@ -3,16 +3,64 @@ Main Routes
 Rutas principales de la aplicación
 """
 
-from flask import Blueprint, render_template, request, jsonify, send_from_directory
+from flask import (Blueprint, Response, g, render_template, request, jsonify,
+                   send_from_directory, stream_with_context)
+import json
+import math
 import os
+import re
+import time
 
 from app.config import config
-from app.services.integration import calculate_integral
-from app.utils.plotter import plot_function
+from app.services.batch import iter_batch_results
+from app.services.engine import (run_integral, run_interval_integrals, run_parametric_sweep,
+                                 run_procedure)
+from app.services.evaluation import (TABLE_FORMATS, iter_table_csv, iter_table_ndjson,
+                                     prepare_table, read_table_grid, table_json)
+from app.services.integration import INTEGRATION_MODES, get_cache_stats
+from app.services.plot_jobs import plot_file, submit_plot, wait_for_plot
+from app.utils.latex import latex_scope
+from app.utils.metrics import (increment, metrics_scope, observe_request, render_prometheus,
+                               server_timing, timed)
+from app.utils.parser import get_parse_cache_stats
+from app.utils.plotter import plot_data, plot_function
 
 # Crear blueprint
 main_bp = Blueprint('main', __name__)
 
+PLOT_MODES = ('image', 'data', 'none')
+
+
+@main_bp.before_request
+def start_request_timer():
+    """Marca el inicio de la petición para las métricas"""
+    g.request_start = time.perf_counter()
+
+
+@main_bp.after_request
+def record_request_metrics(response):
+    """Registra la latencia y el código de estado de cada petición"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    start = g.get('request_start')
+    if start is not None:
+        observe_request(endpoint, time.perf_counter() - start)
+    increment('requests', endpoint=endpoint, status=response.status_code)
+    return response
+
+
+@main_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Métricas del proceso en formato de texto de Prometheus
+    
+    Incluye histogramas de latencia por etapa y por endpoint, contadores de
+    peticiones y de fallos del motor, y los aciertos de las cachés. Cada
+    proceso (p. ej. cada worker de gunicorn) expone sus propios valores.
+    """
+    cache_stats = {'parse': get_parse_cache_stats(), **get_cache_stats()}
+    return Response(render_prometheus(cache_stats),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 
 @main_bp.route('/')
 def index():
@@ -29,61 +77,511 @@ def calculate():
         {
             "function": "x^2",
             "lower_limit": "0" (opcional),
-            "upper_limit": "1" (opcional)
+            "upper_limit": "1" (opcional),
+            "mode": "auto" (opcional: numeric | symbolic | auto),
+            "include_procedure": true (opcional; si es false se pide luego en /procedure),
+            "plot_mode": "image" (opcional: image | data | none),
+            "profile": false (opcional; agrega "profiling" con los tiempos de la petición)
         }
     """
     try:
         data = request.get_json()
         
-        if not data or 'function' not in data:
+        params, error = _read_calculation_params(data)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'No se proporcionó ninguna función'
+                'error': error
             }), 400
         
-        func_str = data['function'].strip()
-        lower_limit = data.get('lower_limit', '').strip()
-        upper_limit = data.get('upper_limit', '').strip()
-        
-        # Validar función
-        if not func_str:
+        func_str, lower, upper, mode = params
+        include_procedure = bool(data.get('include_procedure', True))
+        profile = bool(data.get('profile', False))
+        plot_mode = data.get('plot_mode') or 'image'
+        if plot_mode not in PLOT_MODES:
             return jsonify({
                 'success': False,
-                'error': 'La función no puede estar vacía'
+                'error': f'Modo de gráfica no válido. Use uno de: {", ".join(PLOT_MODES)}'
             }), 400
         
-        # Convertir límites a None si están vacíos
-        lower = lower_limit if lower_limit else None
-        upper = upper_limit if upper_limit else None
+        # Cada petición tiene su memo LaTeX y sus tiempos por etapa
+        start = time.perf_counter()
+        with metrics_scope() as timings, latex_scope() as latex_stats:
+            # Calcular integral
+            result = run_integral(func_str, lower, upper, mode, include_procedure)
+            
+            if result['success']:
+                with timed('plot'):
+                    _attach_plot(result, func_str, lower, upper, plot_mode)
         
-        # Validar límites
-        if (lower is None) != (upper is None):
-            return jsonify({
-                'success': False,
-                'error': 'Debe proporcionar ambos límites o ninguno'
-            }), 400
+        elapsed = time.perf_counter() - start
+        if profile:
+            result['profiling'] = _profiling(elapsed, latex_stats)
         
-        # Calcular integral
-        result = calculate_integral(func_str, lower, upper)
+        if result['success']:
+            status = 200
+        else:
+            status = 504 if result.get('error_type') == 'timeout' else 400
         
-        if not result['success']:
-            return jsonify(result), 400
+        response = jsonify(result)
+        response.status_code = status
+        response.headers['Server-Timing'] = server_timing(timings, elapsed)
+        return response
         
-        # Generar gráfica
-        plot_filename = plot_function(func_str, lower, upper)
-        if plot_filename:
-            result['plot_url'] = f'/static/plots/{plot_filename}'
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error del servidor: {str(e)}'
+        }), 500
+
+
+@main_bp.route('/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """
+    API endpoint para calcular muchas integrales en una sola petición
+    
+    Los resultados se transmiten como NDJSON (un objeto JSON por línea) en
+    orden de finalización, cada uno con el campo "index" del elemento.
+    
+    JSON esperado:
+        {
+            "items": [{"function": "x^2", "lower_limit": "0", "upper_limit": "1"}, ...],
+            "mode": "auto" (opcional),
+            "lean": true (opcional: omitir gráficas y procedimientos)
+        }
+    """
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'success': False,
+            'error': 'Debe proporcionar una lista de funciones en "items"'
+        }), 400
+    
+    if len(items) > config.BATCH_MAX_ITEMS:
+        return jsonify({
+            'success': False,
+            'error': f'El lote no puede tener más de {config.BATCH_MAX_ITEMS} funciones'
+        }), 400
+    
+    mode = data.get('mode') or None
+    lean = bool(data.get('lean', False))
+    
+    # Validar cada elemento antes de empezar a transmitir
+    jobs = []
+    invalid = []
+    for index, item in enumerate(items):
+        if isinstance(item, dict) and mode and not item.get('mode'):
+            item = dict(item, mode=mode)
+        params, error = _read_calculation_params(item)
+        if error:
+            invalid.append({'index': index, 'success': False, 'error': error})
+        else:
+            jobs.append((index, params))
+    
+    def generate():
+        for result in invalid:
+            yield json.dumps(result) + '\n'
+        for result in iter_batch_results(jobs, include_plot=not lean,
+                                         include_procedure=not lean):
+            yield json.dumps(result) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@main_bp.route('/calculate/intervals', methods=['POST'])
+def calculate_intervals():
+    """
+    API endpoint para integrar una función sobre muchos intervalos
+    
+    La antiderivada se calcula una sola vez y se evalúa en todos los
+    extremos; los intervalos sin forma cerrada se resuelven por cuadratura.
+    
+    JSON esperado:
+        {
+            "function": "x^2",
+            "intervals": [[0, 1], [1, 2], ...]
+        }
+    o, para el área acumulada desde a hasta cada x:
+        {
+            "function": "x^2",
+            "cumulative": {"from": 0, "x": [...]} o {"from": 0, "start": 0, "stop": 5, "step": 0.1}
+        }
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not str(data.get('function') or '').strip():
+        return jsonify({
+            'success': False,
+            'error': 'No se proporcionó ninguna función'
+        }), 400
+    
+    limits, error = _read_intervals(data)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    
+    result = run_interval_integrals(str(data['function']).strip(), *limits)
+    if not result.get('success'):
+        status = 504 if result.get('error_type') == 'timeout' else 400
+        return jsonify(result), status
+    
+    return jsonify(result)
+
+
+@main_bp.route('/calculate/sweep', methods=['POST'])
+def calculate_sweep():
+    """
+    API endpoint para integrar una función con parámetros sobre una grilla
+    
+    La antiderivada se resuelve una sola vez con los parámetros libres y se
+    evalúa en el producto cartesiano de sus valores y los intervalos.
+    
+    JSON esperado:
+        {
+            "function": "a*sin(b*x)",
+            "parameters": {"a": [1, 2], "b": [0, 0.5, 1]},
+            "intervals": [[0, 1], ...] (o "cumulative", como en /calculate/intervals)
+        }
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not str(data.get('function') or '').strip():
+        return jsonify({
+            'success': False,
+            'error': 'No se proporcionó ninguna función'
+        }), 400
+    
+    parameters, error = _read_parameters(data.get('parameters'))
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    
+    limits, error = _read_intervals(data)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    
+    points = len(limits[0])
+    for values in parameters.values():
+        points *= len(values)
+    if points > config.SWEEP_MAX_POINTS:
+        return jsonify({
+            'success': False,
+            'error': f'La grilla no puede tener más de {config.SWEEP_MAX_POINTS} puntos'
+        }), 400
+    
+    result = run_parametric_sweep(str(data['function']).strip(), parameters, *limits)
+    if not result.get('success'):
+        status = 504 if result.get('error_type') == 'timeout' else 400
+        return jsonify(result), status
+    
+    return jsonify(result)
+
+
+def _read_parameters(parameters):
+    """
+    Valida los valores de los parámetros de un barrido
+    
+    Returns:
+        tuple: ({nombre: [valores]}, None) si son válidos, o (None, mensaje de error)
+    """
+    if not isinstance(parameters, dict) or not parameters:
+        return None, 'Debe proporcionar "parameters" como {nombre: [valores]}'
+    
+    values_by_name = {}
+    for name, values in parameters.items():
+        if not isinstance(values, list) or not values:
+            return None, f'El parámetro "{name}" debe tener una lista de valores'
+        try:
+            values = [float(value) for value in values]
+        except (TypeError, ValueError):
+            return None, f'Los valores del parámetro "{name}" deben ser numéricos'
+        if not all(math.isfinite(value) for value in values):
+            return None, f'Los valores del parámetro "{name}" deben ser finitos'
+        values_by_name[name] = values
+    return values_by_name, None
+
+
+def _read_intervals(data):
+    """
+    Extrae los límites de una petición de intervalos
+    
+    Returns:
+        tuple: ((lowers, uppers), None) si es válida, o (None, mensaje de error)
+    """
+    if data.get('cumulative') is not None:
+        cumulative = data['cumulative']
+        if not isinstance(cumulative, dict):
+            return None, '"cumulative" debe ser un objeto con "from" y los puntos x'
+        try:
+            origin = float(cumulative.get('from', 0))
+        except (TypeError, ValueError):
+            return None, 'El punto "from" debe ser numérico'
         
-        return jsonify(result)
+        grid, error = read_table_grid(cumulative)
+        if error:
+            return None, error
+        if grid.count > config.INTERVALS_MAX:
+            return None, f'No se pueden calcular más de {config.INTERVALS_MAX} intervalos'
         
+        uppers = [value for chunk in grid.chunks(config.TABLE_CHUNK_SIZE) for value in chunk.tolist()]
+        return ([origin] * len(uppers), uppers), None
+    
+    intervals = data.get('intervals')
+    if not isinstance(intervals, list) or not intervals:
+        return None, 'Debe proporcionar "intervals" o "cumulative"'
+    if len(intervals) > config.INTERVALS_MAX:
+        return None, f'No se pueden calcular más de {config.INTERVALS_MAX} intervalos'
+    
+    try:
+        lowers = [float(pair[0]) for pair in intervals]
+        uppers = [float(pair[1]) for pair in intervals]
+    except (TypeError, ValueError, IndexError, KeyError):
+        return None, 'Cada intervalo debe ser un par [inferior, superior] numérico'
+    
+    if not all(math.isfinite(value) for value in lowers + uppers):
+        return None, 'Los límites de los intervalos deben ser finitos'
+    return (lowers, uppers), None
+
+
+@main_bp.route('/table', methods=['POST'])
+def value_table():
+    """
+    API endpoint para tabular f(x) y su antiderivada F(x)
+    
+    JSON esperado:
+        {
+            "function": "x^2",
+            "x": [0, 0.5, 1] o bien "start": 0, "stop": 1, "step": 0.001,
+            "format": "json" (opcional: json | ndjson | csv)
+        }
+    
+    Los formatos ndjson y csv se transmiten por bloques y admiten grillas
+    mucho más grandes que json.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not str(data.get('function') or '').strip():
+        return jsonify({
+            'success': False,
+            'error': 'No se proporcionó ninguna función'
+        }), 400
+    
+    output_format = data.get('format') or 'json'
+    if output_format not in TABLE_FORMATS:
+        return jsonify({
+            'success': False,
+            'error': f'Formato no válido. Use uno de: {", ".join(TABLE_FORMATS)}'
+        }), 400
+    
+    grid, error = read_table_grid(data)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    
+    if output_format == 'json' and grid.count > config.TABLE_JSON_MAX_POINTS:
+        return jsonify({
+            'success': False,
+            'error': f'Para más de {config.TABLE_JSON_MAX_POINTS} puntos use format "ndjson" o "csv"'
+        }), 400
+    
+    table = prepare_table(str(data['function']).strip())
+    if not table['success']:
+        status = 504 if table.get('error_type') == 'timeout' else 400
+        return jsonify(table), status
+    
+    if output_format == 'json':
+        return jsonify(table_json(table, grid))
+    
+    if output_format == 'csv':
+        return Response(stream_with_context(iter_table_csv(table, grid)), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename="tabla.csv"'})
+    
+    return Response(stream_with_context(iter_table_ndjson(table, grid)),
+                    mimetype='application/x-ndjson')
+
+
+@main_bp.route('/procedure', methods=['GET'])
+def procedure():
+    """
+    API endpoint para obtener el procedimiento paso a paso bajo demanda
+    
+    Parámetros de consulta:
+        id: result_id retornado por /calculate
+        function: función original (alternativa o respaldo al id)
+    """
+    result_id = request.args.get('id', '').strip() or None
+    func_str = request.args.get('function', '').strip() or None
+    
+    if result_id is None and func_str is None:
+        return jsonify({
+            'success': False,
+            'error': 'Debe proporcionar el id del resultado o la función'
+        }), 400
+    
+    try:
+        result = run_procedure(func_str, result_id)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'Error del servidor: {str(e)}'
         }), 500
+    
+    if not result['success']:
+        status = {'timeout': 504, 'not_found': 404}.get(result.get('error_type'), 400)
+        return jsonify(result), status
+    
+    return jsonify(result)
+
+
+def _read_calculation_params(data):
+    """
+    Extrae y valida los parámetros de una petición de cálculo
+    
+    Returns:
+        tuple: ((func_str, lower, upper, mode), None) si es válida,
+            o (None, mensaje de error)
+    """
+    if not isinstance(data, dict) or 'function' not in data:
+        return None, 'No se proporcionó ninguna función'
+    
+    func_str = str(data['function']).strip()
+    lower_limit = _as_text(data.get('lower_limit'))
+    upper_limit = _as_text(data.get('upper_limit'))
+    mode = data.get('mode') or None
+    
+    # Validar función
+    if not func_str:
+        return None, 'La función no puede estar vacía'
+    
+    # Convertir límites a None si están vacíos
+    lower = lower_limit if lower_limit else None
+    upper = upper_limit if upper_limit else None
+    
+    # Validar límites
+    if (lower is None) != (upper is None):
+        return None, 'Debe proporcionar ambos límites o ninguno'
+    
+    # Validar modo de integración
+    if mode is not None and mode not in INTEGRATION_MODES:
+        return None, f'Modo no válido. Use uno de: {", ".join(INTEGRATION_MODES)}'
+    
+    return (func_str, lower, upper, mode), None
+
+
+def _as_text(value):
+    """Convierte un valor opcional del JSON a string sin espacios"""
+    return '' if value is None else str(value).strip()
+
+
+def _attach_plot(result, func_str, lower, upper, plot_mode):
+    """Agrega al resultado la gráfica según el modo pedido"""
+    # Datos muestreados para dibujar en el cliente (sin matplotlib)
+    if plot_mode == 'data':
+        result['plot_data'] = plot_data(func_str, lower, upper)
+    
+    # Generar gráfica (en segundo plano; se obtiene luego por /plot/<id>)
+    elif plot_mode == 'none':
+        pass
+    elif config.PLOT_ASYNC:
+        job_id = submit_plot(func_str, lower, upper)
+        if job_id is None:
+            return
+        result['plot_job'] = job_id
+        plot_status = wait_for_plot(job_id)
+        if plot_status['status'] == 'ready':
+            result['plot_url'] = plot_status['plot_url']
+    else:
+        plot_filename = plot_function(func_str, lower, upper)
+        if plot_filename:
+            result['plot_url'] = f'/static/plots/{plot_filename}'
+
+
+def _profiling(total_time, latex_stats):
+    """Tiempos de una petición de /calculate y la parte que tomó la impresión LaTeX"""
+    latex_profile = latex_stats.stats()
+    latex_profile['share'] = round(latex_stats.time / total_time, 4) if total_time > 0 else 0.0
+    return {'total_time': round(total_time, 6), 'latex': latex_profile}
+
+
+@main_bp.route('/plot/<job_id>', methods=['GET'])
+def plot_image(job_id):
+    """
+    Sirve la imagen de un trabajo de gráfica cuando está lista
+    
+    Parámetros de consulta:
+        wait: segundos a esperar si aún no está lista (long-poll)
+    """
+    if not _PLOT_JOB_ID.fullmatch(job_id):
+        return jsonify({'success': False, 'error': 'Id de gráfica no válido'}), 404
+    
+    status = wait_for_plot(job_id, _wait_seconds())
+    if status['status'] == 'ready':
+        return serve_plot(plot_file(job_id))
+    return _plot_status_response(status)
+
+
+@main_bp.route('/plot/<job_id>/status', methods=['GET'])
+def plot_status(job_id):
+    """
+    Estado de un trabajo de gráfica en JSON (long-poll con ?wait=segundos)
+    """
+    if not _PLOT_JOB_ID.fullmatch(job_id):
+        return jsonify({'success': False, 'error': 'Id de gráfica no válido'}), 404
+    
+    return _plot_status_response(wait_for_plot(job_id, _wait_seconds()))
+
+
+@main_bp.route('/plot/<job_id>/events', methods=['GET'])
+def plot_events(job_id):
+    """
+    Server-Sent Events: emite un evento 'ready' o 'error' cuando termina la gráfica
+    
+    El stream dura a lo sumo config.PLOT_LONGPOLL_TIMEOUT segundos; si la
+    gráfica sigue pendiente se cierra y EventSource se reconecta, para no
+    retener un worker sync de gunicorn durante todo el renderizado.
+    """
+    if not _PLOT_JOB_ID.fullmatch(job_id):
+        return jsonify({'success': False, 'error': 'Id de gráfica no válido'}), 404
+    
+    def generate():
+        status = wait_for_plot(job_id, config.PLOT_LONGPOLL_TIMEOUT)
+        if status['status'] == 'pending':
+            yield 'retry: 1000\n\n'
+            return
+        yield f"event: {status['status']}\ndata: {json.dumps(status)}\n\n"
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Los ids de gráfica son hashes hexadecimales (ver plotter.plot_filename)
+_PLOT_JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+
+def _wait_seconds():
+    """Lee ?wait= acotado a config.PLOT_LONGPOLL_TIMEOUT"""
+    try:
+        wait = float(request.args.get('wait', 0))
+    except ValueError:
+        wait = 0
+    return max(0.0, min(wait, config.PLOT_LONGPOLL_TIMEOUT))
+
+
+def _plot_status_response(status):
+    """Convierte el estado de un trabajo de gráfica en respuesta HTTP"""
+    http_status = {'ready': 200, 'pending': 202, 'error': 500, 'unknown': 404}[status['status']]
+    return jsonify(status), http_status
 
 
 @main_bp.route('/static/plots/<filename>')
 def serve_plot(filename):
-    """Sirve imágenes de gráficas"""
-    return send_from_directory(config.PLOTS_DIR, filename)
+    """
+    Sirve imágenes de gráficas
+    
+    El nombre del archivo es un hash de su contenido, así que la respuesta
+    se puede cachear como inmutable (con ETag para revalidaciones).
+    """
+    response = send_from_directory(os.path.abspath(config.PLOTS_DIR), filename,
+                                   max_age=config.PLOT_CACHE_MAX_AGE,
+                                   etag=os.path.splitext(filename)[0])
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -3,6 +3,7 @@ Services Package
 Inicialización del paquete de servicios
 """
 
-from app.services.integration import calculate_integral
+from app.services.integration import calculate_integral, get_cache_stats
+from app.services.engine import run_integral
 
-__all__ = ['calculate_integral']
+__all__ = ['calculate_integral', 'get_cache_stats', 'run_integral']
@@ -0,0 +1,80 @@
+"""
+Batch Service
+Cálculo de muchas integrales repartidas entre los workers del motor
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.config import config
+from app.services.engine import run_integral
+from app.services.plot_jobs import submit_plot, wait_for_plot
+from app.utils.plotter import plot_function
+
+
+def iter_batch_results(jobs, include_plot=True, include_procedure=True):
+    """
+    Calcula un lote de integrales y produce cada resultado apenas está listo
+
+    Los elementos se reparten entre los procesos del motor de integración,
+    así que los resultados salen en orden de finalización, no de entrada.
+
+    Args:
+        jobs (list): Lista de tuplas (index, (func_str, lower, upper, mode))
+        include_plot (bool): Agregar la gráfica de cada función (ver _attach_plot)
+        include_procedure (bool): Generar el procedimiento paso a paso
+
+    Yields:
+        dict: Resultado de cada integral con el campo 'index'
+    """
+    if not jobs:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(config.ENGINE_WORKERS, len(jobs)))
+    try:
+        futures = {
+            executor.submit(_calculate, params, include_plot, include_procedure): index
+            for index, params in jobs
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': f'Error del servidor: {str(e)}'}
+
+            result['index'] = index
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _calculate(params, include_plot, include_procedure):
+    """Calcula un elemento del lote y le agrega su gráfica (en el hilo del pool)"""
+    func_str, lower, upper, mode = params
+    result = run_integral(func_str, lower, upper, mode, include_procedure=include_procedure)
+    if include_plot and result.get('success'):
+        _attach_plot(result, func_str, lower, upper)
+    return result
+
+
+def _attach_plot(result, func_str, lower, upper):
+    """
+    Agrega la gráfica sin esperar a matplotlib
+
+    Con config.PLOT_ASYNC la gráfica se encola y el resultado lleva el id del
+    trabajo ('plot_job', consultable en /plot/<id>) y 'plot_url' sólo si ya
+    estaba lista; si no, se renderiza aquí mismo, dentro del hilo del elemento.
+    """
+    if config.PLOT_ASYNC:
+        job_id = submit_plot(func_str, lower, upper)
+        if job_id is None:
+            return
+        result['plot_job'] = job_id
+        plot_status = wait_for_plot(job_id)
+        if plot_status['status'] == 'ready':
+            result['plot_url'] = plot_status['plot_url']
+    else:
+        plot_filename = plot_function(func_str, lower, upper)
+        if plot_filename:
+            result['plot_url'] = f'/static/plots/{plot_filename}'
@@ -0,0 +1,538 @@
+"""
+Integration Engine
+Pool de procesos precalentados con presupuesto de tiempo por petición
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import config
+from app.utils.latex import current_latex_scope
+from app.utils.metrics import increment, observe_timings, profiled, timed
+from app.services.integration import (
+    cache_integral_result, cache_procedure, calculate_antiderivative, calculate_integral,
+    calculate_integral_with_terms, calculate_interval_integrals, calculate_numeric_integral,
+    calculate_numeric_only,
+    calculate_parametric_sweep, calculate_procedure, calculate_procedure_with_terms,
+    get_cached_integral, get_cached_procedure, get_pending_terms, get_term_failures,
+    get_term_integrals, index_result_function, integrate_term, mark_term_failed,
+    needs_expansion, resolve_result_function, seed_term_integrals, split_terms,
+    store_term_integral,
+)
+
+
+class EngineTimeout(Exception):
+    """La tarea excedió su presupuesto de tiempo y el worker fue reemplazado"""
+
+
+class EngineBusy(EngineTimeout):
+    """No hubo un worker libre dentro del presupuesto (la tarea no llegó a ejecutarse)"""
+
+
+class EngineError(Exception):
+    """El worker terminó de forma inesperada mientras ejecutaba la tarea"""
+
+
+class WorkerPool:
+    """
+    Pool de procesos worker que ya importaron SymPy
+
+    Cada worker atiende una tarea a la vez a través de un Pipe. Si una tarea
+    excede su presupuesto de tiempo, el worker se mata y se reemplaza por uno
+    nuevo, de modo que una integral patológica no bloquea al servidor.
+    """
+
+    def __init__(self, size, start_method=None, preload=()):
+        """
+        Args:
+            size (int): Número de procesos worker
+            start_method (str, optional): Método de inicio de multiprocessing
+            preload (tuple): Módulos a importar en los workers antes de atender tareas
+        """
+        self.size = size
+        self._context = _get_context(start_method, preload)
+        self._preload = tuple(preload)
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def run(self, func, args=(), kwargs=None, timeout=None):
+        """
+        Ejecuta func(*args, **kwargs) en un worker
+
+        Args:
+            func: Función a nivel de módulo (debe poder serializarse)
+            args (tuple): Argumentos posicionales
+            kwargs (dict, optional): Argumentos con nombre
+            timeout (float, optional): Presupuesto total en segundos; la espera
+                por un worker libre se descuenta del tiempo de ejecución
+
+        Returns:
+            Valor retornado por func
+
+        Raises:
+            EngineTimeout: Si se excede el presupuesto
+            EngineError: Si el worker muere o la tarea lanza una excepción
+        """
+        if self._closed:
+            raise EngineError('El pool de integración está cerrado')
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise EngineBusy('No hay workers disponibles dentro del tiempo límite')
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            # El worker está sano: vuelve al pool sin haber recibido la tarea
+            self._idle.put(worker)
+            raise EngineBusy('No hay workers disponibles dentro del tiempo límite')
+
+        try:
+            worker.conn.send((func, args, kwargs or {}))
+            if not worker.conn.poll(remaining):
+                self._replace(worker)
+                worker = None
+                raise EngineTimeout('La tarea excedió el tiempo límite')
+
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            self._replace(worker)
+            worker = None
+            raise EngineError('El proceso de integración terminó inesperadamente')
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+        if status == 'error':
+            raise EngineError(payload)
+        return payload
+
+    def shutdown(self):
+        """Termina todos los workers"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+
+        for worker in workers:
+            worker.stop()
+
+    def _spawn(self):
+        """Crea un nuevo worker y lo registra en el pool"""
+        worker = _Worker(self._context, self._preload)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _replace(self, worker):
+        """Mata un worker colgado o caído y pone uno nuevo en su lugar"""
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+
+class _Worker:
+    """Proceso worker con su extremo del Pipe"""
+
+    def __init__(self, context, preload):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, os.getpid(), preload),
+            daemon=False,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        """Mata el proceso sin esperar a que termine su tarea"""
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+def _worker_main(conn, parent_pid, preload):
+    """Bucle principal de un worker: recibe tareas y envía resultados"""
+    for module in preload:
+        __import__(module)
+
+    while True:
+        # Salir si el proceso padre desapareció
+        while not conn.poll(1.0):
+            if not _parent_alive(parent_pid):
+                return
+
+        try:
+            func, args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        try:
+            conn.send(('ok', func(*args, **kwargs)))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+
+def _parent_alive(pid):
+    """Indica si el proceso con ese pid sigue vivo"""
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _get_context(start_method, preload):
+    """Obtiene el contexto de multiprocessing, precargando módulos en el forkserver"""
+    methods = multiprocessing.get_all_start_methods()
+    if start_method not in methods:
+        start_method = 'forkserver' if 'forkserver' in methods else 'spawn'
+
+    context = multiprocessing.get_context(start_method)
+    if start_method == 'forkserver' and preload:
+        context.set_forkserver_preload(list(preload))
+    return context
+
+
+# Pool compartido del proceso (se crea al primer uso, después del fork de gunicorn)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Retorna el pool de integración del proceso, creándolo si es necesario"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = WorkerPool(
+                config.ENGINE_WORKERS,
+                start_method=config.ENGINE_START_METHOD,
+                preload=('sympy', 'app.services.integration'),
+            )
+            atexit.register(_engine.shutdown)
+        return _engine
+
+
+def run_integral(func_str, lower_limit=None, upper_limit=None, mode=None,
+                 include_procedure=True):
+    """
+    Calcula la integral en el pool de workers respetando config.INTEGRATION_TIMEOUT
+
+    Args:
+        func_str (str): Representación en string de la función
+        lower_limit (str, optional): Límite inferior para integral definida
+        upper_limit (str, optional): Límite superior para integral definida
+        mode (str, optional): Método para la integral definida
+        include_procedure (bool): Generar el procedimiento paso a paso
+
+    Returns:
+        dict: Resultado de calculate_integral; en modo auto/numeric, el de
+            calculate_numeric_integral (con 'symbolic_error') si la parte
+            simbólica no terminó a tiempo; si no, un error estructurado
+            ('error_type': 'timeout' | 'engine') con un resultado parcial
+            numérico cuando hay límites
+    """
+    if not config.ENGINE_ENABLED:
+        with profiled(func_str):
+            return calculate_integral(func_str, lower_limit, upper_limit, mode, include_procedure)
+
+    cached = get_cached_integral(func_str, lower_limit, upper_limit, mode, include_procedure)
+    if cached is not None:
+        return cached
+
+    deadline = time.monotonic() + config.INTEGRATION_TIMEOUT
+
+    # En modo auto/numeric la cuadratura va primero: con su valor en mano, la
+    # parte simbólica sólo tiene config.AUTO_SYMBOLIC_TIMEOUT
+    numeric_result = None
+    if _numeric_first(lower_limit, upper_limit, mode):
+        with timed('numeric'):
+            numeric_result = _run_with_budget(calculate_numeric_integral,
+                                              (func_str, lower_limit, upper_limit))
+        if numeric_result.get('error_type') == 'timeout':
+            return numeric_result
+        if numeric_result.get('is_definite'):
+            deadline = min(deadline, time.monotonic() + config.AUTO_SYMBOLIC_TIMEOUT)
+        else:
+            numeric_result = None
+
+    with timed('terms'):
+        parts = _split_terms(func_str, deadline)
+        _integrate_terms_in_parallel(parts, deadline)
+
+    # Las integrales de términos ya conocidas viajan al worker, que sólo
+    # integra los términos nuevos y devuelve las suyas
+    with timed('engine'):
+        result = _run_with_budget(
+            calculate_integral_with_terms,
+            (get_term_integrals(parts), get_term_failures(parts),
+             func_str, lower_limit, upper_limit, mode, include_procedure),
+            budget=max(deadline - time.monotonic(), 0.0),
+        )
+    seed_term_integrals(result.pop('term_integrals', {}))
+    observe_timings(result.pop('stage_timings', ()))
+    scope = current_latex_scope()
+    latex_profile = result.pop('latex_profile', None)
+    if scope is not None and latex_profile:
+        scope.merge(latex_profile)
+    if result.get('success'):
+        # Con términos sin evaluar, el resultado no se guarda (se reintentarán)
+        if result.get('failed_terms'):
+            index_result_function(result['result_id'], func_str)
+        else:
+            cache_integral_result(func_str, lower_limit, upper_limit, mode, result)
+        return result
+
+    # La parte simbólica no salió a tiempo: se responde el valor numérico
+    if numeric_result is not None and result.get('error_type') in ('timeout', 'engine'):
+        index_result_function(numeric_result['result_id'], func_str)
+        numeric_result['symbolic_error'] = (
+            f'La parte simbólica excedió su tiempo de {config.AUTO_SYMBOLIC_TIMEOUT} segundos'
+            if result['error_type'] == 'timeout' else result['error']
+        )
+        return numeric_result
+
+    # Resultado parcial: sólo el valor numérico de la integral definida
+    if result.get('error_type') in ('timeout', 'engine') and \
+            lower_limit is not None and upper_limit is not None:
+        partial = _run_partial(calculate_numeric_only, (func_str, lower_limit, upper_limit))
+        if partial is not None:
+            result['partial_result'] = partial
+    return result
+
+
+def _numeric_first(lower_limit, upper_limit, mode):
+    """Indica si la petición se resuelve primero por cuadratura (definida, modo auto/numeric)"""
+    if lower_limit is None or upper_limit is None:
+        return False
+    return (mode or config.DEFAULT_INTEGRATION_MODE) in ('auto', 'numeric')
+
+
+def _split_terms(func_str, deadline):
+    """
+    Partes de los términos de la función, separadas en un worker
+
+    La expansión puede tardar segundos, así que nunca se hace en el proceso
+    del servidor: corre en el pool con lo que queda del presupuesto. Si la
+    función no tiene sumas no hay nada costoso que expandir y no se usa el pool.
+
+    Returns:
+        list: Resultado de split_terms (vacía si no se pudo calcular a tiempo)
+    """
+    if not needs_expansion(func_str):
+        return split_terms(func_str)
+
+    budget = deadline - time.monotonic()
+    if budget <= 0:
+        return []
+    try:
+        return get_engine().run(split_terms, args=(func_str,), timeout=budget)
+    except (EngineTimeout, EngineError):
+        # El worker que calcula la integral expandirá por su cuenta (y agotará el presupuesto)
+        return []
+
+
+def _integrate_terms_in_parallel(parts, deadline):
+    """
+    Integra en paralelo los términos nuevos de una suma larga
+
+    Cada término va a un worker distinto con su propio presupuesto
+    (config.TERM_TIMEOUT): si excede el tiempo o su worker falla, sólo ese
+    término se marca como fallido y queda sin evaluar; el resto se guarda en
+    la caché de términos. Con menos de config.PARALLEL_TERMS_MIN términos
+    nuevos no se hace nada y el worker los integra en serie, porque el costo
+    de repartirlos sería mayor que la ganancia.
+
+    Args:
+        parts (list): Partes de los términos (split_terms)
+        deadline (float): Instante (time.monotonic) en que vence la petición
+    """
+    pending = get_pending_terms(parts)
+    workers = min(config.ENGINE_WORKERS, len(pending))
+    if len(pending) < config.PARALLEL_TERMS_MIN or workers < 2:
+        return
+
+    def integrate(args):
+        budget = min(config.TERM_TIMEOUT, deadline - time.monotonic())
+        if budget <= 0:
+            return
+        try:
+            store_term_integral(*args, get_engine().run(integrate_term, args=args, timeout=budget))
+        except EngineBusy:
+            # Sin worker libre: el término se integrará en serie
+            pass
+        except (EngineTimeout, EngineError):
+            if budget >= config.TERM_TIMEOUT:
+                mark_term_failed(*args)
+                increment('term_failures')
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(integrate, pending))
+
+
+def run_antiderivative(func_str):
+    """
+    Calcula la antiderivada (como expresión de SymPy) en el pool de workers
+
+    Args:
+        func_str (str): Representación en string de la función
+
+    Returns:
+        dict: Resultado de calculate_antiderivative o un error estructurado
+    """
+    if not config.ENGINE_ENABLED:
+        return calculate_antiderivative(func_str)
+
+    return _run_with_budget(calculate_antiderivative, (func_str,))
+
+
+def run_interval_integrals(func_str, lower_limits, upper_limits):
+    """
+    Calcula la integral sobre muchos intervalos en el pool de workers
+
+    Args:
+        func_str (str): Representación en string de la función
+        lower_limits (list): Límites inferiores
+        upper_limits (list): Límites superiores
+
+    Returns:
+        dict: Resultado de calculate_interval_integrals, o un error
+            estructurado con un resultado parcial sólo numérico
+    """
+    if not config.ENGINE_ENABLED:
+        return calculate_interval_integrals(func_str, lower_limits, upper_limits)
+
+    result = _run_with_budget(calculate_interval_integrals,
+                              (func_str, lower_limits, upper_limits))
+    if result.get('error_type') in ('timeout', 'engine'):
+        partial = _run_partial(calculate_interval_integrals,
+                               (func_str, lower_limits, upper_limits), {'numeric_only': True})
+        if partial is not None and partial.get('success'):
+            result['partial_result'] = partial
+    return result
+
+
+def run_parametric_sweep(func_str, parameters, lower_limits, upper_limits):
+    """
+    Integra una función con parámetros sobre una grilla en el pool de workers
+
+    Args:
+        func_str (str): Función con parámetros, p. ej. 'a*sin(b*x)'
+        parameters (dict): {nombre: [valores]}
+        lower_limits (list): Límites inferiores
+        upper_limits (list): Límites superiores
+
+    Returns:
+        dict: Resultado de calculate_parametric_sweep, o un error
+            estructurado con un resultado parcial sólo numérico
+    """
+    if not config.ENGINE_ENABLED:
+        return calculate_parametric_sweep(func_str, parameters, lower_limits, upper_limits)
+
+    result = _run_with_budget(calculate_parametric_sweep,
+                              (func_str, parameters, lower_limits, upper_limits))
+    if result.get('error_type') in ('timeout', 'engine'):
+        partial = _run_partial(calculate_parametric_sweep,
+                               (func_str, parameters, lower_limits, upper_limits),
+                               {'numeric_only': True})
+        if partial is not None and partial.get('success'):
+            result['partial_result'] = partial
+    return result
+
+
+def run_procedure(func_str=None, result_id=None):
+    """
+    Genera el procedimiento paso a paso en el pool de workers
+
+    Args:
+        func_str (str, optional): Representación en string de la función
+        result_id (str, optional): Identificador retornado por /calculate
+
+    Returns:
+        dict: Resultado de calculate_procedure o un error estructurado
+    """
+    if result_id:
+        procedure = get_cached_procedure(result_id)
+        if procedure is not None:
+            return {'success': True, 'result_id': result_id, 'procedure': procedure}
+
+    if func_str is None:
+        func_str = resolve_result_function(result_id)
+
+    if not config.ENGINE_ENABLED:
+        return calculate_procedure(func_str, result_id)
+
+    # Los términos que fallaron en /calculate se muestran sin evaluar en
+    # lugar de volver a intentarse en el worker
+    deadline = time.monotonic() + config.INTEGRATION_TIMEOUT
+    parts = _split_terms(func_str, deadline) if func_str is not None else []
+    result = _run_with_budget(
+        calculate_procedure_with_terms,
+        (get_term_integrals(parts), get_term_failures(parts), func_str, result_id),
+        budget=max(deadline - time.monotonic(), 0.0),
+    )
+    seed_term_integrals(result.pop('term_integrals', {}))
+    if result.get('success') and not result.get('failed_terms'):
+        cache_procedure(result['result_id'], result['procedure'], func_str)
+    return result
+
+
+def _run_partial(func, args, kwargs=None):
+    """
+    Calcula un resultado parcial en el pool con presupuesto propio
+
+    Se usa cuando la tarea principal ya agotó el presupuesto de la petición:
+    la cuadratura también puede tardar con un integrando patológico, así que
+    nunca corre en el proceso del servidor y tiene un límite corto y fijo
+    (config.PARTIAL_RESULT_TIMEOUT).
+
+    Returns:
+        Valor retornado por func, o None si no terminó a tiempo o falló
+    """
+    try:
+        return get_engine().run(func, args=args, kwargs=kwargs,
+                                timeout=config.PARTIAL_RESULT_TIMEOUT)
+    except (EngineTimeout, EngineError):
+        increment('engine_failures', task=func.__name__, type='partial')
+        return None
+
+
+def _run_with_budget(func, args, budget=None):
+    """Ejecuta una tarea en el pool y convierte los fallos en errores estructurados"""
+    limit = config.INTEGRATION_TIMEOUT
+    budget = limit if budget is None else budget
+    try:
+        return get_engine().run(func, args=args, timeout=budget)
+    except EngineTimeout:
+        increment('engine_failures', task=func.__name__, type='timeout')
+        return {
+            'success': False,
+            'error_type': 'timeout',
+            'error': f'El cálculo excedió el tiempo límite de {limit} segundos',
+            'timeout': limit,
+        }
+    except EngineError as e:
+        increment('engine_failures', task=func.__name__, type='engine')
+        return {
+            'success': False,
+            'error_type': 'engine',
+            'error': f'Error en el motor de integración: {str(e)}',
+        }
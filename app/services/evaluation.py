@@ -0,0 +1,220 @@
+"""
+Evaluation Service
+Tablas de valores de f(x) y de su antiderivada F(x), evaluadas por bloques
+"""
+
+import json
+import math
+
+import numpy as np
+import sympy as sp
+
+from app.config import config
+from app.services.engine import run_antiderivative
+from app.utils.kernels import get_kernel
+from app.utils.sampling import evaluate_real
+
+
+TABLE_FORMATS = ('json', 'ndjson', 'csv')
+
+
+class TableGrid:
+    """
+    Puntos x de una tabla: una lista explícita o un rango con paso
+
+    Los rangos nunca se materializan completos; cada bloque se genera al
+    recorrerlos, así que la memoria no depende del tamaño de la grilla.
+    """
+
+    def __init__(self, values=None, start=None, step=None, count=0):
+        self.values = values
+        self.start = start
+        self.step = step
+        self.count = len(values) if values is not None else count
+
+    @classmethod
+    def from_values(cls, values):
+        """Grilla a partir de una lista de valores de x"""
+        return cls(values=np.asarray(values, dtype=float))
+
+    @classmethod
+    def from_range(cls, start, stop, step):
+        """Grilla start, start + step, ..., hasta stop inclusive"""
+        count = int(np.floor((stop - start) / step * (1 + 1e-12))) + 1
+        return cls(start=start, step=step, count=max(count, 0))
+
+    def chunks(self, size):
+        """Produce los valores de x en bloques de a lo sumo size elementos"""
+        for begin in range(0, self.count, size):
+            end = min(begin + size, self.count)
+            if self.values is not None:
+                yield self.values[begin:end]
+            else:
+                yield self.start + self.step * np.arange(begin, end, dtype=float)
+
+
+def read_table_grid(data):
+    """
+    Construye la grilla de una petición de tabla
+
+    Args:
+        data (dict): {"x": [...]} o {"start": a, "stop": b, "step": h}
+
+    Returns:
+        tuple: (TableGrid, None) si es válida, o (None, mensaje de error)
+    """
+    if data.get('x') is not None:
+        values = data['x']
+        if not isinstance(values, list) or not values:
+            return None, 'Debe proporcionar una lista de valores en "x"'
+        if len(values) > config.TABLE_MAX_VALUES:
+            return None, f'La lista "x" no puede tener más de {config.TABLE_MAX_VALUES} valores'
+        try:
+            grid = TableGrid.from_values(values)
+        except (TypeError, ValueError):
+            return None, 'Los valores de "x" deben ser numéricos'
+        if not np.all(np.isfinite(grid.values)):
+            return None, 'Los valores de "x" deben ser finitos'
+        return grid, None
+
+    try:
+        start, stop, step = (float(data[name]) for name in ('start', 'stop', 'step'))
+    except KeyError:
+        return None, 'Debe proporcionar "x" o bien "start", "stop" y "step"'
+    except (TypeError, ValueError):
+        return None, 'El rango debe ser numérico'
+
+    if not all(np.isfinite([start, stop, step])):
+        return None, 'El rango debe ser finito'
+    if step <= 0 or stop < start:
+        return None, 'Se requiere step > 0 y stop >= start'
+
+    grid = TableGrid.from_range(start, stop, step)
+    if grid.count > config.TABLE_MAX_POINTS:
+        return None, f'La tabla no puede tener más de {config.TABLE_MAX_POINTS} puntos'
+    return grid, None
+
+
+def prepare_table(func_str):
+    """
+    Obtiene los kernels de f y de su antiderivada
+
+    La antiderivada es la misma que retorna calculate_integral (calculada
+    en el motor, con su límite de tiempo y su caché) y llega como expresión
+    de SymPy, sin pasar por su texto.
+
+    Args:
+        func_str (str): Función a tabular
+
+    Returns:
+        dict: {'success': True, 'function', 'antiderivative', 'f', 'F'} o
+            el resultado con error de la integración. 'F' es None si la
+            antiderivada no tiene forma cerrada.
+    """
+    result = run_antiderivative(func_str)
+    if not result.get('success'):
+        return result
+
+    x = sp.Symbol('x')
+    expr = result['function']
+    antiderivative = result['antiderivative']
+
+    F = None
+    if not antiderivative.has(sp.Integral):
+        try:
+            F = get_kernel(antiderivative, x)
+        except Exception as e:
+            print(f"Error compiling antiderivative: {str(e)}")
+
+    return {
+        'success': True,
+        'function': str(expr),
+        'antiderivative': str(antiderivative),
+        'f': get_kernel(expr, x),
+        'F': F,
+    }
+
+
+def iter_table(table, grid, chunk_size=None):
+    """
+    Evalúa f y F sobre la grilla, un bloque vectorizado a la vez
+
+    Args:
+        table (dict): Resultado de prepare_table
+        grid (TableGrid): Puntos a evaluar
+        chunk_size (int, optional): Puntos por bloque (por defecto config.TABLE_CHUNK_SIZE)
+
+    Yields:
+        tuple: (x, f(x), F(x)) como arreglos de NumPy; NaN donde no hay valor
+    """
+    chunk_size = chunk_size or config.TABLE_CHUNK_SIZE
+    for x_vals in grid.chunks(chunk_size):
+        f_vals = evaluate_real(table['f'], x_vals)
+        if table['F'] is not None:
+            F_vals = evaluate_real(table['F'], x_vals)
+        else:
+            F_vals = np.full(x_vals.shape, np.nan)
+        yield x_vals, f_vals, F_vals
+
+
+def table_json(table, grid):
+    """Tabla completa como dict (para grillas pequeñas)"""
+    columns = {'x': [], 'f': [], 'F': []}
+    for chunk in iter_table(table, grid):
+        for name, values in zip(columns, chunk):
+            columns[name].extend(_json_values(values))
+
+    return {
+        'success': True,
+        'function': table['function'],
+        'antiderivative': table['antiderivative'],
+        'count': grid.count,
+        **columns,
+    }
+
+
+def iter_table_ndjson(table, grid):
+    """
+    Tabla como NDJSON: una cabecera y luego una línea por bloque
+
+    Yields:
+        str: Líneas JSON terminadas en salto de línea
+    """
+    yield json.dumps({
+        'success': True,
+        'function': table['function'],
+        'antiderivative': table['antiderivative'],
+        'count': grid.count,
+    }) + '\n'
+
+    for x_vals, f_vals, F_vals in iter_table(table, grid):
+        yield json.dumps({
+            'x': _json_values(x_vals),
+            'f': _json_values(f_vals),
+            'F': _json_values(F_vals),
+        }) + '\n'
+
+
+def iter_table_csv(table, grid):
+    """
+    Tabla como CSV (x,f,F); las celdas sin valor quedan vacías
+
+    Yields:
+        str: Bloques de texto CSV
+    """
+    yield 'x,f,F\n'
+
+    for chunk in iter_table(table, grid):
+        rows = np.column_stack(chunk).tolist()
+        text = '\n'.join(','.join(_csv_value(value) for value in row) for row in rows)
+        yield text + '\n'
+
+
+def _csv_value(value):
+    """Celda CSV: repr (la forma más corta que conserva el valor) o vacía si no es finito"""
+    return repr(value) if math.isfinite(value) else ''
+
+
+def _json_values(values):
+    """Convierte un arreglo a lista JSON con null en lugar de los valores no finitos"""
+    return [value if math.isfinite(value) else None for value in values.tolist()]
@@ -0,0 +1,105 @@
+"""
+Fast Path
+Integración directa de polinomios y de formas de tabla, antes de sp.integrate
+"""
+
+import sympy as sp
+
+
+# Antiderivadas de f(u) con u = a·x + b, indexadas por la función
+_TABLE_FORMS = {
+    sp.sin: lambda u, a, b, x: -sp.cos(u) / a,
+    sp.cos: lambda u, a, b, x: sp.sin(u) / a,
+    sp.tan: lambda u, a, b, x: -sp.log(sp.cos(u)) / a,
+    sp.exp: lambda u, a, b, x: sp.exp(u) / a,
+    sp.log: lambda u, a, b, x: x * sp.log(u) - x + b * sp.log(u) / a,
+}
+
+
+def fast_integrate(expr, x, kind):
+    """
+    Integra expr sin pasar por las heurísticas generales de sp.integrate
+
+    El tipo de integrando lo da identify_integration_rule ('kind'); aquí se
+    confirma la forma exacta y, si no coincide, se retorna None para que el
+    llamador use sp.integrate.
+
+    Args:
+        expr: Expresión a integrar
+        x: Variable de integración
+        kind (str): Clasificación de identify_integration_rule
+
+    Returns:
+        sp.Expr: Antiderivada
+        None: Si la expresión no tiene una forma directa
+    """
+    handler = _HANDLERS.get(kind)
+    if handler is None:
+        return None
+
+    try:
+        return handler(expr, x)
+    except (sp.PolynomialError, sp.polys.polyerrors.CoercionFailed):
+        return None
+
+
+def _integrate_polynomial(expr, x):
+    """Integra un polinomio en x a partir de sus coeficientes"""
+    poly = sp.Poly(expr, x)
+    if any(coeff.has(x) for coeff in poly.coeffs()):
+        return None
+    return poly.integrate().as_expr()
+
+
+def _integrate_power(expr, x):
+    """∫k·(a·x + b)ⁿ dx con n constante"""
+    coefficient, power = expr.as_independent(x, as_Add=False)
+    base, exponent = power.as_base_exp()
+    if not exponent.is_number or exponent.has(x):
+        return None
+
+    linear = _linear_coefficients(base, x)
+    if linear is None:
+        return None
+    a, _ = linear
+
+    if exponent == -1:
+        return coefficient * sp.log(base) / a
+    return coefficient * base ** (exponent + 1) / (a * (exponent + 1))
+
+
+def _integrate_table_form(expr, x):
+    """∫k·f(a·x + b) dx para las funciones de _TABLE_FORMS"""
+    coefficient, core = expr.as_independent(x, as_Add=False)
+    antiderivative = _TABLE_FORMS.get(core.func)
+    if antiderivative is None or len(core.args) != 1:
+        return None
+
+    linear = _linear_coefficients(core.args[0], x)
+    if linear is None:
+        return None
+    a, b = linear
+    return coefficient * antiderivative(core.args[0], a, b, x)
+
+
+def _linear_coefficients(arg, x):
+    """(a, b) si arg = a·x + b con a numérico distinto de cero, o None"""
+    a = arg.diff(x)
+    if a.has(x) or not a.is_number or a.is_zero is not False:
+        return None
+
+    b = sp.expand(arg - a * x)
+    if b.has(x):
+        return None
+    return a, b
+
+
+_HANDLERS = {
+    'polynomial': _integrate_polynomial,
+    'power': _integrate_power,
+    'sin': _integrate_table_form,
+    'cos': _integrate_table_form,
+    'tan': _integrate_table_form,
+    'exp': _integrate_table_form,
+    'log': _integrate_table_form,
+}
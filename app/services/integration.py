@@ -3,11 +3,49 @@ Integration Service
 Servicio para cálculo de integrales y generación de procedimientos
 """
 
+import copy
+import hashlib
+
+import numpy as np
 import sympy as sp
-from app.utils.parser import parse_function
 
+from app.config import config
+from app.services.fastpath import fast_integrate
+from app.services.quadrature import batched_quadrature, cumulative_quadrature, numeric_integral
+from app.services.verification import verify_antiderivative
+from app.utils.cache import LRUCache
+from app.utils.kernels import clear_kernel_cache, get_kernel, get_kernel_stats
+from app.utils.latex import clear_latex_cache, get_latex_cache_stats, latex, latex_scope
+from app.utils.metrics import metrics_scope, profiled, timed
+from app.utils.parser import clear_parse_cache, parameter_symbol, parse_function
+from app.utils.sampling import evaluate_real
+
+
+INTEGRATION_MODES = ('numeric', 'symbolic', 'auto')
+
+
+# Cachés indexadas por la forma canónica de la expresión
+_result_cache = LRUCache(maxsize=config.RESULT_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+_antiderivative_cache = LRUCache(maxsize=config.RESULT_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+_procedure_cache = LRUCache(maxsize=config.PROCEDURE_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+
+# Función original de cada result_id, para construir el procedimiento bajo demanda
+_function_index = LRUCache(maxsize=config.PROCEDURE_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
 
-def calculate_integral(func_str, lower_limit=None, upper_limit=None):
+# Integral de cada término sin su coeficiente constante, y pasos de cada término
+_term_cache = LRUCache(maxsize=config.TERM_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+_term_steps_cache = LRUCache(maxsize=config.TERM_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+
+# Términos de la expansión de cada expresión (expandir puede ser costoso)
+_expansion_cache = LRUCache(maxsize=config.RESULT_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+
+# Términos que excedieron su presupuesto o hicieron fallar a su worker (por
+# poco tiempo: el fallo pudo deberse a una carga pasajera)
+_term_failures = LRUCache(maxsize=config.TERM_CACHE_SIZE, ttl=config.TERM_FAILURE_TTL)
+
+
+def calculate_integral(func_str, lower_limit=None, upper_limit=None, mode=None,
+                       include_procedure=True):
     """
     Calcula la integral de una función
     
@@ -15,37 +53,564 @@ def calculate_integral(func_str, lower_limit=None, upper_limit=None):
         func_str (str): Representación en string de la función
         lower_limit (str, optional): Límite inferior para integral definida
         upper_limit (str, optional): Límite superior para integral definida
+        mode (str, optional): Método para la integral definida
+            ('numeric', 'symbolic' o 'auto'; por defecto config.DEFAULT_INTEGRATION_MODE)
+        include_procedure (bool): Generar el procedimiento paso a paso (si es
+            False, se puede pedir después con calculate_procedure y el result_id)
         
     Returns:
         dict: Diccionario con los resultados
     """
     try:
+        mode = mode or config.DEFAULT_INTEGRATION_MODE
+        if mode not in INTEGRATION_MODES:
+            raise ValueError(f"Modo de integración no válido: {mode}")
+        
         # Parsear la función
         x = sp.Symbol('x')
-        expr = parse_function(func_str)
+        with timed('parse'):
+            expr = parse_function(func_str)
+        result_id = expression_id(expr)
+        _function_index.set(result_id, func_str)
         
-        # Calcular integral indefinida
-        indefinite_integral = sp.integrate(expr, x)
+        # Reutilizar el resultado si ya se resolvió la misma expresión
+        cache_key = _result_cache_key(expr, lower_limit, upper_limit, mode)
+        cached = _result_cache.get(cache_key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+        else:
+            # Calcular integral indefinida
+            with timed('integrate'):
+                indefinite_integral, _ = get_antiderivative(expr, x)
+            failed_terms = count_failed_terms(expr, x, indefinite_integral)
+            
+            result = {
+                'success': True,
+                'result_id': result_id,
+                'original_function': latex(expr),
+                'indefinite_integral': latex(indefinite_integral),
+                'indefinite_integral_text': str(indefinite_integral),
+            }
+            if failed_terms:
+                result['failed_terms'] = failed_terms
+            
+            # Si se proporcionan límites, calcular integral definida
+            if lower_limit is not None and upper_limit is not None:
+                with timed('definite'):
+                    definite_result = _calculate_definite_integral(
+                        expr, x, lower_limit, upper_limit, indefinite_integral, mode,
+                        symbolic_fallback=not failed_terms
+                    )
+                result.update(definite_result)
+            else:
+                result['is_definite'] = False
+            
+            # Un resultado con términos sin evaluar no se guarda: al vencer
+            # el fallo, el término se vuelve a intentar
+            if not failed_terms:
+                _result_cache.set(cache_key, copy.deepcopy(result))
+        
+        # Generar procedimiento detallado
+        if include_procedure:
+            with timed('procedure'):
+                result['procedure'] = _get_procedure(expr, x, result_id)
+        
+        return result
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def calculate_procedure(func_str=None, result_id=None):
+    """
+    Genera el procedimiento paso a paso bajo demanda
+    
+    Args:
+        func_str (str, optional): Representación en string de la función
+        result_id (str, optional): Identificador retornado por calculate_integral
+        
+    Returns:
+        dict: Diccionario con el procedimiento o el error
+    """
+    try:
+        if func_str is None:
+            func_str = resolve_result_function(result_id)
+            if func_str is None:
+                return {
+                    'success': False,
+                    'error_type': 'not_found',
+                    'error': 'No se encontró el resultado; envíe la función nuevamente'
+                }
+        
+        x = sp.Symbol('x')
+        expr = parse_function(func_str)
+        result_id = expression_id(expr)
+        _function_index.set(result_id, func_str)
         
         result = {
             'success': True,
-            'original_function': sp.latex(expr),
-            'indefinite_integral': sp.latex(indefinite_integral),
-            'indefinite_integral_text': str(indefinite_integral),
+            'result_id': result_id,
+            'procedure': _get_procedure(expr, x, result_id)
+        }
+        failed_terms = count_failed_terms(expr, x, get_antiderivative(expr, x)[0])
+        if failed_terms:
+            result['failed_terms'] = failed_terms
+        return result
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
         }
+
+
+def expression_id(expr):
+    """Identificador estable de una expresión a partir de su forma canónica"""
+    return hashlib.sha1(sp.srepr(expr).encode('utf-8')).hexdigest()[:16]
+
+
+def get_antiderivative(expr, x):
+    """
+    Retorna la antiderivada y las integrales por término, calculándolas una vez
+    
+    Returns:
+        tuple: Resultado de integrate_by_terms
+    """
+    key = sp.srepr(expr)
+    cached = _antiderivative_cache.get(key)
+    if cached is None:
+        cached = integrate_by_terms(expr, x)
+        if not count_failed_terms(expr, x, cached[0]):
+            _antiderivative_cache.set(key, cached)
+    return cached
+
+
+def count_failed_terms(expr, x, antiderivative):
+    """
+    Cuenta los términos que quedaron sin evaluar por estar marcados como fallidos
+    
+    Args:
+        expr: Expresión integrada
+        x: Variable de integración
+        antiderivative: Antiderivada obtenida (sólo se revisa si tiene integrales sin evaluar)
         
-        # Si se proporcionan límites, calcular integral definida
-        if lower_limit is not None and upper_limit is not None:
-            definite_result = _calculate_definite_integral(
-                expr, x, lower_limit, upper_limit
-            )
-            result.update(definite_result)
-        else:
-            result['is_definite'] = False
+    Returns:
+        int: Número de términos fallidos
+    """
+    if not antiderivative.has(sp.Integral):
+        return 0
+    terms = expand_terms(expr) or (expr,)
+    return sum(1 for term in terms
+               if _term_failures.get(_term_key(term.as_independent(x, as_Add=False)[1], x)))
+
+
+def integrate_term(term, x):
+    """
+    Integra un término reutilizando la integral de su parte que depende de x
+    
+    El coeficiente constante se factoriza (∫k·g dx = k·∫g dx), así que 3·sin(x)
+    y 5·sin(x) comparten la misma entrada de la caché.
+    
+    Args:
+        term: Término a integrar
+        x: Variable de integración
         
-        # Generar procedimiento detallado
-        result['procedure'] = generate_integration_procedure(expr, x, indefinite_integral)
+    Returns:
+        sp.Expr: Integral del término
+    """
+    coefficient, part = term.as_independent(x, as_Add=False)
+    key = _term_key(part, x)
+    if _term_failures.get(key):
+        # No se reintenta: queda como integral sin evaluar
+        return coefficient * sp.Integral(part, x)
+    
+    integral = _term_cache.get(key)
+    if integral is None:
+        # Polinomios y formas de tabla no necesitan las heurísticas generales
+        rule_info = identify_integration_rule(part, x) or {}
+        integral = fast_integrate(part, x, rule_info.get('kind'))
+        if integral is None:
+            integral = sp.integrate(part, x)
+        _term_cache.set(key, integral)
+    return coefficient * integral
+
+
+def split_terms(func_str):
+    """
+    Partes que dependen de x de los términos de una función
+    
+    Expandir puede ser muy costoso (p. ej. (x + 1)^4000), así que el motor
+    llama a esta función en un worker, con presupuesto; el proceso principal
+    sólo recibe las partes, sin los coeficientes (que pueden ser enteros
+    enormes).
+    
+    Returns:
+        list: Argumentos (parte, x) para integrate_term, sin repetidos y en
+            el orden de los términos (uno solo si no es una suma); vacía si
+            la función no se puede parsear
+    """
+    x = sp.Symbol('x')
+    try:
+        expr = parse_function(func_str)
+    except ValueError:
+        return []
+    
+    parts = {}
+    for term in expand_terms(expr) or (expr,):
+        part = term.as_independent(x, as_Add=False)[1]
+        parts.setdefault(_term_key(part, x), (part, x))
+    return list(parts.values())
+
+
+def needs_expansion(func_str):
+    """Indica si expandir la función puede separarla en términos (tiene alguna suma)"""
+    try:
+        return parse_function(func_str).has(sp.Add)
+    except ValueError:
+        return False
+
+
+def expand_terms(expr):
+    """
+    Términos de la expresión expandida, calculados una sola vez por proceso
+    
+    Returns:
+        tuple: Términos ordenados, o None si la expresión expandida no es una suma
+    """
+    key = sp.srepr(expr)
+    terms = _expansion_cache.get(key)
+    if terms is None:
+        expanded = sp.expand(expr)
+        terms = tuple(expanded.as_ordered_terms()) if expanded.is_Add else ()
+        _expansion_cache.set(key, terms)
+    return terms or None
+
+
+def get_term_integrals(parts):
+    """
+    Retorna las integrales ya conocidas de las partes de los términos
+    
+    Sirve para pasarlas a otro proceso (seed_term_integrals) y que sólo
+    integre los términos nuevos.
+    
+    Args:
+        parts (list): Resultado de split_terms
+    
+    Returns:
+        dict: {clave del término: integral} de los términos en caché
+    """
+    known = {}
+    for part, x in parts:
+        key = _term_key(part, x)
+        integral = _term_cache.get(key)
+        if integral is not None:
+            known[key] = integral
+    return known
+
+
+def get_pending_terms(parts):
+    """
+    Retorna las partes de los términos que aún no se integraron
+    
+    Args:
+        parts (list): Resultado de split_terms
+    
+    Returns:
+        list: Argumentos (parte, x) para integrate_term, en el mismo orden
+    """
+    pending = []
+    for part, x in parts:
+        key = _term_key(part, x)
+        if _term_cache.get(key) is None and not _term_failures.get(key):
+            pending.append((part, x))
+    return pending
+
+
+def store_term_integral(part, x, integral):
+    """Guarda la integral de una parte calculada en otro proceso"""
+    _term_cache.set(_term_key(part, x), integral)
+
+
+def mark_term_failed(part, x):
+    """Marca una parte que excedió su presupuesto para no volver a integrarla"""
+    _term_failures.set(_term_key(part, x), True)
+
+
+def get_term_failures(parts):
+    """Retorna las claves de las partes de los términos marcadas como fallidas"""
+    keys = [_term_key(part, x) for part, x in parts]
+    return [key for key in keys if _term_failures.get(key)]
+
+
+def seed_term_integrals(term_integrals, failures=()):
+    """Agrega a la caché integrales de términos calculadas en otro proceso"""
+    for key, integral in term_integrals.items():
+        _term_cache.set(key, integral)
+    for key in failures:
+        _term_failures.set(key, True)
+
+
+def calculate_integral_with_terms(term_integrals, failures, *args, **kwargs):
+    """
+    calculate_integral para los workers del motor
+    
+    Recibe las integrales de términos que conoce el proceso principal (y los
+    términos que fallaron al integrarse en paralelo) y retorna, en
+    'term_integrals', las de la función calculada; en 'latex_profile' y
+    'stage_timings', los contadores de latex() y los tiempos por etapa
+    medidos en el worker.
+    """
+    seed_term_integrals(term_integrals, failures)
+    func_str = args[0] if args else kwargs['func_str']
+    with metrics_scope() as timings, latex_scope() as scope, profiled(func_str):
+        result = calculate_integral(*args, **kwargs)
+    result['latex_profile'] = scope.stats()
+    result['stage_timings'] = timings.timings
+    if result.get('success'):
+        result['term_integrals'] = get_term_integrals(split_terms(func_str))
+    return result
+
+
+def calculate_procedure_with_terms(term_integrals, failures, func_str=None, result_id=None):
+    """
+    calculate_procedure para los workers del motor, con las integrales de
+    términos (y los fallos) que conoce el proceso principal
+    """
+    seed_term_integrals(term_integrals, failures)
+    result = calculate_procedure(func_str, result_id)
+    if result.get('success') and func_str is not None:
+        result['term_integrals'] = get_term_integrals(split_terms(func_str))
+    return result
+
+
+def _term_key(part, x):
+    """Clave canónica de la parte de un término que depende de x"""
+    return (sp.srepr(part), sp.srepr(x))
+
+
+def _get_procedure(expr, x, result_id):
+    """Obtiene el procedimiento de la caché o lo genera a partir de la antiderivada"""
+    procedure = _procedure_cache.get(result_id)
+    if procedure is None:
+        antiderivative, term_results = get_antiderivative(expr, x)
+        procedure = generate_integration_procedure(expr, x, antiderivative, term_results)
+        if not count_failed_terms(expr, x, antiderivative):
+            _procedure_cache.set(result_id, procedure)
+    return copy.deepcopy(procedure)
+
+
+def index_result_function(result_id, func_str):
+    """Asocia un result_id a su función sin guardar el resultado"""
+    _function_index.set(result_id, func_str)
+
+
+def resolve_result_function(result_id):
+    """Retorna la función original asociada a un result_id, si se conoce"""
+    return _function_index.get(result_id) if result_id else None
+
+
+def get_cached_integral(func_str, lower_limit=None, upper_limit=None, mode=None,
+                        include_procedure=True):
+    """
+    Busca un resultado ya calculado sin resolver la integral
+
+    Returns:
+        dict: Copia del resultado en caché
+        None: Si no está en caché o la función no se puede parsear
+    """
+    try:
+        expr = parse_function(func_str)
+    except ValueError:
+        return None
+    
+    mode = mode or config.DEFAULT_INTEGRATION_MODE
+    cached = _result_cache.get(_result_cache_key(expr, lower_limit, upper_limit, mode))
+    if cached is None:
+        return None
+    
+    result = copy.deepcopy(cached)
+    if include_procedure:
+        procedure = get_cached_procedure(result['result_id'])
+        if procedure is None:
+            return None
+        result['procedure'] = procedure
+    return result
+
+
+def cache_integral_result(func_str, lower_limit, upper_limit, mode, result):
+    """Guarda un resultado calculado fuera de este proceso (p. ej. en un worker)"""
+    try:
+        expr = parse_function(func_str)
+    except ValueError:
+        return
+    
+    mode = mode or config.DEFAULT_INTEGRATION_MODE
+    result = copy.deepcopy(result)
+    procedure = result.pop('procedure', None)
+    _result_cache.set(_result_cache_key(expr, lower_limit, upper_limit, mode), result)
+    _function_index.set(result['result_id'], func_str)
+    if procedure is not None:
+        cache_procedure(result['result_id'], procedure)
+
+
+def get_cached_procedure(result_id):
+    """Retorna una copia del procedimiento en caché, o None"""
+    procedure = _procedure_cache.get(result_id)
+    return copy.deepcopy(procedure) if procedure is not None else None
+
+
+def cache_procedure(result_id, procedure, func_str=None):
+    """Guarda un procedimiento calculado fuera de este proceso"""
+    _procedure_cache.set(result_id, copy.deepcopy(procedure))
+    if func_str is not None:
+        _function_index.set(result_id, func_str)
+
+
+def calculate_numeric_only(func_str, lower_limit, upper_limit):
+    """
+    Calcula sólo el valor numérico de la integral definida (resultado parcial)
+
+    Returns:
+        dict: Valor numérico, cota de error y límites
+        None: Si no se pudo calcular
+    """
+    try:
+        x = sp.Symbol('x')
+        expr = parse_function(func_str)
+        result = _calculate_definite_integral(expr, x, lower_limit, upper_limit, mode='numeric')
+    except Exception:
+        return None
+    
+    return result if result.get('is_definite') else None
+
+
+def calculate_numeric_integral(func_str, lower_limit, upper_limit):
+    """
+    Calcula la integral definida sólo por cuadratura, con la forma de respuesta
+    de calculate_integral
+
+    Es la respuesta de los modos 'auto' y 'numeric' cuando la parte simbólica
+    no termina a tiempo: la integral indefinida queda en None.
+
+    Returns:
+        dict: Resultado (con 'limit_error' si la cuadratura no convergió)
+    """
+    try:
+        x = sp.Symbol('x')
+        expr = parse_function(func_str)
+        definite = _calculate_definite_integral(expr, x, lower_limit, upper_limit, mode='numeric')
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    
+    return {
+        'success': True,
+        'result_id': expression_id(expr),
+        'original_function': latex(expr),
+        'indefinite_integral': None,
+        'indefinite_integral_text': None,
+        **definite,
+    }
+
+
+def calculate_antiderivative(func_str):
+    """
+    Calcula sólo la antiderivada, como expresión de SymPy
+
+    Returns:
+        dict: {'success': True, 'function', 'antiderivative'} o el error
+    """
+    try:
+        x = sp.Symbol('x')
+        expr = parse_function(func_str)
+        antiderivative, _ = get_antiderivative(expr, x)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    
+    return {'success': True, 'function': expr, 'antiderivative': antiderivative}
+
+
+def calculate_interval_integrals(func_str, lower_limits, upper_limits, numeric_only=False):
+    """
+    Calcula la integral definida de una función sobre muchos intervalos
+    
+    La antiderivada se obtiene una sola vez y se evalúa vectorizada en todos
+    los extremos (F(b) - F(a)) cuando es continua en el intervalo. Los
+    intervalos sin forma cerrada o que cruzan una singularidad se resuelven
+    con cuadratura acumulada sobre los extremos distintos.
+    
+    Args:
+        func_str (str): Representación en string de la función
+        lower_limits (array-like): Límites inferiores (finitos)
+        upper_limits (array-like): Límites superiores (finitos)
+        numeric_only (bool): Usar sólo cuadratura (resultado parcial sin sympy)
+        
+    Returns:
+        dict: Valores, cotas de error y método de cada intervalo
+    """
+    try:
+        x = sp.Symbol('x')
+        expr = parse_function(func_str)
+        lowers = np.asarray(lower_limits, dtype=float)
+        uppers = np.asarray(upper_limits, dtype=float)
+        
+        values = np.full(lowers.size, np.nan)
+        errors = np.full(lowers.size, np.nan)
+        methods = np.full(lowers.size, None, dtype=object)
+        solved = np.zeros(lowers.size, dtype=bool)
+        
+        result = {'success': True, 'original_function': latex(expr)}
+        
+        # Teorema Fundamental del Cálculo, vectorizado sobre los extremos
+        if not numeric_only:
+            antiderivative, _ = get_antiderivative(expr, x)
+            result['indefinite_integral_text'] = str(antiderivative)
+            
+            closed = _closed_form_mask(expr, antiderivative, x, lowers, uppers)
+            if np.any(closed):
+                points, inverse = np.unique(np.concatenate([lowers[closed], uppers[closed]]),
+                                            return_inverse=True)
+                F = evaluate_real(get_kernel(antiderivative, x), points)
+                n = int(closed.sum())
+                closed_values = F[inverse[n:]] - F[inverse[:n]]
+                
+                index = np.flatnonzero(closed)[np.isfinite(closed_values)]
+                values[index] = closed_values[np.isfinite(closed_values)]
+                errors[index] = 0.0
+                methods[index] = 'antiderivative'
+                solved[index] = True
         
+        # Cuadratura acumulada para el resto
+        pending = ~solved
+        if np.any(pending):
+            points, inverse = np.unique(np.concatenate([lowers[pending], uppers[pending]]),
+                                        return_inverse=True)
+            cumulative, cumulative_error, failures = cumulative_quadrature(get_kernel(expr, x), points)
+            n = int(pending.sum())
+            lo, hi = inverse[:n], inverse[n:]
+            converged = failures[hi] == failures[lo]
+            
+            index = np.flatnonzero(pending)[converged]
+            values[index] = cumulative[hi[converged]] - cumulative[lo[converged]]
+            errors[index] = np.abs(cumulative_error[hi[converged]] - cumulative_error[lo[converged]])
+            methods[index] = 'numeric'
+            solved[index] = True
+        
+        result.update({
+            'count': int(lowers.size),
+            'values': [None if v != v else v for v in values.tolist()],
+            'errors': [None if e != e else e for e in errors.tolist()],
+            'methods': methods.tolist(),
+            'failed': int(np.sum(~solved)),
+        })
         return result
         
     except Exception as e:
@@ -55,31 +620,211 @@ def calculate_integral(func_str, lower_limit=None, upper_limit=None):
         }
 
 
-def _calculate_definite_integral(expr, x, lower_limit, upper_limit):
-    """Calcula la integral definida"""
+def calculate_parametric_sweep(func_str, parameters, lower_limits, upper_limits,
+                               numeric_only=False):
+    """
+    Integra una función con parámetros sobre una grilla de valores
+    
+    La antiderivada se resuelve una sola vez con los parámetros libres y se
+    evalúa vectorizada sobre el producto cartesiano de los valores de los
+    parámetros y los intervalos. Las ramas (Piecewise) que dependen sólo de
+    los parámetros se resuelven punto a punto en la evaluación; los puntos
+    donde la forma cerrada no aplica se integran por cuadratura en lote.
+    
+    Args:
+        func_str (str): Función, p. ej. 'a*sin(b*x)'
+        parameters (dict): {nombre: [valores]}; el orden define los ejes
+        lower_limits (array-like): Límites inferiores (finitos)
+        upper_limits (array-like): Límites superiores (finitos)
+        numeric_only (bool): Usar sólo cuadratura (resultado parcial sin sympy)
+        
+    Returns:
+        dict: Valores y cotas de error con forma (len(p1), ..., len(pn), intervalos)
+    """
+    try:
+        x = sp.Symbol('x')
+        names = tuple(parameters)
+        expr = parse_function(func_str, names)
+        symbols = [parameter_symbol(name) for name in names]
+        
+        undeclared = expr.free_symbols - {x, *symbols}
+        if undeclared:
+            names_text = ', '.join(sorted(str(s) for s in undeclared))
+            raise ValueError(f"Símbolos no declarados como parámetros: {names_text}")
+        
+        # Producto cartesiano parámetros x intervalos, aplanado
+        axes = [np.asarray(parameters[name], dtype=float) for name in names]
+        lowers = np.asarray(lower_limits, dtype=float)
+        uppers = np.asarray(upper_limits, dtype=float)
+        shape = tuple(axis.size for axis in axes) + (lowers.size,)
+        grids = np.meshgrid(*axes, np.arange(lowers.size), indexing='ij')
+        values_by_point = [grid.ravel() for grid in grids[:-1]]
+        pair = grids[-1].ravel()
+        lo, hi = lowers[pair], uppers[pair]
+        
+        values = np.full(lo.size, np.nan)
+        errors = np.full(lo.size, np.nan)
+        solved = np.zeros(lo.size, dtype=bool)
+        methods = {'antiderivative': 0, 'numeric': 0}
+        
+        result = {'success': True, 'original_function': latex(expr), 'parameters': list(names)}
+        
+        # Una sola antiderivada simbólica, evaluada en toda la grilla
+        if not numeric_only:
+            antiderivative, _ = get_antiderivative(expr, x)
+            result['indefinite_integral'] = latex(antiderivative)
+            result['indefinite_integral_text'] = str(antiderivative)
+            
+            closed = _parametric_closed_form_mask(expr, antiderivative, x, symbols,
+                                                  values_by_point, lo, hi)
+            if np.any(closed):
+                F = get_kernel(antiderivative, (x, *symbols))
+                point_values = [p[closed] for p in values_by_point]
+                F_upper = evaluate_real(lambda t: F(t, *point_values), hi[closed])
+                F_lower = evaluate_real(lambda t: F(t, *point_values), lo[closed])
+                closed_values = F_upper - F_lower
+                
+                finite = np.isfinite(closed_values)
+                index = np.flatnonzero(closed)[finite]
+                values[index] = closed_values[finite]
+                errors[index] = 0.0
+                solved[index] = True
+                methods['antiderivative'] = int(index.size)
+        
+        # Cuadratura en lote para los puntos restantes
+        pending = ~solved
+        if np.any(pending):
+            f = get_kernel(expr, (x, *symbols))
+            numeric_values, numeric_errors, converged = batched_quadrature(
+                f, lo[pending], hi[pending], params=[p[pending] for p in values_by_point]
+            )
+            index = np.flatnonzero(pending)[converged]
+            values[index] = numeric_values[converged]
+            errors[index] = numeric_errors[converged]
+            solved[index] = True
+            methods['numeric'] = int(index.size)
+        
+        result.update({
+            'shape': list(shape),
+            'values': _nested_list(values.reshape(shape)),
+            'errors': _nested_list(errors.reshape(shape)),
+            'methods': methods,
+            'failed': int(np.sum(~solved)),
+        })
+        return result
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def clear_caches():
+    """Vacía todas las cachés del proceso (para mediciones en frío)"""
+    for cache in (_result_cache, _antiderivative_cache, _procedure_cache, _function_index,
+                  _term_cache, _term_steps_cache, _term_failures, _expansion_cache):
+        cache.clear()
+    clear_parse_cache()
+    clear_kernel_cache()
+    clear_latex_cache()
+
+
+def get_cache_stats():
+    """Retorna los contadores de las cachés del servicio"""
+    return {
+        'results': _result_cache.stats(),
+        'antiderivatives': _antiderivative_cache.stats(),
+        'procedures': _procedure_cache.stats(),
+        'terms': _term_cache.stats(),
+        'kernels': get_kernel_stats(),
+        'latex': get_latex_cache_stats(),
+    }
+
+
+def _result_cache_key(expr, lower_limit, upper_limit, mode):
+    """Construye la clave canónica: expresión parseada + límites normalizados"""
+    return (sp.srepr(expr), _normalize_limit(lower_limit), _normalize_limit(upper_limit), mode)
+
+
+def _normalize_limit(limit):
+    """Normaliza un límite para que '1', '1.0' y ' 1 ' compartan clave"""
+    if limit is None:
+        return None
+    try:
+        return float(limit)
+    except (TypeError, ValueError):
+        return str(limit).strip()
+
+
+def _calculate_definite_integral(expr, x, lower_limit, upper_limit, antiderivative=None,
+                                 mode='symbolic', symbolic_fallback=True):
+    """
+    Calcula la integral definida
+
+    Si se dispone de la antiderivada y es continua en el intervalo, se aplica
+    el Teorema Fundamental del Cálculo F(b) - F(a) en lugar de integrar de nuevo.
+    En modo 'numeric' sólo se usa cuadratura; en modo 'auto' el valor numérico
+    con su cota de error se retorna siempre y el resultado simbólico sólo se
+    agrega si sale barato (vía antiderivada). Con symbolic_fallback=False
+    (algún término excedió su tiempo) nunca se integra simbólicamente de
+    nuevo: sin antiderivada utilizable se usa cuadratura.
+    """
     try:
         lower = float(lower_limit)
         upper = float(upper_limit)
+        limits = {'lower': lower, 'upper': upper}
+        
+        numeric = None
+        if mode in ('numeric', 'auto'):
+            numeric = numeric_integral(expr, x, lower, upper)
+            if mode == 'numeric':
+                return _numeric_definite_result(numeric, limits)
+        
+        # Evaluar la antiderivada en los límites si es seguro hacerlo
+        definite_result = None
+        method = 'symbolic'
+        if antiderivative is not None:
+            definite_result = _evaluate_antiderivative(expr, antiderivative, x, lower, upper)
+            if definite_result is not None:
+                method = 'antiderivative'
+        
+        # En modo auto, un valor numérico convergido evita la integral simbólica completa
+        if definite_result is None and numeric is not None and numeric['converged']:
+            return _numeric_definite_result(numeric, limits)
         
-        # Calcular integral definida
-        definite_result = sp.integrate(expr, (x, lower, upper))
+        # La integral completa volvería a intentar el término que falló
+        if definite_result is None and not symbolic_fallback:
+            if numeric is None:
+                numeric = numeric_integral(expr, x, lower, upper)
+            return _numeric_definite_result(numeric, limits)
+        
+        # Calcular integral definida completa como respaldo
+        if definite_result is None:
+            definite_result = sp.integrate(expr, (x, lower, upper))
         
         # Intentar obtener valor numérico
         try:
             numerical_value = float(definite_result.evalf())
-            return {
+            result = {
                 'definite_integral': numerical_value,
-                'definite_integral_latex': sp.latex(definite_result),
-                'limits': {'lower': lower, 'upper': upper},
+                'definite_integral_latex': latex(definite_result),
+                'definite_method': method,
+                'limits': limits,
                 'is_definite': True
             }
         except:
-            return {
+            result = {
                 'definite_integral': str(definite_result),
-                'definite_integral_latex': sp.latex(definite_result),
-                'limits': {'lower': lower, 'upper': upper},
+                'definite_integral_latex': latex(definite_result),
+                'definite_method': method,
+                'limits': limits,
                 'is_definite': True
             }
+        
+        if numeric is not None and numeric['converged']:
+            result['definite_error'] = numeric['error']
+        return result
             
     except Exception as e:
         return {
@@ -88,7 +833,229 @@ def _calculate_definite_integral(expr, x, lower_limit, upper_limit):
         }
 
 
-def generate_integration_procedure(expr, x, result):
+def _numeric_definite_result(numeric, limits):
+    """Construye la respuesta de una integral definida resuelta por cuadratura"""
+    if not numeric['converged']:
+        return {
+            'limit_error': 'La integración numérica no convergió (posible singularidad en el intervalo)',
+            'is_definite': False
+        }
+    
+    return {
+        'definite_integral': numeric['value'],
+        'definite_integral_latex': latex(sp.Float(numeric['value'], 15)),
+        'definite_error': numeric['error'],
+        'definite_method': 'numeric',
+        'limits': limits,
+        'is_definite': True
+    }
+
+
+# Funciones con saltos que continuous_domain no detecta
+_DISCONTINUOUS_FUNCTIONS = (sp.floor, sp.ceiling, sp.frac, sp.sign, sp.Heaviside, sp.Piecewise)
+
+
+def _evaluate_antiderivative(expr, antiderivative, x, lower, upper):
+    """
+    Evalúa F(upper) - F(lower) cuando el integrando y la antiderivada son
+    continuos en [lower, upper]
+
+    Returns:
+        sp.Expr: Valor de la integral definida
+        None: Si hay singularidades, discontinuidades o no se pudo verificar
+    """
+    if antiderivative.has(sp.Integral):
+        return None
+    if any(expr.has(f) or antiderivative.has(f) for f in _DISCONTINUOUS_FUNCTIONS):
+        return None
+    
+    a, b = min(lower, upper), max(lower, upper)
+    if not (sp.Float(a).is_finite and sp.Float(b).is_finite):
+        return None
+    
+    try:
+        interval = sp.Interval(a, b)
+        for func in (expr, antiderivative):
+            domain = sp.calculus.util.continuous_domain(func, x, interval)
+            if not interval.is_subset(domain):
+                return None
+        
+        value = antiderivative.subs(x, upper) - antiderivative.subs(x, lower)
+    except Exception:
+        return None
+    
+    if value.has(sp.nan, sp.zoo, sp.oo, -sp.oo):
+        return None
+    return value
+
+
+def _closed_form_mask(expr, antiderivative, x, lowers, uppers):
+    """
+    Indica en qué intervalos es válido F(b) - F(a)
+    
+    continuous_domain se calcula una sola vez sobre la envolvente de todos
+    los intervalos; luego se descartan, vectorizado, los que tocan un punto
+    o tramo excluido.
+    """
+    closed = np.zeros(lowers.size, dtype=bool)
+    if antiderivative.has(sp.Integral):
+        return closed
+    if any(expr.has(f) or antiderivative.has(f) for f in _DISCONTINUOUS_FUNCTIONS):
+        return closed
+    
+    starts = np.minimum(lowers, uppers)
+    ends = np.maximum(lowers, uppers)
+    hull = sp.Interval(float(starts.min()), float(ends.max()))
+    
+    gaps = []
+    try:
+        for func in (expr, antiderivative):
+            excluded = hull - sp.calculus.util.continuous_domain(func, x, hull)
+            ranges = _excluded_ranges(excluded)
+            if ranges is None:
+                return closed
+            gaps.extend(ranges)
+    except Exception:
+        return closed
+    
+    closed[:] = True
+    if gaps:
+        gaps.sort()
+        gap_starts = np.array([start for start, _ in gaps])
+        gap_ends = np.maximum.accumulate(np.array([end for _, end in gaps]))
+        # Primer tramo excluido que termina después del inicio de cada intervalo
+        first = np.searchsorted(gap_ends, starts, side='left')
+        hit = first < len(gaps)
+        hit[hit] = gap_starts[first[hit]] <= ends[hit]
+        closed &= ~hit
+    return closed
+
+
+def _excluded_ranges(excluded):
+    """
+    Convierte un conjunto excluido en tramos (inicio, fin)
+    
+    Returns:
+        list: Tramos cerrados que cubren el conjunto
+        None: Si el conjunto no es una unión finita de puntos e intervalos
+    """
+    if excluded is sp.S.EmptySet:
+        return []
+    if isinstance(excluded, sp.FiniteSet):
+        return [(float(p), float(p)) for p in excluded]
+    if isinstance(excluded, sp.Interval):
+        return [(float(excluded.start), float(excluded.end))]
+    if isinstance(excluded, sp.Union):
+        ranges = []
+        for part in excluded.args:
+            part_ranges = _excluded_ranges(part)
+            if part_ranges is None:
+                return None
+            ranges.extend(part_ranges)
+        return ranges
+    return None
+
+
+def _parametric_closed_form_mask(expr, antiderivative, x, symbols, values_by_point, lowers, uppers):
+    """
+    Indica en qué puntos de la grilla es válido F(b) - F(a)
+    
+    Las singularidades en x se obtienen una vez en función de los
+    parámetros (p. ej. x = a) y se evalúan vectorizadas en la grilla.
+    """
+    closed = np.zeros(lowers.size, dtype=bool)
+    if antiderivative.has(sp.Integral):
+        return closed
+    if any(_has_jump_in(func, x) for func in (expr, antiderivative)):
+        return closed
+    
+    starts = np.minimum(lowers, uppers)
+    ends = np.maximum(lowers, uppers)
+    closed[:] = True
+    try:
+        for func in (expr, antiderivative):
+            for branch in _piecewise_branches(func):
+                singular = sp.singularities(branch, x)
+                if singular is sp.S.EmptySet:
+                    continue
+                if not isinstance(singular, sp.FiniteSet):
+                    closed[:] = False
+                    return closed
+                for point in singular:
+                    location = evaluate_real(
+                        lambda _: get_kernel(point, tuple(symbols))(*values_by_point), starts
+                    )
+                    closed &= ~((starts <= location) & (location <= ends))
+    except Exception:
+        closed[:] = False
+    return closed
+
+
+def _has_jump_in(expr, x):
+    """Indica si la expresión tiene saltos en x (las ramas por parámetro no cuentan)"""
+    for func in _DISCONTINUOUS_FUNCTIONS:
+        if func is sp.Piecewise:
+            continue
+        if any(atom.has(x) for atom in expr.atoms(func)):
+            return True
+    return any(condition.has(x)
+               for piecewise in expr.atoms(sp.Piecewise)
+               for _, condition in piecewise.args)
+
+
+def _piecewise_branches(expr):
+    """Todas las expresiones que puede tomar expr según las ramas de sus Piecewise"""
+    piecewises = expr.atoms(sp.Piecewise)
+    if not piecewises:
+        return [expr]
+    piecewise = next(iter(piecewises))
+    branches = []
+    for branch, _ in piecewise.args:
+        branches.extend(_piecewise_branches(expr.xreplace({piecewise: branch})))
+    return branches
+
+
+def _nested_list(values):
+    """Convierte un arreglo a listas anidadas con None en lugar de NaN"""
+    if values.ndim == 1:
+        return [None if v != v else v for v in values.tolist()]
+    return [_nested_list(row) for row in values]
+
+
+def integrate_by_terms(expr, x):
+    """
+    Integra la expresión una sola vez, término a término si es una suma
+    
+    Por linealidad, la antiderivada de una suma se arma con las integrales de
+    sus términos; esas mismas integrales se reutilizan en el procedimiento.
+    
+    Args:
+        expr: Expresión a integrar
+        x: Variable de integración
+        
+    Returns:
+        tuple: (antiderivada, lista de (término, integral del término)) o
+            (antiderivada, None) si la expresión expandida no es una suma
+    """
+    terms = expand_terms(expr)
+    if terms is None:
+        return integrate_term(expr, x), None
+    
+    # Sólo los términos nuevos se integran; el resto sale de la caché
+    term_results = [(term, integrate_term(term, x)) for term in terms]
+    
+    # Si algún término no tiene forma cerrada, la suma completa aún podría
+    # tenerla; salvo que un término haya excedido su presupuesto, porque
+    # integrar la suma lo volvería a intentar
+    if any(term_integral.has(sp.Integral) for _, term_integral in term_results):
+        if not any(_term_failures.get(_term_key(term.as_independent(x, as_Add=False)[1], x))
+                   for term, _ in term_results):
+            return sp.integrate(expr, x), term_results
+    
+    return sp.Add(*[term_integral for _, term_integral in term_results]), term_results
+
+
+def generate_integration_procedure(expr, x, result, term_results=None):
     """
     Genera un procedimiento detallado paso a paso para la integración
     
@@ -96,6 +1063,8 @@ def generate_integration_procedure(expr, x, result):
         expr: Expresión original a integrar
         x: Variable de integración
         result: Resultado final de la integración
+        term_results (list, optional): Integrales por término ya calculadas
+            por integrate_by_terms (se evita integrar cada término de nuevo)
         
     Returns:
         list: Lista de diccionarios con los pasos
@@ -108,7 +1077,7 @@ def generate_integration_procedure(expr, x, result):
         steps.append({
             'step': step_num,
             'description': '📋 Integral a resolver',
-            'latex': f'\\int {sp.latex(expr)} \\, dx'
+            'latex': f'\\int {latex(expr)} \\, dx'
         })
         step_num += 1
         
@@ -128,15 +1097,17 @@ def generate_integration_procedure(expr, x, result):
             steps.append({
                 'step': step_num,
                 'description': '🔄 Expandir la expresión',
-                'latex': f'\\int {sp.latex(expanded)} \\, dx'
+                'latex': f'\\int {latex(expanded)} \\, dx'
             })
             step_num += 1
         
         # Paso 4: Separar suma en integrales individuales (linealidad)
         if expanded.is_Add:
-            terms = expanded.as_ordered_terms()
+            if term_results is None:
+                term_results = [(term, integrate_term(term, x)) for term in expanded.as_ordered_terms()]
+            terms = [term for term, _ in term_results]
             if len(terms) > 1:
-                integral_terms = ' + '.join([f'\\int {sp.latex(term)} \\, dx' for term in terms])
+                integral_terms = ' + '.join([f'\\int {latex(term)} \\, dx' for term in terms])
                 steps.append({
                     'step': step_num,
                     'description': '➕ Aplicar linealidad de la integral (separar suma)',
@@ -146,9 +1117,8 @@ def generate_integration_procedure(expr, x, result):
                 step_num += 1
                 
                 # Paso 5: Integrar cada término individualmente
-                for i, term in enumerate(terms, 1):
-                    term_integral = sp.integrate(term, x)
-                    term_steps = get_term_integration_steps(term, x, term_integral, i)
+                for i, (term, term_integral) in enumerate(term_results, 1):
+                    term_steps = _cached_term_steps(term, x, term_integral, i)
                     for term_step in term_steps:
                         term_step['step'] = step_num
                         steps.append(term_step)
@@ -158,7 +1128,7 @@ def generate_integration_procedure(expr, x, result):
                 steps.append({
                     'step': step_num,
                     'description': '🔗 Combinar todos los términos integrados',
-                    'latex': sp.latex(result)
+                    'latex': latex(result)
                 })
                 step_num += 1
         else:
@@ -169,13 +1139,14 @@ def generate_integration_procedure(expr, x, result):
                 steps.append(single_step)
                 step_num += 1
         
-        # Paso de simplificación si es necesario
-        simplified = sp.simplify(result)
+        # Paso de simplificación si es necesario (sin evaluar las integrales
+        # que quedaron pendientes, p. ej. términos que excedieron su presupuesto)
+        simplified = sp.simplify(result, doit=False)
         if simplified != result:
             steps.append({
                 'step': step_num,
                 'description': '✨ Simplificar el resultado',
-                'latex': sp.latex(simplified)
+                'latex': latex(simplified)
             })
             step_num += 1
         
@@ -183,21 +1154,22 @@ def generate_integration_procedure(expr, x, result):
         steps.append({
             'step': step_num,
             'description': '🎯 Resultado final (agregar constante de integración)',
-            'latex': f'{sp.latex(result)} + C'
+            'latex': f'{latex(result)} + C'
         })
         step_num += 1
         
-        # Paso de verificación
-        derivative = sp.diff(result, x)
-        derivative_simplified = sp.simplify(derivative)
-        expr_simplified = sp.simplify(expr)
+        # Paso de verificación (numérica, con simplificación sólo si no es concluyente)
+        with timed('verification'):
+            verification = verify_antiderivative(expr, result, x)
         
-        if sp.simplify(derivative_simplified - expr_simplified) == 0:
+        if verification['verified']:
             steps.append({
                 'step': step_num,
                 'description': '✅ Verificación (derivar para comprobar)',
                 'explanation': 'Si derivamos el resultado, debemos obtener la función original',
-                'latex': f'\\frac{{d}}{{dx}}\\left({sp.latex(result)}\\right) = {sp.latex(derivative_simplified)}',
+                'latex': f'\\frac{{d}}{{dx}}\\left({latex(result)}\\right) = {latex(expr)}',
+                'verification_method': verification['method'],
+                'verification_confidence': verification['confidence'],
                 'verification': True
             })
     
@@ -206,12 +1178,24 @@ def generate_integration_procedure(expr, x, result):
         steps = [{
             'step': 1,
             'description': 'Integral calculada',
-            'latex': f'\\int {sp.latex(expr)} \\, dx = {sp.latex(result)} + C'
+            'latex': f'\\int {latex(expr)} \\, dx = {latex(result)} + C'
         }]
     
     return steps
 
 
+def _cached_term_steps(term, x, term_result, term_number):
+    """Pasos de un término, reutilizados mientras el término conserve su posición"""
+    key = (sp.srepr(term), sp.srepr(x), term_number)
+    steps = _term_steps_cache.get(key)
+    if steps is None:
+        steps = get_term_integration_steps(term, x, term_result, term_number)
+        if not count_failed_terms(term, x, term_result):
+            _term_steps_cache.set(key, steps)
+    # Copia: el procedimiento numera cada paso
+    return copy.deepcopy(steps)
+
+
 def get_term_integration_steps(term, x, term_result, term_number):
     """
     Obtiene pasos detallados de integración para un solo término
@@ -232,9 +1216,9 @@ def get_term_integration_steps(term, x, term_result, term_number):
         if term.is_constant():
             # Término constante
             steps.append({
-                'description': f'📌 Término {term_number}: Integrar constante {sp.latex(term)}',
+                'description': f'📌 Término {term_number}: Integrar constante {latex(term)}',
                 'explanation': '∫k dx = kx',
-                'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
             })
         
         elif term.is_Mul:
@@ -243,30 +1227,30 @@ def get_term_integration_steps(term, x, term_result, term_number):
             
             if coeff != 1:
                 steps.append({
-                    'description': f'📌 Término {term_number}: Sacar constante {sp.latex(coeff)}',
+                    'description': f'📌 Término {term_number}: Sacar constante {latex(coeff)}',
                     'explanation': '∫k·f(x) dx = k·∫f(x) dx',
-                    'latex': f'{sp.latex(coeff)} \\int {sp.latex(var_part)} \\, dx'
+                    'latex': f'{latex(coeff)} \\int {latex(var_part)} \\, dx'
                 })
             
             # Verificar si es una potencia de x
             if var_part.is_Pow and var_part.base == x:
                 n = var_part.exp
                 steps.append({
-                    'description': f'📌 Término {term_number}: Aplicar regla de la potencia a {sp.latex(var_part)}',
-                    'explanation': f'∫x^{sp.latex(n)} dx = x^{sp.latex(n+1)}/{sp.latex(n+1)}',
-                    'latex': f'{sp.latex(coeff)} \\cdot \\frac{{x^{{{sp.latex(n+1)}}}}}{{{sp.latex(n+1)}}} = {sp.latex(term_result)}'
+                    'description': f'📌 Término {term_number}: Aplicar regla de la potencia a {latex(var_part)}',
+                    'explanation': f'∫x^{latex(n)} dx = x^{latex(n+1)}/{latex(n+1)}',
+                    'latex': f'{latex(coeff)} \\cdot \\frac{{x^{{{latex(n+1)}}}}}{{{latex(n+1)}}} = {latex(term_result)}'
                 })
             elif var_part == x:
                 steps.append({
                     'description': f'📌 Término {term_number}: Aplicar regla de la potencia a x',
                     'explanation': '∫x dx = x²/2',
-                    'latex': f'{sp.latex(coeff)} \\cdot \\frac{{x^2}}{{2}} = {sp.latex(term_result)}'
+                    'latex': f'{latex(coeff)} \\cdot \\frac{{x^2}}{{2}} = {latex(term_result)}'
                 })
             else:
                 # Otros casos de multiplicación
                 steps.append({
-                    'description': f'📌 Término {term_number}: Integrar {sp.latex(term)}',
-                    'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                    'description': f'📌 Término {term_number}: Integrar {latex(term)}',
+                    'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
                 })
         
         elif term.is_Pow and term.base == x:
@@ -274,8 +1258,8 @@ def get_term_integration_steps(term, x, term_result, term_number):
             n = term.exp
             steps.append({
                 'description': f'📌 Término {term_number}: Aplicar regla de la potencia',
-                'explanation': f'∫x^{sp.latex(n)} dx = x^{sp.latex(n+1)}/{sp.latex(n+1)}',
-                'latex': f'\\frac{{x^{{{sp.latex(n+1)}}}}}{{{sp.latex(n+1)}}} = {sp.latex(term_result)}'
+                'explanation': f'∫x^{latex(n)} dx = x^{latex(n+1)}/{latex(n+1)}',
+                'latex': f'\\frac{{x^{{{latex(n+1)}}}}}{{{latex(n+1)}}} = {latex(term_result)}'
             })
         
         elif term == x:
@@ -283,42 +1267,42 @@ def get_term_integration_steps(term, x, term_result, term_number):
             steps.append({
                 'description': f'📌 Término {term_number}: Integrar x',
                 'explanation': '∫x dx = x²/2',
-                'latex': f'\\frac{{x^2}}{{2}} = {sp.latex(term_result)}'
+                'latex': f'\\frac{{x^2}}{{2}} = {latex(term_result)}'
             })
         
         elif term.has(sp.sin):
             steps.append({
                 'description': f'📌 Término {term_number}: Integrar seno',
                 'explanation': '∫sin(x) dx = -cos(x)',
-                'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
             })
         
         elif term.has(sp.cos):
             steps.append({
                 'description': f'📌 Término {term_number}: Integrar coseno',
                 'explanation': '∫cos(x) dx = sin(x)',
-                'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
             })
         
         elif term.has(sp.exp):
             steps.append({
                 'description': f'📌 Término {term_number}: Integrar exponencial',
                 'explanation': '∫e^x dx = e^x',
-                'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
             })
         
         else:
             # Caso genérico
             steps.append({
-                'description': f'📌 Término {term_number}: Integrar {sp.latex(term)}',
-                'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+                'description': f'📌 Término {term_number}: Integrar {latex(term)}',
+                'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
             })
     
     except Exception as e:
         # Fallback para cualquier error
         steps.append({
             'description': f'📌 Término {term_number}: Integrar',
-            'latex': f'\\int {sp.latex(term)} \\, dx = {sp.latex(term_result)}'
+            'latex': f'\\int {latex(term)} \\, dx = {latex(term_result)}'
         })
     
     return steps
@@ -333,7 +1317,8 @@ def identify_integration_rule(expr, x):
         x: Variable de integración
         
     Returns:
-        dict: Diccionario con nombre de regla y explicación
+        dict: Diccionario con nombre de regla, explicación y tipo de
+            integrando ('kind', usado por fast_integrate)
     """
     try:
         # Verificar polinomios básicos
@@ -342,67 +1327,88 @@ def identify_integration_rule(expr, x):
             if degree == 0:
                 return {
                     'rule': 'Integral de una constante',
-                    'explanation': '∫k dx = kx + C'
+                    'explanation': '∫k dx = kx + C',
+                    'kind': 'polynomial'
                 }
             elif degree == 1:
                 return {
                     'rule': 'Integral de función lineal',
-                    'explanation': '∫(ax + b) dx = (a/2)x² + bx + C'
+                    'explanation': '∫(ax + b) dx = (a/2)x² + bx + C',
+                    'kind': 'polynomial'
                 }
             else:
                 return {
                     'rule': 'Regla de la potencia',
-                    'explanation': '∫xⁿ dx = xⁿ⁺¹/(n+1) + C'
+                    'explanation': '∫xⁿ dx = xⁿ⁺¹/(n+1) + C',
+                    'kind': 'polynomial'
                 }
         
+        # Verificar potencias de (ax + b) con exponente constante (raíces, potencias negativas)
+        power = expr.as_independent(x, as_Add=False)[1]
+        if power.is_Pow and not power.exp.has(x) and power.base.is_polynomial(x) and \
+                sp.degree(power.base, x) == 1:
+            return {
+                'rule': 'Regla de la potencia',
+                'explanation': '∫xⁿ dx = xⁿ⁺¹/(n+1) + C (n ≠ -1); ∫x⁻¹ dx = ln|x| + C',
+                'kind': 'power'
+            }
+        
         # Verificar funciones trigonométricas
         if expr.has(sp.sin):
             return {
                 'rule': 'Integral de seno',
-                'explanation': '∫sin(x) dx = -cos(x) + C'
+                'explanation': '∫sin(x) dx = -cos(x) + C',
+                'kind': 'sin'
             }
         elif expr.has(sp.cos):
             return {
                 'rule': 'Integral de coseno',
-                'explanation': '∫cos(x) dx = sin(x) + C'
+                'explanation': '∫cos(x) dx = sin(x) + C',
+                'kind': 'cos'
             }
         elif expr.has(sp.tan):
             return {
                 'rule': 'Integral de tangente',
-                'explanation': '∫tan(x) dx = -ln|cos(x)| + C'
+                'explanation': '∫tan(x) dx = -ln|cos(x)| + C',
+                'kind': 'tan'
             }
         
         # Verificar exponencial
         if expr.has(sp.exp):
             return {
                 'rule': 'Integral exponencial',
-                'explanation': '∫eˣ dx = eˣ + C'
+                'explanation': '∫eˣ dx = eˣ + C',
+                'kind': 'exp'
             }
         
         # Verificar logaritmo
         if expr.has(sp.log):
             return {
                 'rule': 'Integración por partes',
-                'explanation': '∫ln(x) dx = x·ln(x) - x + C'
+                'explanation': '∫ln(x) dx = x·ln(x) - x + C',
+                'kind': 'log'
             }
         
         # Verificar función racional
         if expr.is_rational_function(x):
             return {
                 'rule': 'Integral de función racional',
-                'explanation': 'Puede requerir fracciones parciales'
+                'explanation': 'Puede requerir fracciones parciales',
+                'kind': 'rational'
             }
         
         # Verificar producto (integración por partes)
         if expr.is_Mul and len(expr.args) >= 2:
             return {
                 'rule': 'Integración por partes',
-                'explanation': '∫u dv = uv - ∫v du'
+                'explanation': '∫u dv = uv - ∫v du',
+                'kind': 'parts'
             }
         
         return {
             'rule': 'Regla general de integración',
-            'explanation': 'Se aplican técnicas estándar de integración'
+            'explanation': 'Se aplican técnicas estándar de integración',
+            'kind': 'general'
         }
         
     except:
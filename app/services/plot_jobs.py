@@ -0,0 +1,204 @@
+"""
+Plot Jobs Service
+Renderizado de gráficas en segundo plano, desacoplado de /calculate
+
+El estado de cada trabajo vive en memoria del proceso que lo renderiza y,
+para los demás procesos (p. ej. otros workers de gunicorn), en un archivo
+marcador junto al PNG: vacío mientras está pendiente, con el mensaje si
+falló. El PNG direccionado por contenido indica que está listo.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import config
+from app.utils.cache import LRUCache
+from app.utils.parser import as_expression
+from app.utils.plotter import plot_filename, plot_function
+
+
+class PlotJob:
+    """Estado de una gráfica en preparación"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.done = threading.Event()
+        self.filename = None
+        self.error = None
+
+    @property
+    def status(self):
+        """'pending', 'ready' o 'error'"""
+        if not self.done.is_set():
+            return 'pending'
+        return 'ready' if self.filename else 'error'
+
+
+_executor = ThreadPoolExecutor(max_workers=config.PLOT_WORKERS, thread_name_prefix='plot')
+_jobs = LRUCache(maxsize=config.PLOT_JOBS_SIZE, ttl=config.RESULT_CACHE_TTL)
+_submit_lock = threading.Lock()
+
+
+def submit_plot(func_str, lower_limit=None, upper_limit=None):
+    """
+    Encola el renderizado de una gráfica y retorna de inmediato
+
+    El id del trabajo es el hash de contenido de la gráfica, así que
+    peticiones idénticas comparten el mismo trabajo y el mismo archivo.
+
+    Args:
+        func_str (str | sp.Expr): Función en string o ya parseada
+        lower_limit (float, optional): Límite inferior para sombrear área
+        upper_limit (float, optional): Límite superior para sombrear área
+
+    Returns:
+        str: Id del trabajo
+        None: Si los límites no son numéricos (no se grafica)
+    """
+    expr = as_expression(func_str)
+    try:
+        filename = plot_filename(expr, lower_limit, upper_limit)
+    except (TypeError, ValueError):
+        # Límites simbólicos (p. ej. 'pi'): sin gráfica, igual que plot_function
+        return None
+    job_id = _job_id(filename)
+
+    filepath = os.path.join(config.PLOTS_DIR, filename)
+
+    with _submit_lock:
+        job = _jobs.get(job_id)
+        if job is not None and (job.status == 'pending' or
+                                job.status == 'ready' and os.path.exists(filepath)):
+            return job_id
+
+        job = PlotJob(job_id)
+        _jobs.set(job_id, job)
+
+        # Gráfica ya renderizada: el trabajo nace terminado
+        if os.path.exists(filepath):
+            os.utime(filepath)
+            job.filename = filename
+            job.done.set()
+            return job_id
+
+        _write_marker(job_id)
+
+    _executor.submit(_render, job, expr, lower_limit, upper_limit)
+    return job_id
+
+
+def wait_for_plot(job_id, timeout=0):
+    """
+    Espera (long-poll) a que una gráfica esté lista
+
+    Args:
+        job_id (str): Id retornado por submit_plot
+        timeout (float): Segundos máximos de espera
+
+    Returns:
+        dict: {'status': 'pending' | 'ready' | 'error' | 'unknown', ...}
+    """
+    job = _jobs.get(job_id)
+
+    if job is None:
+        # Trabajo de otro proceso (o ya fuera de memoria): consultar los archivos
+        return _wait_for_files(job_id, timeout)
+
+    job.done.wait(timeout)
+    status = {'status': job.status}
+    if job.status == 'ready':
+        status['plot_url'] = plot_url(job_id)
+    elif job.status == 'error':
+        status['error'] = job.error
+    return status
+
+
+def plot_file(job_id):
+    """Nombre del archivo PNG de un trabajo"""
+    return f'plot_{job_id}.png'
+
+
+def plot_url(job_id):
+    """URL pública de la imagen de un trabajo"""
+    return f'/static/plots/{plot_file(job_id)}'
+
+
+def _wait_for_files(job_id, timeout):
+    """Long-poll sobre el PNG y el marcador de un trabajo de otro proceso"""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = _file_status(job_id)
+        remaining = deadline - time.monotonic()
+        if status['status'] != 'pending' or remaining <= 0:
+            return status
+        time.sleep(min(config.PLOT_POLL_INTERVAL, remaining))
+
+
+def _file_status(job_id):
+    """Estado de un trabajo según el PNG y su marcador"""
+    # El archivo es direccionado por contenido: puede existir sin trabajo en memoria
+    if os.path.exists(os.path.join(config.PLOTS_DIR, plot_file(job_id))):
+        return {'status': 'ready', 'plot_url': plot_url(job_id)}
+
+    marker = _marker_path(job_id)
+    try:
+        age = time.time() - os.path.getmtime(marker)
+        with open(marker, encoding='utf-8') as f:
+            error = f.read()
+    except OSError:
+        return {'status': 'unknown'}
+
+    if error:
+        return {'status': 'error', 'error': error}
+    # Un marcador pendiente muy viejo es de un proceso que murió renderizando
+    if age > config.PLOT_PENDING_MAX_AGE:
+        return {'status': 'unknown'}
+    return {'status': 'pending'}
+
+
+def _marker_path(job_id):
+    """Ruta del marcador de estado de un trabajo"""
+    return os.path.join(config.PLOTS_DIR, f'plot_{job_id}.job')
+
+
+def _write_marker(job_id, error=''):
+    """Publica el estado de un trabajo para los demás procesos (vacío = pendiente)"""
+    marker = _marker_path(job_id)
+    temp_path = f'{marker}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(error)
+        os.replace(temp_path, marker)
+    except OSError as e:
+        print(f"Error writing plot marker: {str(e)}")
+
+
+def _remove_marker(job_id):
+    """Elimina el marcador de un trabajo terminado con éxito"""
+    try:
+        os.remove(_marker_path(job_id))
+    except OSError:
+        pass
+
+
+def _job_id(filename):
+    """Extrae el hash de contenido del nombre de archivo"""
+    return os.path.splitext(filename)[0][len('plot_'):]
+
+
+def _render(job, expr, lower_limit, upper_limit):
+    """Renderiza la gráfica en un hilo del executor"""
+    try:
+        job.filename = plot_function(expr, lower_limit, upper_limit)
+        if job.filename is None:
+            job.error = 'No se pudo generar la gráfica'
+    except Exception as e:
+        job.error = str(e)
+    finally:
+        if job.filename:
+            _remove_marker(job.job_id)
+        else:
+            _write_marker(job.job_id, job.error or 'No se pudo generar la gráfica')
+        job.done.set()
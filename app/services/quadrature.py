@@ -0,0 +1,318 @@
+"""
+Quadrature Service
+Integración numérica adaptativa Gauss-Kronrod (G7-K15) vectorizada con NumPy
+"""
+
+import numpy as np
+
+from app.config import config
+from app.utils.kernels import get_kernel
+
+
+# Nodos y pesos de Kronrod de 15 puntos en [-1, 1]
+_KRONROD_NODES = np.array([
+    -0.991455371120812639206854697526329,
+    -0.949107912342758524526189684047851,
+    -0.864864423359769072789712788640926,
+    -0.741531185599394439863864773280788,
+    -0.586087235467691130294144845693013,
+    -0.405845151377397166906606412076961,
+    -0.207784955007898467600689403773245,
+    0.000000000000000000000000000000000,
+    0.207784955007898467600689403773245,
+    0.405845151377397166906606412076961,
+    0.586087235467691130294144845693013,
+    0.741531185599394439863864773280788,
+    0.864864423359769072789712788640926,
+    0.949107912342758524526189684047851,
+    0.991455371120812639206854697526329,
+])
+
+_KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714,
+    0.204432940075298892414161999234649,
+    0.190350578064785409913256402421014,
+    0.169004726639267902826583426598550,
+    0.140653259715525918745189590510238,
+    0.104790010322250183839876322541518,
+    0.063092092629978553290700663189204,
+    0.022935322010529224963732008058970,
+])
+
+# Pesos de Gauss de 7 puntos (los nodos de Gauss son los índices impares de Kronrod)
+_GAUSS_WEIGHTS = np.zeros(15)
+_GAUSS_WEIGHTS[1::2] = [
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+    0.417959183673469387755102040816327,
+    0.381830050505118944950369775488975,
+    0.279705391489276667901467771423780,
+    0.129484966168869693270611432679082,
+]
+
+
+def numeric_integral(expr, x, lower, upper, tol=None, max_intervals=None):
+    """
+    Calcula numéricamente la integral definida de una expresión
+
+    Args:
+        expr: Expresión de SymPy a integrar
+        x: Variable de integración
+        lower (float): Límite inferior (puede ser infinito)
+        upper (float): Límite superior (puede ser infinito)
+        tol (float, optional): Tolerancia absoluta/relativa objetivo
+        max_intervals (int, optional): Máximo de subintervalos activos
+
+    Returns:
+        dict: Valor, error estimado, número de evaluaciones y si convergió
+    """
+    kernel = get_kernel(expr, x)
+    return adaptive_quadrature(kernel, lower, upper, tol, max_intervals)
+
+
+def adaptive_quadrature(f, lower, upper, tol=None, max_intervals=None):
+    """
+    Cuadratura adaptativa Gauss-Kronrod sobre un kernel vectorizado
+
+    En cada iteración se evalúan todos los subintervalos a refinar en una sola
+    llamada al kernel. Se bisecan sólo los subintervalos cuyo error excede su
+    parte proporcional de la tolerancia global.
+
+    Args:
+        f: Función vectorizada (acepta y retorna arreglos de NumPy)
+        lower (float): Límite inferior
+        upper (float): Límite superior
+        tol (float, optional): Tolerancia objetivo (absoluta y relativa)
+        max_intervals (int, optional): Máximo de subintervalos
+
+    Returns:
+        dict: {'value', 'error', 'evaluations', 'converged'}
+    """
+    tol = config.QUADRATURE_TOLERANCE if tol is None else tol
+    max_intervals = config.QUADRATURE_MAX_INTERVALS if max_intervals is None else max_intervals
+
+    if lower == upper:
+        return _quadrature_result(0.0, 0.0, 0, True)
+
+    sign = 1.0
+    if lower > upper:
+        lower, upper, sign = upper, lower, -1.0
+
+    kernel, a, b = _map_to_finite(f, lower, upper)
+
+    starts = np.array([a])
+    ends = np.array([b])
+    estimates, errors = _gauss_kronrod(kernel, starts, ends)
+    evaluations = _KRONROD_NODES.size
+
+    while True:
+        if not (np.all(np.isfinite(estimates)) and np.all(np.isfinite(errors))):
+            return _quadrature_result(np.nan, np.inf, evaluations, False)
+
+        value = estimates.sum()
+        error = errors.sum()
+        target = max(tol, tol * abs(value))
+        if error <= target:
+            return _quadrature_result(sign * value, error, evaluations, True)
+
+        refine = errors > target / estimates.size
+        if estimates.size + refine.sum() > max_intervals:
+            return _quadrature_result(sign * value, error, evaluations, False)
+
+        # Bisecar los subintervalos con demasiado error
+        mids = 0.5 * (starts[refine] + ends[refine])
+        if np.any((mids <= starts[refine]) | (mids >= ends[refine])):
+            # Se agotó la precisión de punto flotante
+            return _quadrature_result(sign * value, error, evaluations, False)
+
+        new_starts = np.concatenate([starts[refine], mids])
+        new_ends = np.concatenate([mids, ends[refine]])
+        new_estimates, new_errors = _gauss_kronrod(kernel, new_starts, new_ends)
+        evaluations += new_starts.size * _KRONROD_NODES.size
+
+        keep = ~refine
+        starts = np.concatenate([starts[keep], new_starts])
+        ends = np.concatenate([ends[keep], new_ends])
+        estimates = np.concatenate([estimates[keep], new_estimates])
+        errors = np.concatenate([errors[keep], new_errors])
+
+
+def cumulative_quadrature(f, points, tol=None, max_intervals=None):
+    """
+    Integral acumulada de f desde el primer punto hasta cada punto
+
+    Cada tramo entre puntos consecutivos se integra una sola vez (todos a la
+    vez con batched_quadrature) y luego se suman. El costo crece con la
+    cantidad de puntos y no con la cantidad de intervalos que se consulten.
+
+    Args:
+        f: Función vectorizada (acepta y retorna arreglos de NumPy)
+        points (np.ndarray): Puntos finitos en orden creciente
+        tol (float, optional): Tolerancia objetivo de cada tramo
+        max_intervals (int, optional): Máximo de subintervalos por tramo
+
+    Returns:
+        tuple: (values, errors, failures) acumulados en cada punto; failures
+            cuenta los tramos que no convergieron hasta ese punto
+    """
+    segment_values, segment_errors, converged = batched_quadrature(
+        f, points[:-1], points[1:], tol=tol, max_intervals=max_intervals
+    )
+
+    values = np.zeros(points.size)
+    cumulative_errors = np.zeros(points.size)
+    failures = np.zeros(points.size, dtype=int)
+    values[1:] = np.cumsum(np.where(converged, segment_values, 0.0))
+    cumulative_errors[1:] = np.cumsum(np.where(converged, segment_errors, 0.0))
+    failures[1:] = np.cumsum(~converged)
+    return values, cumulative_errors, failures
+
+
+def batched_quadrature(f, lowers, uppers, params=(), tol=None, max_intervals=None):
+    """
+    Integra muchos intervalos finitos independientes a la vez
+
+    En cada iteración se evalúan en una sola llamada al kernel los
+    subintervalos de todos los intervalos que aún no convergieron. Cada
+    intervalo puede tener sus propios valores de parámetros: el kernel se
+    llama como f(x, *params) con los parámetros alineados a cada nodo.
+
+    Args:
+        f: Función vectorizada f(x, *params)
+        lowers (np.ndarray): Límites inferiores finitos
+        uppers (np.ndarray): Límites superiores finitos
+        params (tuple, optional): Arreglos de parámetros, uno por intervalo
+        tol (float, optional): Tolerancia objetivo de cada intervalo
+        max_intervals (int, optional): Máximo de subintervalos por intervalo
+
+    Returns:
+        tuple: (values, errors, converged) por intervalo
+    """
+    tol = config.QUADRATURE_TOLERANCE if tol is None else tol
+    max_intervals = config.QUADRATURE_MAX_INTERVALS if max_intervals is None else max_intervals
+
+    lowers = np.asarray(lowers, dtype=float)
+    uppers = np.asarray(uppers, dtype=float)
+    params = [np.asarray(p, dtype=float) for p in params]
+    count_total = lowers.size
+
+    values = np.zeros(count_total)
+    total_errors = np.zeros(count_total)
+    converged = lowers == uppers
+    sign = np.where(lowers > uppers, -1.0, 1.0)
+
+    def evaluate(starts, ends, owners):
+        """Regla G7-K15 con los parámetros de cada intervalo dueño"""
+        kernel = f
+        if params:
+            def kernel(nodes):
+                return f(nodes, *[p[owners][:, None] for p in params])
+        return _gauss_kronrod(kernel, starts, ends)
+
+    # Subintervalos activos y el intervalo al que pertenece cada uno
+    owners = np.flatnonzero(~converged)
+    starts = np.minimum(lowers, uppers)[owners]
+    ends = np.maximum(lowers, uppers)[owners]
+    estimates, errors = evaluate(starts, ends, owners)
+
+    while owners.size:
+        finite = np.isfinite(estimates) & np.isfinite(errors)
+        failed = np.zeros(count_total, dtype=bool)
+        failed[owners[~finite]] = True
+
+        value = np.bincount(owners, weights=np.where(finite, estimates, 0.0), minlength=count_total)
+        error = np.bincount(owners, weights=np.where(finite, errors, 0.0), minlength=count_total)
+        count = np.bincount(owners, minlength=count_total)
+        target = np.maximum(tol, tol * np.abs(value))
+
+        done = (count > 0) & ~failed & (error <= target)
+        values[done] = sign[done] * value[done]
+        total_errors[done] = error[done]
+        converged[done] = True
+
+        # Bisecar los subintervalos con demasiado error de los intervalos pendientes
+        refine = errors > (target / np.maximum(count, 1))[owners]
+        mids = 0.5 * (starts + ends)
+        failed[owners[refine & ((mids <= starts) | (mids >= ends))]] = True
+        failed |= count + np.bincount(owners[refine], minlength=count_total) > max_intervals
+
+        pending = ~(done | failed)[owners]
+        refine &= pending
+        keep = pending & ~refine
+
+        new_starts = np.concatenate([starts[refine], mids[refine]])
+        new_ends = np.concatenate([mids[refine], ends[refine]])
+        new_owners = np.concatenate([owners[refine], owners[refine]])
+        new_estimates, new_errors = evaluate(new_starts, new_ends, new_owners)
+
+        starts = np.concatenate([starts[keep], new_starts])
+        ends = np.concatenate([ends[keep], new_ends])
+        owners = np.concatenate([owners[keep], new_owners])
+        estimates = np.concatenate([estimates[keep], new_estimates])
+        errors = np.concatenate([errors[keep], new_errors])
+
+    return values, total_errors, converged
+
+
+def _quadrature_result(value, error, evaluations, converged):
+    """Empaqueta el resultado de la cuadratura"""
+    return {
+        'value': float(value),
+        'error': float(error),
+        'evaluations': int(evaluations),
+        'converged': bool(converged),
+    }
+
+
+def _gauss_kronrod(f, starts, ends):
+    """Aplica la regla G7-K15 a todos los subintervalos a la vez"""
+    centers = 0.5 * (starts + ends)[:, None]
+    half = 0.5 * (ends - starts)[:, None]
+    nodes = centers + half * _KRONROD_NODES
+
+    with np.errstate(all='ignore'):
+        values = _evaluate(f, nodes)
+        kronrod = (values @ _KRONROD_WEIGHTS) * half[:, 0]
+        gauss = (values @ _GAUSS_WEIGHTS) * half[:, 0]
+        return kronrod, np.abs(kronrod - gauss)
+
+
+def _evaluate(f, nodes):
+    """Evalúa el kernel y normaliza la salida a un arreglo real del mismo tamaño"""
+    values = np.broadcast_to(np.asarray(f(nodes)), nodes.shape)
+    if np.iscomplexobj(values):
+        if np.any(np.abs(values.imag) > 1e-12 * (1 + np.abs(values.real))):
+            return np.full(nodes.shape, np.nan)
+        values = values.real
+    return values.astype(float)
+
+
+def _map_to_finite(f, lower, upper):
+    """Transforma intervalos infinitos a uno finito mediante cambio de variable"""
+    if np.isfinite(lower) and np.isfinite(upper):
+        return f, lower, upper
+
+    if np.isfinite(lower):
+        # x = lower + t / (1 - t), t en [0, 1)
+        def kernel(t):
+            return f(lower + t / (1 - t)) / (1 - t) ** 2
+        return kernel, 0.0, 1.0
+
+    if np.isfinite(upper):
+        # x = upper - (1 - t) / t, t en (0, 1]
+        def kernel(t):
+            return f(upper - (1 - t) / t) / t ** 2
+        return kernel, 0.0, 1.0
+
+    # x = t / (1 - t^2), t en (-1, 1)
+    def kernel(t):
+        return f(t / (1 - t ** 2)) * (1 + t ** 2) / (1 - t ** 2) ** 2
+    return kernel, -1.0, 1.0
@@ -0,0 +1,153 @@
+"""
+Verification Service
+Verificación de antiderivadas por evaluación en puntos aleatorios
+"""
+
+import numpy as np
+import sympy as sp
+
+from app.config import config
+from app.utils.kernels import get_kernel
+
+
+VERIFICATION_MODES = ('numeric', 'symbolic', 'auto')
+
+
+def verify_antiderivative(expr, antiderivative, x, mode=None, seed=None):
+    """
+    Verifica que d/dx(antiderivada) == expr
+
+    En modo 'auto' se compara la derivada con el integrando en un lote de
+    puntos aleatorios (NumPy vectorizado, con mpmath de alta precisión para
+    los puntos dudosos) y sólo se recurre a sp.simplify si la comparación
+    numérica no es concluyente.
+
+    Args:
+        expr: Integrando original
+        antiderivative: Antiderivada a verificar
+        x: Variable de integración
+        mode (str, optional): 'numeric', 'symbolic' o 'auto'
+            (por defecto config.VERIFICATION_MODE)
+        seed (int, optional): Semilla de los puntos aleatorios
+            (por defecto config.VERIFICATION_SEED)
+
+    Returns:
+        dict: {'verified': bool | None, 'method': str, 'confidence': float,
+            'points': int, 'derivative': sp.Expr}
+    """
+    mode = mode or config.VERIFICATION_MODE
+    seed = config.VERIFICATION_SEED if seed is None else seed
+    derivative = sp.diff(antiderivative, x)
+
+    if mode != 'symbolic':
+        outcome = _verify_numeric(expr, derivative, x, seed)
+        if outcome is not None or mode == 'numeric':
+            outcome = outcome or _verification_result(None, 'numeric', 0.0, 0)
+            outcome['derivative'] = derivative
+            return outcome
+
+    verified = sp.simplify(derivative - expr) == 0
+    outcome = _verification_result(verified or None, 'symbolic', 1.0 if verified else 0.0, 0)
+    outcome['derivative'] = derivative
+    return outcome
+
+
+def _verify_numeric(expr, derivative, x, seed=None):
+    """
+    Compara derivada e integrando en puntos aleatorios
+
+    Returns:
+        dict: Resultado si la comparación es concluyente
+        None: Si no hubo suficientes puntos evaluables
+    """
+    points = _sample_points(config.VERIFICATION_POINTS, seed)
+    required = max(3, points.size // 2)
+
+    lhs, rhs = _evaluate_numpy(derivative, expr, x, points)
+    valid = np.isfinite(lhs) & np.isfinite(rhs)
+    close = np.zeros(points.size, dtype=bool)
+    close[valid] = np.abs(lhs[valid] - rhs[valid]) <= \
+        config.VERIFICATION_TOLERANCE * (1 + np.abs(rhs[valid]))
+
+    method = 'numeric'
+    # Reevaluar con mpmath los puntos no evaluables o en desacuerdo
+    doubtful = ~close
+    if np.any(doubtful):
+        method = 'mpmath'
+        for i in np.flatnonzero(doubtful):
+            agrees = _agree_high_precision(derivative, expr, x, points[i])
+            if agrees is None:
+                continue
+            if not agrees:
+                # Un solo punto en desacuerdo a alta precisión refuta la identidad
+                return _verification_result(False, method, 1.0, int(valid.sum()) + 1)
+            valid[i] = True
+            close[i] = True
+
+    evaluated = int(valid.sum())
+    if evaluated < required:
+        return None
+
+    agreeing = int(close[valid].sum())
+    return _verification_result(agreeing == evaluated, method, agreeing / evaluated, evaluated)
+
+
+def _sample_points(count, seed=None):
+    """Puntos aleatorios: la mitad en [-R, R] y la mitad en (0, R] para dominios positivos"""
+    rng = np.random.default_rng(seed)
+    radius = config.VERIFICATION_RANGE
+    half = count // 2
+    return np.concatenate([
+        rng.uniform(-radius, radius, count - half),
+        rng.uniform(radius * 1e-3, radius, half),
+    ])
+
+
+def _evaluate_numpy(derivative, expr, x, points):
+    """Evalúa ambas expresiones de forma vectorizada; los fallos quedan como NaN"""
+    results = []
+    for func in (derivative, expr):
+        try:
+            kernel = get_kernel(func, x)
+            with np.errstate(all='ignore'):
+                values = np.broadcast_to(np.asarray(kernel(points)), points.shape)
+            values = np.asarray(values, dtype=complex)
+            values = np.where(np.abs(values.imag) <= 1e-12 * (1 + np.abs(values.real)),
+                              values.real, np.nan)
+        except Exception:
+            values = np.full(points.shape, np.nan)
+        results.append(values.astype(float))
+    return results
+
+
+def _agree_high_precision(derivative, expr, x, point):
+    """
+    Compara ambas expresiones en un punto con mpmath
+
+    Returns:
+        bool: Si coinciden a alta precisión
+        None: Si no se pudieron evaluar
+    """
+    precision = config.VERIFICATION_PRECISION
+    try:
+        subs = {x: sp.Float(point, precision)}
+        lhs = sp.N(derivative, precision, subs=subs)
+        rhs = sp.N(expr, precision, subs=subs)
+        if not (lhs.is_number and rhs.is_number) or lhs.has(sp.nan, sp.zoo) or rhs.has(sp.nan, sp.zoo):
+            return None
+        difference = abs(complex(lhs - rhs))
+        scale = 1 + abs(complex(rhs))
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+
+    return difference <= 10 ** (-(precision // 2)) * scale
+
+
+def _verification_result(verified, method, confidence, points):
+    """Empaqueta el resultado de la verificación"""
+    return {
+        'verified': verified,
+        'method': method,
+        'confidence': round(float(confidence), 4),
+        'points': points,
+    }
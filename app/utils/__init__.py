@@ -3,7 +3,8 @@ Utils Package
 Inicialización del paquete de utilidades
 """
 
-from app.utils.parser import parse_function
-from app.utils.plotter import plot_function
+from app.utils.cache import LRUCache
+from app.utils.parser import as_expression, parse_function
+from app.utils.plotter import plot_data, plot_function
 
-__all__ = ['parse_function', 'plot_function']
+__all__ = ['LRUCache', 'as_expression', 'parse_function', 'plot_data', 'plot_function']
@@ -0,0 +1,95 @@
+"""
+Cache Utilities
+Caché LRU acotada con expiración por tiempo (TTL)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Caché LRU con límite de tamaño, expiración por TTL y contadores de uso
+
+    Las entradas más antiguas se descartan cuando se supera ``maxsize`` y
+    cualquier entrada con más de ``ttl`` segundos se considera expirada.
+    Es segura para uso concurrente desde varios hilos.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        """
+        Args:
+            maxsize (int): Número máximo de entradas
+            ttl (float, optional): Segundos de vida de cada entrada (None = sin límite)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Obtiene un valor marcándolo como usado recientemente"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, stored_at = entry
+            if self._is_expired(stored_at):
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Guarda un valor y descarta las entradas sobrantes"""
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Retorna estadísticas de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._is_expired(entry[1])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def _is_expired(self, stored_at):
+        """Indica si una entrada superó su tiempo de vida"""
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
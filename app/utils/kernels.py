@@ -0,0 +1,68 @@
+"""
+Kernel Utilities
+Caché de funciones NumPy compiladas con lambdify, compartida por el proceso
+"""
+
+import threading
+import time
+
+import sympy as sp
+
+from app.config import config
+from app.utils.cache import LRUCache
+
+
+# Kernels compilados, indexados por la forma canónica de la expresión
+_kernel_cache = LRUCache(maxsize=config.KERNEL_CACHE_SIZE)
+
+# Tiempo acumulado de compilación (generación de código + exec)
+_compile_lock = threading.Lock()
+_compiles = 0
+_compile_time = 0.0
+
+
+def get_kernel(expr, x=None):
+    """
+    Retorna la función NumPy vectorizada de una expresión
+
+    lambdify genera código fuente y lo ejecuta con exec, así que el resultado
+    se guarda por expresión canónica y variable; el gráfico, el sombreado del
+    área, la cuadratura y la verificación reutilizan el mismo kernel.
+
+    Args:
+        expr: Expresión de SymPy
+        x (sp.Symbol, optional): Variable independiente (por defecto x)
+
+    Returns:
+        callable: Función que acepta y retorna arreglos de NumPy
+    """
+    global _compiles, _compile_time
+    x = x if x is not None else sp.Symbol('x')
+    key = (sp.srepr(expr), sp.srepr(x))
+
+    kernel = _kernel_cache.get(key)
+    if kernel is None:
+        start = time.perf_counter()
+        kernel = sp.lambdify(x, expr, 'numpy')
+        elapsed = time.perf_counter() - start
+
+        with _compile_lock:
+            _compiles += 1
+            _compile_time += elapsed
+        _kernel_cache.set(key, kernel)
+    return kernel
+
+
+def clear_kernel_cache():
+    """Vacía la caché de kernels (los contadores de compilación se conservan)"""
+    _kernel_cache.clear()
+
+
+def get_kernel_stats():
+    """Retorna los contadores de la caché de kernels y el tiempo de compilación"""
+    stats = _kernel_cache.stats()
+    with _compile_lock:
+        stats['compiles'] = _compiles
+        stats['compile_time'] = round(_compile_time, 6)
+        stats['mean_compile_time'] = round(_compile_time / _compiles, 6) if _compiles else 0.0
+    return stats
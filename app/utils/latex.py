@@ -0,0 +1,118 @@
+"""
+LaTeX Utilities
+Impresión LaTeX memoizada por petición y por proceso, con medición de tiempo
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+import sympy as sp
+
+from app.config import config
+from app.utils.cache import LRUCache
+
+
+# LaTeX ya generado, indexado por el tipo, la expresión y las opciones del printer
+_latex_cache = LRUCache(maxsize=config.LATEX_CACHE_SIZE)
+
+# Alcance de la petición en curso (None fuera de latex_scope)
+_current_scope = contextvars.ContextVar('latex_scope', default=None)
+
+
+class LatexScope:
+    """
+    Memo y contadores de una petición
+
+    El memo local evita incluso el lock de la caché del proceso para las
+    expresiones que se repiten dentro de la misma respuesta.
+    """
+
+    def __init__(self):
+        self.memo = {}
+        self.calls = 0
+        self.hits = 0
+        self.time = 0.0
+
+    def merge(self, stats):
+        """Suma los contadores medidos en otro proceso (p. ej. un worker del motor)"""
+        self.calls += stats.get('calls', 0)
+        self.hits += stats.get('hits', 0)
+        self.time += stats.get('time', 0.0)
+
+    def stats(self):
+        """Retorna los contadores de la petición"""
+        return {'calls': self.calls, 'hits': self.hits, 'time': round(self.time, 6)}
+
+
+@contextmanager
+def latex_scope():
+    """
+    Abre el alcance de una petición para latex()
+
+    Yields:
+        LatexScope: Memo y contadores de la petición
+    """
+    scope = LatexScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def current_latex_scope():
+    """Retorna el LatexScope de la petición en curso, o None"""
+    return _current_scope.get()
+
+
+def latex(expr, **settings):
+    """
+    sp.latex memoizado
+
+    Busca primero en el memo de la petición y luego en la caché del
+    proceso; sólo las expresiones nuevas pasan por el printer de SymPy.
+
+    Args:
+        expr: Expresión de SymPy (o número)
+        **settings: Opciones de sp.latex
+
+    Returns:
+        str: Representación LaTeX
+    """
+    scope = _current_scope.get()
+    start = time.perf_counter()
+    # El tipo va en la clave: 1, 1.0 y True son iguales como claves de dict
+    key = (type(expr), expr, tuple(sorted(settings.items())))
+    try:
+        hash(key)
+    except TypeError:
+        # Objetos mutables (p. ej. matrices) no se pueden memoizar
+        return sp.latex(expr, **settings)
+
+    text = scope.memo.get(key) if scope is not None else None
+    hit = text is not None
+    if text is None:
+        text = _latex_cache.get(key)
+        hit = text is not None
+        if text is None:
+            text = sp.latex(expr, **settings)
+            _latex_cache.set(key, text)
+        if scope is not None:
+            scope.memo[key] = text
+
+    if scope is not None:
+        scope.calls += 1
+        scope.hits += hit
+        scope.time += time.perf_counter() - start
+    return text
+
+
+def clear_latex_cache():
+    """Vacía la caché LaTeX del proceso"""
+    _latex_cache.clear()
+
+
+def get_latex_cache_stats():
+    """Retorna los contadores de la caché LaTeX del proceso"""
+    return _latex_cache.stats()
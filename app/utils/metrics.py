@@ -0,0 +1,271 @@
+"""
+Metrics Utilities
+Tiempos por etapa, histogramas y contadores en formato de texto de Prometheus
+"""
+
+import contextvars
+import cProfile
+import hashlib
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from app.config import config
+
+
+class Histogram:
+    """
+    Histograma acumulativo de latencias (buckets de Prometheus)
+
+    Cada observación incrementa el primer bucket cuyo límite la contiene; al
+    exportar se acumulan, como espera el formato de Prometheus.
+    """
+
+    def __init__(self, buckets):
+        """
+        Args:
+            buckets (tuple): Límites superiores en segundos, en orden creciente
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Registra una observación"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Retorna [(límite, conteo acumulado)], terminando en +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsScope:
+    """Tiempos por etapa de una petición (para Server-Timing)"""
+
+    def __init__(self):
+        self.timings = []
+
+    def add(self, stage, seconds):
+        """Agrega la duración de una etapa"""
+        self.timings.append((stage, seconds))
+
+    def totals(self):
+        """Duración total por etapa, en el orden en que aparecieron"""
+        totals = {}
+        for stage, seconds in self.timings:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+
+# Registro del proceso (cada proceso de gunicorn expone el suyo)
+_lock = threading.Lock()
+_stage_histograms = {}
+_request_histograms = {}
+_counters = {}
+
+# Etapas medidas en la petición en curso (None fuera de metrics_scope)
+_current_scope = contextvars.ContextVar('metrics_scope', default=None)
+
+
+@contextmanager
+def metrics_scope():
+    """
+    Abre el alcance de una petición para las etapas medidas con timed()
+
+    Yields:
+        MetricsScope: Tiempos de las etapas de la petición
+    """
+    scope = MetricsScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def current_metrics_scope():
+    """Retorna el MetricsScope de la petición en curso, o None"""
+    return _current_scope.get()
+
+
+@contextmanager
+def timed(stage):
+    """
+    Mide una etapa: la registra en su histograma y en la petición en curso
+
+    Args:
+        stage (str): Nombre de la etapa (p. ej. 'parse', 'integrate')
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def observe_stage(stage, seconds):
+    """Registra la duración de una etapa (también las medidas en un worker)"""
+    with _lock:
+        histogram = _stage_histograms.get(stage)
+        if histogram is None:
+            histogram = _stage_histograms[stage] = Histogram(config.METRICS_BUCKETS)
+        histogram.observe(seconds)
+
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.add(stage, seconds)
+
+
+def observe_timings(timings):
+    """Registra las etapas medidas en otro proceso, en su orden original"""
+    for stage, seconds in timings:
+        observe_stage(stage, seconds)
+
+
+def observe_request(endpoint, seconds):
+    """Registra la latencia total de una petición HTTP"""
+    with _lock:
+        histogram = _request_histograms.get(endpoint)
+        if histogram is None:
+            histogram = _request_histograms[endpoint] = Histogram(config.METRICS_BUCKETS)
+        histogram.observe(seconds)
+
+
+def increment(name, **labels):
+    """Incrementa un contador con sus etiquetas"""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+def server_timing(scope, total=None):
+    """
+    Valor de la cabecera Server-Timing para las etapas de una petición
+
+    Args:
+        scope (MetricsScope): Etapas medidas
+        total (float, optional): Duración total de la petición en segundos
+
+    Returns:
+        str: p. ej. 'parse;dur=0.4, integrate;dur=12.8, total;dur=15.1'
+    """
+    entries = [f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in scope.totals().items()]
+    if total is not None:
+        entries.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(entries)
+
+
+@contextmanager
+def profiled(name):
+    """
+    cProfile muestreado para atrapar integrandos patológicos
+
+    Una fracción config.PROFILE_SAMPLE_RATE de las llamadas se ejecuta con
+    el perfilador; si tarda al menos config.PROFILE_THRESHOLD segundos, las
+    estadísticas se guardan en config.PROFILE_DIR (se abren con pstats o
+    snakeviz).
+
+    Args:
+        name (str): Texto que identifica la tarea (p. ej. la función)
+    """
+    if not config.PROFILE_SAMPLE_RATE or random.random() >= config.PROFILE_SAMPLE_RATE:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        if elapsed >= config.PROFILE_THRESHOLD:
+            _dump_profile(profiler, name, elapsed)
+
+
+def _dump_profile(profiler, name, elapsed):
+    """Guarda un perfil con la duración y un hash de la tarea en el nombre"""
+    try:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        digest = hashlib.md5(name.encode()).hexdigest()[:10]
+        filename = f'{time.strftime("%Y%m%d-%H%M%S")}-{elapsed:.1f}s-{digest}.prof'
+        profiler.dump_stats(os.path.join(config.PROFILE_DIR, filename))
+        increment('profile_dumps')
+    except OSError as e:
+        print(f"Error saving profile: {str(e)}")
+
+
+def render_prometheus(cache_stats=None):
+    """
+    Exporta las métricas del proceso en formato de texto de Prometheus
+
+    Args:
+        cache_stats (dict, optional): {nombre: LRUCache.stats()} de las cachés
+
+    Returns:
+        str: Texto para la respuesta de /metrics
+    """
+    lines = []
+    with _lock:
+        _render_histograms(lines, 'calculator_stage_seconds', 'stage', _stage_histograms,
+                           'Duración de cada etapa del cálculo')
+        _render_histograms(lines, 'calculator_request_seconds', 'endpoint', _request_histograms,
+                           'Duración total de las peticiones HTTP')
+
+        names = sorted({name for name, _ in _counters})
+        for name in names:
+            metric = f'calculator_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            for (counter, labels), value in sorted(_counters.items()):
+                if counter == name:
+                    lines.append(f'{metric}{_labels(dict(labels))} {value}')
+
+    if cache_stats:
+        for field, kind in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'),
+                            ('size', 'gauge'), ('hit_rate', 'gauge')):
+            metric = f'calculator_cache_{field}' + ('_total' if kind == 'counter' else '')
+            lines.append(f'# TYPE {metric} {kind}')
+            for cache, stats in sorted(cache_stats.items()):
+                lines.append(f'{metric}{_labels({"cache": cache})} {stats[field]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _render_histograms(lines, metric, label, histograms, help_text):
+    """Agrega las líneas de una familia de histogramas"""
+    lines.append(f'# HELP {metric} {help_text}')
+    lines.append(f'# TYPE {metric} histogram')
+    for key, histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            le = '+Inf' if bound == float('inf') else repr(float(bound))
+            lines.append(f'{metric}_bucket{_labels({label: key, "le": le})} {count}')
+        lines.append(f'{metric}_sum{_labels({label: key})} {histogram.sum}')
+        lines.append(f'{metric}_count{_labels({label: key})} {histogram.count}')
+
+
+def _labels(labels):
+    """Formatea las etiquetas como {a="1",b="2"} (vacío si no hay)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _escape(value):
+    """Escapa un valor de etiqueta según el formato de Prometheus"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
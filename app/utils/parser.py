@@ -3,35 +3,128 @@ Parser Utilities
 Utilidades para parsear expresiones matemáticas
 """
 
+import re
+from tokenize import NAME, OP
+
 import sympy as sp
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 
+from app.config import config
+from app.utils.cache import LRUCache
+
+
+# Nombres de funciones en notación española, reemplazados sólo como token completo
+_FUNCTION_ALIASES = {
+    'sen': 'sin',
+    'senh': 'sinh',
+    'asen': 'asin',
+    'tg': 'tan',
+    'tgh': 'tanh',
+    'atg': 'atan',
+}
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_PARAMETER_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+
+# Expresiones ya parseadas, indexadas por la entrada normalizada
+_parse_cache = LRUCache(maxsize=config.PARSE_CACHE_SIZE)
+
 
-def parse_function(func_str):
+def normalize_function(func_str):
+    """
+    Normaliza el texto de una función antes de parsearla (clave de la caché)
+
+    La notación ('^', 'sen', 'tg', ...) no se toca aquí: se convierte token a
+    token durante el parseo (ver _convert_notation).
+
+    Args:
+        func_str (str): Representación en string de la función
+
+    Returns:
+        str: Texto sin espacios sobrantes
+    """
+    return _WHITESPACE_PATTERN.sub(' ', func_str.strip())
+
+
+def _convert_notation(tokens, local_dict, global_dict):
+    """
+    Transformación de parse_expr: '^' como potencia y nombres en español
+
+    Sólo reemplaza tokens completos, de modo que un identificador que contenga
+    esas letras ('sena', 'xtg') o un parámetro declarado con ese nombre
+    (presente en local_dict) queda intacto.
+    """
+    result = []
+    for toknum, tokval in tokens:
+        if toknum == OP and tokval == '^':
+            tokval = '**'
+        elif toknum == NAME and tokval in _FUNCTION_ALIASES and tokval not in local_dict:
+            tokval = _FUNCTION_ALIASES[tokval]
+        result.append((toknum, tokval))
+    return result
+
+
+# Transformaciones para el parsing (se construyen una sola vez); la notación
+# se convierte antes de que auto_symbol y la multiplicación implícita vean
+# los nombres
+_TRANSFORMATIONS = ((_convert_notation,) + standard_transformations
+                    + (implicit_multiplication_application,))
+
+
+def parse_function(func_str, parameters=()):
     """
     Parsea una función matemática desde string a expresión SymPy
-    
+
+    Las entradas repetidas retornan el mismo objeto de expresión desde caché.
+
     Args:
         func_str (str): Representación en string de la función
-        
+        parameters (tuple, optional): Nombres de parámetros (p. ej. ('a', 'b'));
+            se parsean como símbolos reales y no se separan en productos
+
     Returns:
         sp.Expr: Expresión de SymPy
-        
+
     Raises:
-        ValueError: Si la función no puede ser parseada
+        ValueError: Si la función o los parámetros no son válidos
     """
+    parameters = tuple(parameters)
+    for name in parameters:
+        if not _PARAMETER_PATTERN.fullmatch(name) or name == 'x':
+            raise ValueError(f"Nombre de parámetro no válido: {name}")
+
     try:
-        # Definir transformaciones para el parsing
-        transformations = standard_transformations + (implicit_multiplication_application,)
-        
-        # Reemplazar patrones comunes
-        func_str = func_str.replace('^', '**')
-        func_str = func_str.replace('sen', 'sin')  # Español a inglés
-        func_str = func_str.replace('tg', 'tan')
-        
-        # Parsear la expresión
-        expr = parse_expr(func_str, transformations=transformations)
+        normalized = normalize_function(func_str)
+
+        key = (normalized, parameters) if parameters else normalized
+        expr = _parse_cache.get(key)
+        if expr is None:
+            # Parsear la expresión
+            local_dict = {name: parameter_symbol(name) for name in parameters}
+            expr = parse_expr(normalized, local_dict=local_dict, transformations=_TRANSFORMATIONS)
+            _parse_cache.set(key, expr)
         return expr
-        
+
     except Exception as e:
         raise ValueError(f"Error al parsear la función: {str(e)}")
+
+
+def parameter_symbol(name):
+    """Símbolo de SymPy de un parámetro (real, para simplificar las ramas)"""
+    return sp.Symbol(name, real=True)
+
+
+def as_expression(func):
+    """Retorna la expresión SymPy de un string o de una expresión ya parseada"""
+    if isinstance(func, sp.Basic):
+        return func
+    return parse_function(func)
+
+
+def clear_parse_cache():
+    """Vacía la caché del parser"""
+    _parse_cache.clear()
+
+
+def get_parse_cache_stats():
+    """Retorna los contadores de la caché del parser"""
+    return _parse_cache.stats()
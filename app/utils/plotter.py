@@ -3,22 +3,20 @@ Plot Utilities
 Utilidades para generar gráficas de funciones
 """
 
-import matplotlib
-matplotlib.use('Agg')  # Backend no interactivo
-import matplotlib.pyplot as plt
 import numpy as np
 import sympy as sp
+import base64
+import hashlib
 import os
-from datetime import datetime
+import threading
+import time
 
 from app.config import config
-from app.utils.parser import parse_function
-
-
-# Configurar matplotlib
-plt.style.use(config.MATPLOTLIB_STYLE)
-matplotlib.rcParams['figure.figsize'] = config.FIGURE_SIZE
-matplotlib.rcParams['font.size'] = config.FONT_SIZE
+from app.utils.kernels import get_kernel
+from app.utils.latex import latex
+from app.utils.parser import as_expression
+from app.utils.renderer import get_renderer
+from app.utils.sampling import sample_curve
 
 
 def plot_function(func_str, lower_limit=None, upper_limit=None):
@@ -26,7 +24,7 @@ def plot_function(func_str, lower_limit=None, upper_limit=None):
     Genera una gráfica de la función y opcionalmente el área bajo la curva
     
     Args:
-        func_str (str): Representación en string de la función
+        func_str (str | sp.Expr): Función en string o ya parseada
         lower_limit (float, optional): Límite inferior para sombrear área
         upper_limit (float, optional): Límite superior para sombrear área
         
@@ -36,38 +34,36 @@ def plot_function(func_str, lower_limit=None, upper_limit=None):
     """
     try:
         x = sp.Symbol('x')
-        expr = parse_function(func_str)
+        expr = as_expression(func_str)
+        
+        # Reutilizar la gráfica si ya existe una con el mismo contenido
+        filename = plot_filename(expr, lower_limit, upper_limit)
+        filepath = os.path.join(config.PLOTS_DIR, filename)
+        if os.path.exists(filepath):
+            os.utime(filepath)
+            return filename
         
         # Convertir a función numpy
-        f = sp.lambdify(x, expr, 'numpy')
+        f = get_kernel(expr, x)
         
         # Determinar rango de la gráfica
         x_min, x_max = _determine_plot_range(lower_limit, upper_limit)
         
-        # Generar valores de x
-        x_vals = np.linspace(x_min, x_max, config.MAX_PLOT_POINTS)
-        
-        # Calcular valores de y, manejando errores potenciales
-        x_vals, y_vals = _calculate_y_values(f, x_vals)
-        
-        if x_vals is None or y_vals is None:
+        # Muestrear la curva de forma adaptativa (NaN corta la línea en los polos)
+        curve = sample_curve(f, x_min, x_max)
+        if curve is None:
             return None
+        x_vals, y_vals, y_range = curve
         
-        # Crear gráfica
-        fig, ax = plt.subplots(figsize=config.FIGURE_SIZE)
-        
-        # Graficar la función
-        ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=f'$f(x) = {sp.latex(expr)}$')
-        
-        # Si es integral definida, sombrear el área
+        # Si es integral definida, calcular el área a sombrear
+        area = limits = None
         if lower_limit is not None and upper_limit is not None:
-            _shade_area(ax, f, float(lower_limit), float(upper_limit))
+            limits = (float(lower_limit), float(upper_limit))
+            area = _shade_area(f, *limits)
         
-        # Agregar grid y etiquetas
-        _configure_plot(ax)
-        
-        # Guardar gráfica
-        filename = _save_plot(fig)
+        # Graficar la función y guardar la gráfica
+        _save_plot(filename, x_vals, y_vals, f'$f(x) = {latex(expr)}$', area, limits, y_range)
+        _evict_plots()
         
         return filename
         
@@ -76,6 +72,93 @@ def plot_function(func_str, lower_limit=None, upper_limit=None):
         return None
 
 
+def plot_data(func_str, lower_limit=None, upper_limit=None):
+    """
+    Genera los datos muestreados de la gráfica para dibujarla en el cliente
+    
+    Las curvas se envían como arreglos float32 codificados en base64; los
+    valores no finitos (discontinuidades, fuera del dominio) quedan como NaN
+    para que el cliente corte la línea en esos puntos.
+    
+    Args:
+        func_str (str | sp.Expr): Función en string o ya parseada
+        lower_limit (float, optional): Límite inferior para sombrear área
+        upper_limit (float, optional): Límite superior para sombrear área
+        
+    Returns:
+        dict: Datos de la gráfica
+        None: Si ocurre un error
+    """
+    try:
+        x = sp.Symbol('x')
+        expr = as_expression(func_str)
+        f = get_kernel(expr, x)
+        
+        x_min, x_max = _determine_plot_range(lower_limit, upper_limit)
+        curve = sample_curve(f, x_min, x_max)
+        if curve is None:
+            return None
+        x_vals, y_vals, y_range = curve
+        
+        data = {
+            'encoding': 'float32-base64',
+            'label': f'f(x) = {expr}',
+            'x': _encode_array(x_vals),
+            'y': _encode_array(y_vals),
+            'x_range': [float(x_min), float(x_max)],
+            'y_range': list(y_range),
+            'area': None,
+        }
+        
+        # Si es integral definida, agregar el área a sombrear
+        if lower_limit is not None and upper_limit is not None:
+            lower, upper = float(lower_limit), float(upper_limit)
+            area = _shade_area(f, lower, upper)
+            if area is not None:
+                data['area'] = {
+                    'x': _encode_array(area[0]),
+                    'y': _encode_array(area[1]),
+                    'limits': [lower, upper],
+                }
+        
+        return data
+        
+    except Exception as e:
+        print(f"Error sampling plot data: {str(e)}")
+        return None
+
+
+def _encode_array(values):
+    """Codifica un arreglo como float32 little-endian en base64"""
+    return base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+
+def plot_filename(expr, lower_limit=None, upper_limit=None):
+    """
+    Nombre de archivo direccionado por contenido para una gráfica
+    
+    Depende de la forma canónica de la expresión, los límites y la
+    configuración de la figura, así que la URL identifica la imagen.
+    
+    Args:
+        expr: Expresión de SymPy
+        lower_limit (float, optional): Límite inferior
+        upper_limit (float, optional): Límite superior
+        
+    Returns:
+        str: Nombre del archivo PNG
+    """
+    limits = tuple(None if limit is None else float(limit) for limit in (lower_limit, upper_limit))
+    settings = (
+        config.MATPLOTLIB_STYLE, config.FIGURE_SIZE, config.FIGURE_DPI, config.FONT_SIZE,
+        config.MAX_PLOT_POINTS, config.PLOT_MARGIN_PERCENT, config.DEFAULT_PLOT_RANGE,
+        config.PLOT_INITIAL_POINTS, config.PLOT_MAX_DEPTH, config.PLOT_TOLERANCE,
+        config.PLOT_JUMP_RATIO, config.PLOT_VIEW_PERCENTILE,
+    )
+    key = repr((sp.srepr(expr), limits, settings)).encode('utf-8')
+    return f'plot_{hashlib.sha256(key).hexdigest()[:32]}.png'
+
+
 def _determine_plot_range(lower_limit, upper_limit):
     """Determina el rango de la gráfica"""
     if lower_limit is not None and upper_limit is not None:
@@ -87,59 +170,82 @@ def _determine_plot_range(lower_limit, upper_limit):
         return config.DEFAULT_PLOT_RANGE
 
 
-def _calculate_y_values(f, x_vals):
-    """Calcula valores de y filtrando valores inválidos"""
-    try:
-        y_vals = f(x_vals)
-        # Filtrar valores no finitos
-        mask = np.isfinite(y_vals)
-        return x_vals[mask], y_vals[mask]
-    except:
-        return None, None
-
-
-def _shade_area(ax, f, lower, upper):
-    """Sombrea el área bajo la curva"""
+def _shade_area(f, lower, upper):
+    """Calcula los puntos del área bajo la curva"""
     try:
         # Generar puntos para sombreado
         x_fill = np.linspace(lower, upper, 500)
-        y_fill = f(x_fill)
+        y_fill = np.broadcast_to(f(x_fill), x_fill.shape)
         
         # Filtrar puntos válidos
         mask_fill = np.isfinite(y_fill)
-        x_fill = x_fill[mask_fill]
-        y_fill = y_fill[mask_fill]
-        
-        # Sombrear área
-        ax.fill_between(x_fill, 0, y_fill, alpha=0.3, color='cyan',
-                       label=f'Área bajo la curva [{lower}, {upper}]')
-        
-        # Agregar líneas verticales en los límites
-        ax.axvline(x=lower, color='r', linestyle='--', alpha=0.5)
-        ax.axvline(x=upper, color='r', linestyle='--', alpha=0.5)
+        return x_fill[mask_fill], y_fill[mask_fill]
     except Exception as e:
         print(f"Error shading area: {str(e)}")
+        return None
+
+
+def _save_plot(filename, x_vals, y_vals, label, area=None, limits=None, y_range=None):
+    """Dibuja y guarda la gráfica de forma atómica con el nombre indicado"""
+    filepath = os.path.join(config.PLOTS_DIR, filename)
+    temp_path = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+    
+    get_renderer().render(x_vals, y_vals, label, temp_path, area, limits, y_range)
+    
+    # Renombrar al final para que nunca se sirva un archivo a medio escribir
+    os.replace(temp_path, filepath)
 
 
-def _configure_plot(ax):
-    """Configura la apariencia de la gráfica"""
-    ax.grid(True, alpha=0.3)
-    ax.axhline(y=0, color='k', linewidth=0.5)
-    ax.axvline(x=0, color='k', linewidth=0.5)
-    ax.set_xlabel('x', fontsize=12)
-    ax.set_ylabel('f(x)', fontsize=12)
-    ax.set_title('Gráfica de la Función', fontsize=14, fontweight='bold')
-    ax.legend(loc='best')
+# Momento de la última limpieza del directorio de gráficas
+_last_eviction = 0.0
+_eviction_lock = threading.Lock()
 
 
-def _save_plot(fig):
-    """Guarda la gráfica y retorna el nombre del archivo"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-    filename = f'plot_{timestamp}.png'
-    filepath = os.path.join(config.PLOTS_DIR, filename)
+def _evict_plots(force=False):
+    """
+    Elimina gráficas viejas o sobrantes de config.PLOTS_DIR
     
-    plt.tight_layout()
-    plt.savefig(filepath, dpi=config.FIGURE_DPI, bbox_inches='tight')
-    plt.close()
+    Se borran las que no se usan hace más de PLOTS_MAX_AGE segundos y, si el
+    directorio aún supera PLOTS_MAX_BYTES, las usadas hace más tiempo. Sólo
+    cuentan los PNG terminados: los temporales que _save_plot está escribiendo
+    y los marcadores .job de plot_jobs se borran únicamente si quedaron
+    huérfanos por más de PLOTS_MAX_AGE.
+    """
+    global _last_eviction
+    now = time.time()
+    with _eviction_lock:
+        if not force and now - _last_eviction < config.PLOTS_EVICTION_INTERVAL:
+            return
+        _last_eviction = now
     
-    return filename
+    try:
+        entries = []
+        leftovers = []
+        with os.scandir(config.PLOTS_DIR) as it:
+            for entry in it:
+                if not entry.is_file() or not entry.name.startswith('plot_'):
+                    continue
+                stat = entry.stat()
+                if entry.name.endswith('.png'):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif now - stat.st_mtime > config.PLOTS_MAX_AGE:
+                    leftovers.append(entry.path)
+        
+        for path in leftovers:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= config.PLOTS_MAX_AGE and total_size <= config.PLOTS_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except FileNotFoundError:
+                pass
+    except OSError as e:
+        print(f"Error evicting plots: {str(e)}")
@@ -0,0 +1,119 @@
+"""
+Renderer Utilities
+Renderizador de gráficas sin pyplot, seguro para usar desde varios hilos
+"""
+
+import threading
+
+import matplotlib
+matplotlib.use('Agg')  # Backend no interactivo
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from app.config import config
+
+
+# Configurar matplotlib una sola vez al importar (nunca durante un render)
+matplotlib.style.use(config.MATPLOTLIB_STYLE)
+matplotlib.rcParams['figure.figsize'] = config.FIGURE_SIZE
+matplotlib.rcParams['font.size'] = config.FONT_SIZE
+
+
+class PlotRenderer:
+    """
+    Plantilla de figura preparada (ejes, grilla, estilo, títulos)
+
+    Usa la API orientada a objetos (Figure + FigureCanvasAgg) en lugar de la
+    máquina de estados de pyplot. Cada render sólo actualiza los artistas de
+    la curva, el área sombreada, las líneas de los límites y la leyenda.
+    Una instancia no debe compartirse entre hilos; use get_renderer().
+    """
+
+    def __init__(self):
+        self.figure = Figure(figsize=config.FIGURE_SIZE)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+        # Agregar grid y etiquetas
+        self.ax.grid(True, alpha=0.3)
+        self.ax.axhline(y=0, color='k', linewidth=0.5)
+        self.ax.axvline(x=0, color='k', linewidth=0.5)
+        self.ax.set_xlabel('x', fontsize=12)
+        self.ax.set_ylabel('f(x)', fontsize=12)
+        self.ax.set_title('Gráfica de la Función', fontsize=14, fontweight='bold')
+
+        # Artistas que se actualizan en cada render
+        self.line, = self.ax.plot([], [], 'b-', linewidth=2)
+        self.area = self.ax.fill_between([0, 0], 0, [0, 0], alpha=0.3, color='cyan')
+        self.lower_line = self.ax.axvline(x=0, color='r', linestyle='--', alpha=0.5)
+        self.upper_line = self.ax.axvline(x=0, color='r', linestyle='--', alpha=0.5)
+
+        self.figure.tight_layout()
+
+    def render(self, x_vals, y_vals, label, filepath, area=None, limits=None, y_range=None):
+        """
+        Dibuja la curva y guarda la imagen PNG
+
+        Args:
+            x_vals (np.ndarray): Valores de x de la curva
+            y_vals (np.ndarray): Valores de y de la curva (NaN corta la línea)
+            label (str): Etiqueta de la curva para la leyenda
+            filepath (str): Ruta (o archivo abierto) donde guardar la imagen
+            area (tuple, optional): (x_fill, y_fill) del área bajo la curva
+            limits (tuple, optional): (lower, upper) para las líneas verticales
+            y_range (tuple, optional): (y_min, y_max) visible; por defecto se autoescala
+        """
+        self.line.set_data(x_vals, y_vals)
+        self.line.set_label(label)
+
+        handles = [self.line]
+        has_area = area is not None and limits is not None
+        if has_area:
+            x_fill, y_fill = area
+            self.area.set_verts([_area_polygon(x_fill, y_fill)])
+            self.area.set_label(f'Área bajo la curva [{limits[0]}, {limits[1]}]')
+            self.lower_line.set_xdata([limits[0], limits[0]])
+            self.upper_line.set_xdata([limits[1], limits[1]])
+            handles.append(self.area)
+
+        for artist in (self.area, self.lower_line, self.upper_line):
+            artist.set_visible(has_area)
+
+        self.ax.relim(visible_only=True)
+        self.ax.set_autoscaley_on(True)
+        self.ax.autoscale_view()
+        if y_range is not None:
+            # Dejar un margen como el autoescalado (e incluir el área sombreada)
+            y_min, y_max = y_range
+            if has_area:
+                y_min, y_max = min(y_min, 0.0), max(y_max, 0.0)
+            margin = (y_max - y_min) * 0.05
+            self.ax.set_ylim(y_min - margin, y_max + margin)
+        self.ax.legend(handles=handles, loc='best')
+
+        self.figure.savefig(filepath, dpi=config.FIGURE_DPI, bbox_inches='tight', format='png')
+
+
+def _area_polygon(x_fill, y_fill):
+    """Polígono cerrado entre la curva y el eje x (equivalente a fill_between)"""
+    if len(x_fill) == 0:
+        return np.zeros((0, 2))
+
+    xs = np.concatenate([[x_fill[0]], x_fill, [x_fill[-1]]])
+    ys = np.concatenate([[0.0], y_fill, [0.0]])
+    return np.column_stack([xs, ys])
+
+
+# Una plantilla por hilo: las figuras de matplotlib no son seguras entre hilos
+_local = threading.local()
+
+
+def get_renderer():
+    """Retorna el renderizador del hilo actual, creándolo si es necesario"""
+    renderer = getattr(_local, 'renderer', None)
+    if renderer is None:
+        renderer = PlotRenderer()
+        _local.renderer = renderer
+    return renderer
@@ -0,0 +1,178 @@
+"""
+Sampling Utilities
+Muestreo adaptativo de curvas con detección de polos y discontinuidades
+"""
+
+import numpy as np
+
+from app.config import config
+
+
+def sample_curve(f, x_min, x_max, max_points=None):
+    """
+    Muestrea f en [x_min, x_max] refinando sólo donde hace falta
+
+    Parte de una grilla gruesa y, en cada ronda, evalúa de una vez los puntos
+    medios de los intervalos pendientes. Un intervalo se da por bueno cuando
+    su punto medio se aparta de la cuerda menos que PLOT_TOLERANCE (relativo
+    a la altura visible). Los intervalos que siguen sin converger al ancho
+    mínimo y cuyo salto no se reparte al partirlos (queda entero en una de
+    las mitades) se tratan como polos o saltos: se inserta un NaN entre sus
+    extremos para cortar la línea.
+
+    Args:
+        f (callable): Función vectorizada (lambdify con NumPy)
+        x_min (float): Inicio del rango
+        x_max (float): Fin del rango
+        max_points (int, optional): Presupuesto de evaluaciones
+            (por defecto config.MAX_PLOT_POINTS)
+
+    Returns:
+        tuple: (x_vals, y_vals, y_range); y_vals tiene NaN donde la curva se
+            corta y y_range es el rango vertical a mostrar
+        None: Si la función no tiene valores finitos en el rango
+    """
+    max_points = max_points or config.MAX_PLOT_POINTS
+    # Una parte del presupuesto se reserva para confirmar los cortes
+    reserve = max_points // 20
+    initial = min(config.PLOT_INITIAL_POINTS, max_points - reserve)
+
+    x_vals = np.linspace(x_min, x_max, initial)
+    y_vals = evaluate_real(f, x_vals)
+
+    view = _view_range(y_vals)
+    if view is None:
+        return None
+    low, high = view
+    scale = high - low
+    # Los valores se recortan a una banda alrededor de la vista: lo que pasa
+    # muy por fuera no se dibuja y no debe consumir puntos
+    clip_low, clip_high = low - scale, high + scale
+
+    intervals = initial - 1
+    error = np.full(intervals, np.inf)
+    active = np.ones(intervals, dtype=bool)
+    min_width = (x_max - x_min) / intervals / 2 ** config.PLOT_MAX_DEPTH
+
+    for _ in range(config.PLOT_MAX_DEPTH):
+        remaining = max_points - reserve - x_vals.size
+        candidates = np.flatnonzero(active)
+        if candidates.size == 0 or remaining <= 0:
+            break
+        if candidates.size > remaining:
+            # Sin presupuesto para todos: primero los de mayor error
+            keep = np.argsort(-error[candidates], kind='stable')[:remaining]
+            candidates = np.sort(candidates[keep])
+
+        x_mid = 0.5 * (x_vals[candidates] + x_vals[candidates + 1])
+        y_mid = evaluate_real(f, x_mid)
+
+        split_error = _chord_error(y_vals[candidates], y_mid, y_vals[candidates + 1],
+                                   clip_low, clip_high) / scale
+        error[candidates] = split_error
+        active[:] = False
+        active[candidates] = split_error > config.PLOT_TOLERANCE
+
+        # Cada intervalo refinado se parte en dos hijos que heredan su estado
+        counts = np.ones(error.size, dtype=int)
+        counts[candidates] = 2
+        error = np.repeat(error, counts)
+        active = np.repeat(active, counts)
+        x_vals = np.insert(x_vals, candidates + 1, x_mid)
+        y_vals = np.insert(y_vals, candidates + 1, y_mid)
+
+    x_vals, y_vals = _split_at_breaks(f, x_vals, y_vals, active, min_width,
+                                      clip_low, clip_high, scale, reserve)
+    return x_vals, y_vals, view
+
+
+def evaluate_real(f, x_vals):
+    """Evalúa f de forma vectorizada; valores complejos, no finitos o fallidos quedan como NaN"""
+    try:
+        with np.errstate(all='ignore'):
+            values = np.broadcast_to(np.asarray(f(x_vals)), x_vals.shape)
+    except Exception:
+        return np.full(x_vals.shape, np.nan)
+
+    if np.iscomplexobj(values):
+        values = np.where(np.abs(values.imag) <= 1e-12 * (1 + np.abs(values.real)),
+                          values.real, np.nan)
+    values = np.array(values, dtype=float)
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def _view_range(y_vals):
+    """
+    Rango vertical robusto a partir de la muestra uniforme inicial
+
+    Se basa en los percentiles para que un valor enorme cerca de un polo no
+    aplaste el resto de la curva.
+    """
+    finite = y_vals[np.isfinite(y_vals)]
+    if finite.size == 0:
+        return None
+
+    low, high = np.percentile(finite, [config.PLOT_VIEW_PERCENTILE, 100 - config.PLOT_VIEW_PERCENTILE])
+    spread = high - low
+    low = max(finite.min(), low - spread)
+    high = min(finite.max(), high + spread)
+
+    if high - low <= 1e-12 * (1 + abs(high)):
+        # Curva constante (o casi): dar una altura mínima
+        pad = max(abs(high), 1.0) * 0.5
+        return float(low - pad), float(high + pad)
+    return float(low), float(high)
+
+
+def _chord_error(y_left, y_mid, y_right, clip_low, clip_high):
+    """Distancia del punto medio a la cuerda; infinita en los bordes del dominio"""
+    left = np.clip(y_left, clip_low, clip_high)
+    mid = np.clip(y_mid, clip_low, clip_high)
+    right = np.clip(y_right, clip_low, clip_high)
+
+    error = np.abs(mid - 0.5 * (left + right))
+
+    # Exactamente algún extremo indefinido: hay un borde del dominio que ubicar
+    missing = np.isnan(left).astype(int) + np.isnan(mid) + np.isnan(right)
+    error[(missing > 0) & (missing < 3)] = np.inf
+    error[missing == 3] = 0.0
+    return error
+
+
+def _split_at_breaks(f, x_vals, y_vals, active, min_width, clip_low, clip_high, scale, budget):
+    """
+    Inserta NaN en los intervalos que no convergieron al ancho mínimo y saltan
+
+    Una pendiente grande pero continua reparte el salto entre las dos mitades
+    del intervalo; un polo o una discontinuidad lo deja casi entero en una.
+    La comparación usa los valores sin recortar, porque el recorte a la banda
+    visible también concentra el salto cerca de un polo.
+    """
+    left = np.clip(y_vals[:-1], clip_low, clip_high)
+    right = np.clip(y_vals[1:], clip_low, clip_high)
+    widths = np.diff(x_vals)
+
+    with np.errstate(invalid='ignore'):
+        jump = np.abs(right - left)
+        suspects = np.flatnonzero(active & (jump > config.PLOT_JUMP_RATIO * scale) &
+                                  (widths <= min_width * 1.5))
+    if suspects.size == 0 or budget <= 0:
+        return x_vals, y_vals
+    if suspects.size > budget:
+        keep = np.argsort(-jump[suspects], kind='stable')[:budget]
+        suspects = np.sort(suspects[keep])
+
+    y_left, y_right = y_vals[suspects], y_vals[suspects + 1]
+    x_mid = 0.5 * (x_vals[suspects] + x_vals[suspects + 1])
+    mid = evaluate_real(f, x_mid)
+    with np.errstate(invalid='ignore'):
+        largest_half = np.maximum(np.abs(mid - y_left), np.abs(y_right - mid))
+        concentrated = largest_half >= 0.9 * np.abs(y_right - y_left)
+    breaks = suspects[concentrated]
+    if breaks.size == 0:
+        return x_vals, y_vals
+
+    x_break = 0.5 * (x_vals[breaks] + x_vals[breaks + 1])
+    return (np.insert(x_vals, breaks + 1, x_break),
+            np.insert(y_vals, breaks + 1, np.nan))
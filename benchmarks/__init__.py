@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Mediciones de rendimiento de la calculadora
+"""
@@ -0,0 +1,72 @@
+"""
+Benchmark Corpus
+Integrandos de referencia agrupados por categoría
+
+Cada caso es (función, límite inferior, límite superior); los límites
+permiten medir también la integral definida y el sombreado de la gráfica.
+"""
+
+CORPUS = {
+    'polynomials': [
+        ('x^2', '0', '1'),
+        ('3*x^5 - 2*x^3 + x - 7', '-1', '2'),
+        ('(x + 1)^6', '0', '1'),
+        ('x^12 + 4*x^9 - x^4 + 2*x', '-2', '2'),
+    ],
+    'trig': [
+        ('sin(x)', '0', '3'),
+        ('cos(3*x + 1)', '0', '1'),
+        ('sin(x)^2', '0', '3'),
+        ('tan(x)', '0', '1'),
+        ('sin(x)*cos(x)^3', '0', '1'),
+    ],
+    'exponential': [
+        ('exp(x)', '0', '1'),
+        ('exp(-2*x + 3)', '0', '2'),
+        ('2^x', '0', '3'),
+        ('exp(x)*sin(x)', '0', '3'),
+    ],
+    'rational': [
+        ('1/x', '1', '2'),
+        ('1/(x^2 + 1)', '-1', '1'),
+        ('(x^3 + 2)/(x^2 - 4)', '3', '4'),
+        ('1/(x^4 + 1)', '0', '1'),
+    ],
+    'by_parts': [
+        ('x*sin(x)', '0', '3'),
+        ('x^2*exp(x)', '0', '1'),
+        ('x*log(x)', '1', '2'),
+        ('log(x)^2', '1', '3'),
+    ],
+    'non_elementary': [
+        ('exp(-x^2)', '-1', '1'),
+        ('sin(x)/x', '1', '2'),
+        ('exp(x)/x', '1', '2'),
+        ('sin(x^2)', '0', '1'),
+        ('1/log(x)', '2', '3'),
+    ],
+    'pathological': [
+        ('x^x', '1', '2'),
+        ('sqrt(tan(x))', '0.1', '1'),
+        ('exp(sin(x))*x^3', '0', '1'),
+        ('1/(x^5 + x + 1)', '0', '1'),
+        ('tan(x)^5*exp(sin(x)^3)/(1 + x^7)', '0', '1'),
+    ],
+}
+
+CATEGORIES = tuple(CORPUS)
+
+
+def iter_cases(categories=None):
+    """
+    Recorre los casos del corpus
+
+    Args:
+        categories (iterable, optional): Categorías a incluir (por defecto todas)
+
+    Yields:
+        tuple: (categoría, función, límite inferior, límite superior)
+    """
+    for category in categories or CATEGORIES:
+        for func_str, lower, upper in CORPUS[category]:
+            yield category, func_str, lower, upper
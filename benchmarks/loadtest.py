@@ -0,0 +1,343 @@
+"""
+Load Test
+Throughput y latencias de /calculate bajo concurrencia, levantando la
+aplicación localmente con gunicorn (o el servidor de desarrollo de Werkzeug)
+
+Cada configuración (clase de worker x número de workers) se levanta en un
+proceso aparte, recibe el mismo tráfico ponderado durante --duration
+segundos y se reportan peticiones/s, p50/p95/p99 y tasa de error.
+
+Uso:
+    python -m benchmarks.loadtest [--server gunicorn] [--worker-class sync gthread]
+                                  [--workers 1 2 4] [--threads 4] [--concurrency 8]
+                                  [--duration 30] [--warmup 5] [--profile trafico.json]
+                                  [--output resultados.json]
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 (servidor ya levantado)
+
+El perfil de tráfico es una lista JSON de {"weight": w, "payload": {...}};
+"{k}" dentro de "function" se reemplaza por un entero aleatorio en cada
+petición, para simular funciones que no están en caché.
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+# Mezcla por defecto: sobre todo polinomios y funciones simples (muchas
+# repetidas, servidas desde caché) y una cola de integrandos más costosos
+DEFAULT_PROFILE = [
+    {'weight': 30, 'payload': {'function': 'x^2', 'lower_limit': '0', 'upper_limit': '1', 'plot_mode': 'data'}},
+    {'weight': 20, 'payload': {'function': '{k}*x^3 + 2*x - 1', 'lower_limit': '0', 'upper_limit': '2', 'plot_mode': 'data'}},
+    {'weight': 15, 'payload': {'function': 'sin({k}*x)', 'plot_mode': 'data'}},
+    {'weight': 10, 'payload': {'function': 'exp(x/{k})', 'lower_limit': '0', 'upper_limit': '1', 'plot_mode': 'data'}},
+    {'weight': 8, 'payload': {'function': 'x*sin(x)', 'lower_limit': '0', 'upper_limit': '3', 'plot_mode': 'image'}},
+    {'weight': 7, 'payload': {'function': '1/(x^2 + {k})', 'lower_limit': '-1', 'upper_limit': '1', 'plot_mode': 'data'}},
+    {'weight': 5, 'payload': {'function': 'x^2*exp(x) + log(x + {k})', 'plot_mode': 'data'}},
+    {'weight': 3, 'payload': {'function': 'exp(-x^2)', 'lower_limit': '-1', 'upper_limit': '1', 'plot_mode': 'data'}},
+    {'weight': 2, 'payload': {'function': 'sqrt(tan(x)) + x^{k}', 'plot_mode': 'none'}},
+]
+
+WORKER_CLASS_MODULES = {'gevent': 'gevent', 'eventlet': 'eventlet', 'tornado': 'tornado'}
+
+
+class TrafficProfile:
+    """Payloads de /calculate con sus pesos"""
+
+    def __init__(self, entries):
+        self.payloads = [entry['payload'] for entry in entries]
+        self.weights = [entry.get('weight', 1) for entry in entries]
+
+    @classmethod
+    def load(cls, path=None):
+        """Perfil desde un archivo JSON, o el perfil por defecto"""
+        if path is None:
+            return cls(DEFAULT_PROFILE)
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def sample(self, rng):
+        """Elige un payload según los pesos y completa "{k}" en la función"""
+        payload = dict(rng.choices(self.payloads, weights=self.weights)[0])
+        payload['function'] = payload['function'].replace('{k}', str(rng.randint(2, 1000)))
+        return payload
+
+
+def run_load(base_url, profile, concurrency, duration, warmup=0.0, timeout=60.0, seed=0):
+    """
+    Envía tráfico a /calculate desde varios hilos durante un tiempo fijo
+
+    Args:
+        base_url (str): URL del servidor (p. ej. http://127.0.0.1:8000)
+        profile (TrafficProfile): Mezcla de payloads
+        concurrency (int): Hilos enviando peticiones en paralelo
+        duration (float): Segundos de medición
+        warmup (float): Segundos previos cuyas peticiones no se cuentan
+        timeout (float): Tiempo límite de cada petición HTTP
+        seed (int): Semilla para que la secuencia de payloads sea reproducible
+
+    Returns:
+        dict: Peticiones/s, percentiles de latencia (ms) y tasa de error
+    """
+    url = base_url.rstrip('/') + '/calculate'
+    start = time.monotonic()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    samples = []
+    lock = threading.Lock()
+
+    def client(index):
+        rng = random.Random(seed * 1000 + index)
+        local = []
+        while True:
+            sent = time.monotonic()
+            if sent >= deadline:
+                break
+            status = _post(url, profile.sample(rng), timeout)
+            done = time.monotonic()
+            if sent >= measure_from:
+                local.append((done - sent, status))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(samples, duration)
+
+
+def _post(url, payload, timeout):
+    """Envía una petición y retorna el código HTTP (0 si falló la conexión)"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def summarize(samples, duration):
+    """
+    Resume las muestras (latencia, código HTTP) de una corrida
+
+    Las respuestas 504 (tiempo límite de la integral) cuentan como error,
+    igual que los 5xx y las conexiones fallidas; los 400 también, porque el
+    perfil sólo debería tener funciones válidas.
+    """
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if not 200 <= status < 300)
+    count = len(samples)
+
+    return {
+        'requests': count,
+        'rps': count / duration if duration else 0.0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p95_ms': _percentile(latencies, 95) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'error_rate': errors / count if count else 0.0,
+        'status_codes': _count_statuses(samples),
+    }
+
+
+def _percentile(sorted_values, q):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-q * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _count_statuses(samples):
+    """Cantidad de respuestas por código HTTP"""
+    counts = {}
+    for _, status in samples:
+        counts[str(status)] = counts.get(str(status), 0) + 1
+    return counts
+
+
+class LocalServer:
+    """
+    Aplicación levantada en un proceso aparte sobre un puerto libre
+
+    Se usa como context manager: al salir se termina el proceso (y con él
+    los workers de gunicorn y sus pools de integración).
+    """
+
+    def __init__(self, server='gunicorn', workers=1, worker_class='sync', threads=1,
+                 engine_workers=None):
+        self.port = _free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self.command = _server_command(server, self.port, workers, worker_class, threads)
+        self.env = dict(os.environ)
+        if engine_workers is not None:
+            self.env['ENGINE_WORKERS'] = str(engine_workers)
+        self.process = None
+        self.log = None
+
+    def __enter__(self):
+        # El log va a un archivo: un pipe sin leer podría bloquear al servidor
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(self.command, env=self.env,
+                                        stdout=subprocess.DEVNULL, stderr=self.log)
+        try:
+            self._wait_ready()
+        except Exception:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+
+    def _wait_ready(self, timeout=120):
+        """Espera a que el servidor responda en / (importar SymPy toma unos segundos)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                raise RuntimeError('El servidor terminó al arrancar:\n' +
+                                   self.log.read().decode(errors='replace'))
+            try:
+                with urllib.request.urlopen(self.url + '/', timeout=2):
+                    return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.5)
+        raise RuntimeError(f'El servidor no respondió en {timeout} segundos')
+
+
+def _server_command(server, port, workers, worker_class, threads):
+    """Línea de comandos para levantar create_app con el servidor elegido"""
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', 'app:create_app()',
+                   '--bind', f'127.0.0.1:{port}',
+                   '--workers', str(workers),
+                   '--worker-class', worker_class,
+                   '--timeout', '120',
+                   '--log-level', 'warning']
+        # Con --threads > 1 gunicorn cambia sync por gthread sin avisar, y la
+        # fila quedaría mal etiquetada: los hilos sólo se pasan a gthread
+        if worker_class == 'gthread':
+            command += ['--threads', str(threads)]
+        return command
+
+    # Servidor de desarrollo de Werkzeug (un proceso, un hilo por petición)
+    return [sys.executable, '-m', 'flask', '--app', 'app:create_app', 'run',
+            '--host', '127.0.0.1', '--port', str(port),
+            '--no-reload', '--no-debugger', '--with-threads']
+
+
+def _free_port():
+    """Puerto TCP libre en localhost"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _available(worker_class):
+    """Indica si la clase de worker de gunicorn tiene sus dependencias instaladas"""
+    module = WORKER_CLASS_MODULES.get(worker_class)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _format_row(label, stats):
+    """Línea de la tabla de resultados"""
+    return (f"{label:<28} {stats['requests']:>8} {stats['rps']:>9.1f} {stats['p50_ms']:>9.1f} "
+            f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['error_rate'] * 100:>7.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='servidor ya levantado (no se arranca ninguno)')
+    parser.add_argument('--server', choices=('gunicorn', 'werkzeug'), default='gunicorn')
+    parser.add_argument('--worker-class', nargs='+', default=['sync'],
+                        help='clases de worker de gunicorn a comparar (sync, gthread, gevent...)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                        help='números de workers de gunicorn a comparar')
+    parser.add_argument('--threads', type=int, default=1, help='hilos por worker (sólo gthread; se ignora en las demás clases)')
+    parser.add_argument('--engine-workers', type=int,
+                        help='procesos del motor de integración por worker (ENGINE_WORKERS)')
+    parser.add_argument('--concurrency', type=int, default=8, help='clientes en paralelo')
+    parser.add_argument('--duration', type=float, default=30.0, help='segundos de medición')
+    parser.add_argument('--warmup', type=float, default=5.0, help='segundos de calentamiento')
+    parser.add_argument('--profile', help='perfil de tráfico JSON (por defecto DEFAULT_PROFILE)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='archivo JSON donde guardar los resultados')
+    args = parser.parse_args()
+
+    profile = TrafficProfile.load(args.profile)
+
+    if args.url:
+        configurations = [('externo', None)]
+    elif args.server == 'werkzeug':
+        configurations = [('werkzeug', {'server': 'werkzeug'})]
+    else:
+        worker_classes = []
+        for worker_class in args.worker_class:
+            if _available(worker_class):
+                worker_classes.append(worker_class)
+            else:
+                print(f'Se omite {worker_class}: falta el paquete {WORKER_CLASS_MODULES[worker_class]}')
+
+        configurations = []
+        for worker_class, workers in itertools.product(worker_classes, args.workers):
+            threads = args.threads if worker_class == 'gthread' else 1
+            label = f'{worker_class} x{workers}' + (f' ({threads} hilos)' if threads > 1 else '')
+            configurations.append((label, {
+                'server': 'gunicorn', 'workers': workers,
+                'worker_class': worker_class, 'threads': threads,
+            }))
+
+    print(f"{'configuración':<28} {'peticiones':>8} {'req/s':>9} {'p50 ms':>9} "
+          f"{'p95 ms':>9} {'p99 ms':>9} {'errores':>8}")
+
+    results = []
+    for label, options in configurations:
+        if options is None:
+            stats = run_load(args.url, profile, args.concurrency, args.duration,
+                             args.warmup, seed=args.seed)
+        else:
+            with LocalServer(engine_workers=args.engine_workers, **options) as server:
+                stats = run_load(server.url, profile, args.concurrency, args.duration,
+                                 args.warmup, seed=args.seed)
+        print(_format_row(label, stats))
+        results.append({'configuration': label, **(options or {'url': args.url}), **stats})
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'concurrency': args.concurrency,
+                'duration': args.duration,
+                'warmup': args.warmup,
+                'engine_workers': args.engine_workers,
+                'results': results,
+            }, f, indent=2)
+        print(f'Resultados guardados en {args.output}')
+
+
+if __name__ == '__main__':
+    main()
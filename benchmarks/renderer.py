@@ -0,0 +1,100 @@
+"""
+Renderer Benchmark
+Compara el renderizador con plantilla (Figure + FigureCanvasAgg) contra el
+camino anterior basado en pyplot
+
+Uso:
+    python -m benchmarks.renderer [--renders 50] [--threads 4]
+"""
+
+import argparse
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.config import config
+from app.utils.renderer import PlotRenderer, get_renderer
+
+
+FUNCTIONS = [np.sin, np.cos, np.exp, np.square, np.tanh]
+
+
+def render_pyplot(x_vals, y_vals, area, limits, target):
+    """Camino anterior: figura nueva con pyplot en cada render"""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=config.FIGURE_SIZE)
+    ax.plot(x_vals, y_vals, 'b-', linewidth=2, label='$f(x)$')
+    ax.fill_between(area[0], 0, area[1], alpha=0.3, color='cyan',
+                    label=f'Área bajo la curva [{limits[0]}, {limits[1]}]')
+    ax.axvline(x=limits[0], color='r', linestyle='--', alpha=0.5)
+    ax.axvline(x=limits[1], color='r', linestyle='--', alpha=0.5)
+    ax.grid(True, alpha=0.3)
+    ax.axhline(y=0, color='k', linewidth=0.5)
+    ax.axvline(x=0, color='k', linewidth=0.5)
+    ax.set_xlabel('x', fontsize=12)
+    ax.set_ylabel('f(x)', fontsize=12)
+    ax.set_title('Gráfica de la Función', fontsize=14, fontweight='bold')
+    ax.legend(loc='best')
+    plt.tight_layout()
+    plt.savefig(target, dpi=config.FIGURE_DPI, bbox_inches='tight', format='png')
+    plt.close()
+
+
+def render_template(x_vals, y_vals, area, limits, target, renderer=None):
+    """Camino nuevo: plantilla reutilizada, sólo se actualizan los artistas"""
+    renderer = renderer or get_renderer()
+    renderer.render(x_vals, y_vals, '$f(x)$', target, area, limits)
+
+
+def _sample(i):
+    """Datos de la i-ésima gráfica del benchmark"""
+    f = FUNCTIONS[i % len(FUNCTIONS)]
+    x_vals = np.linspace(-2.4, 2.4, config.MAX_PLOT_POINTS)
+    x_fill = np.linspace(-2, 2, 500)
+    return x_vals, f(x_vals), (x_fill, f(x_fill)), (-2.0, 2.0)
+
+
+def measure(render, renders, threads=1):
+    """Retorna gráficas por segundo para una función de render"""
+    def job(i):
+        x_vals, y_vals, area, limits = _sample(i)
+        render(x_vals, y_vals, area, limits, io.BytesIO())
+
+    # Calentamiento (crea las plantillas y carga fuentes)
+    job(0)
+
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(renders):
+            job(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(job, range(renders)))
+    return renders / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--renders', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    # Asegurar que el estilo global ya está aplicado antes de medir
+    PlotRenderer()
+
+    pyplot_rate = measure(render_pyplot, args.renders)
+    template_rate = measure(render_template, args.renders)
+    threaded_rate = measure(render_template, args.renders, args.threads)
+
+    print(f'pyplot (1 hilo):              {pyplot_rate:8.2f} gráficas/s')
+    print(f'plantilla (1 hilo):           {template_rate:8.2f} gráficas/s '
+          f'({template_rate / pyplot_rate:.2f}x)')
+    print(f'plantilla ({args.threads} hilos):          {threaded_rate:8.2f} gráficas/s '
+          f'({threaded_rate / pyplot_rate:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Integration Benchmark
+Latencia por etapa y memoria pico de calculate_integral y plot_function
+sobre un corpus de integrandos agrupados por categoría
+
+Cada caso se mide en frío (cachés vacías) en un worker aparte con tiempo
+límite, así que un integrando patológico se registra como 'timeout' sin
+detener la corrida.
+
+Uso:
+    python -m benchmarks.suite [--repeat 5] [--category trig ...] [--timeout 20]
+                               [--output resultados.json]
+                               [--baseline base.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import sympy as sp
+
+from app.config import config
+from app.services.engine import EngineError, EngineTimeout, WorkerPool
+from app.services.integration import calculate_integral, clear_caches
+from app.utils.metrics import metrics_scope, timed
+from app.utils.plotter import plot_function
+from benchmarks.corpus import CATEGORIES, iter_cases
+
+
+STAGES = ('parse', 'integrate', 'definite', 'procedure', 'verification', 'plot')
+
+
+def run_case(func_str, lower, upper, repeat):
+    """
+    Mide un caso repeat veces en frío y una vez más con tracemalloc
+
+    Se ejecuta en un worker del pool; la memoria se mide en una pasada
+    aparte porque tracemalloc hace más lentas las asignaciones.
+
+    Returns:
+        dict: {'status', 'stages': {etapa: {median, min, max}}, 'peak_memory'}
+            o {'status': 'error', 'error'} si el cálculo falla
+    """
+    samples = {stage: [] for stage in STAGES}
+
+    with tempfile.TemporaryDirectory() as plots_dir:
+        config.PLOTS_DIR = plots_dir
+        # La verificación usa puntos aleatorios: los mismos en cada corrida
+        config.VERIFICATION_SEED = 0
+
+        for _ in range(repeat):
+            totals, result = _measure_once(func_str, lower, upper, plots_dir)
+            if not result.get('success'):
+                return {'status': 'error', 'error': result.get('error')}
+            for stage in STAGES:
+                samples[stage].append(totals.get(stage, 0.0))
+
+        tracemalloc.start()
+        try:
+            _measure_once(func_str, lower, upper, plots_dir)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'status': 'ok',
+        'stages': {stage: _summary(values) for stage, values in samples.items()},
+        'peak_memory': peak_memory,
+    }
+
+
+def _measure_once(func_str, lower, upper, plots_dir):
+    """Una corrida en frío: procedimiento completo, definida y gráfica"""
+    clear_caches()
+    sp.core.cache.clear_cache()
+    for filename in os.listdir(plots_dir):
+        os.remove(os.path.join(plots_dir, filename))
+
+    with metrics_scope() as scope:
+        result = calculate_integral(func_str, lower, upper, include_procedure=True)
+        if result.get('success'):
+            with timed('plot'):
+                plot_function(func_str, lower, upper)
+    return scope.totals(), result
+
+
+def _summary(values):
+    """Mediana, mínimo y máximo en segundos"""
+    return {
+        'median': statistics.median(values),
+        'min': min(values),
+        'max': max(values),
+    }
+
+
+def run_suite(categories=None, repeat=5, timeout=20.0, log=print):
+    """
+    Mide todos los casos del corpus
+
+    Args:
+        categories (iterable, optional): Categorías a medir (por defecto todas)
+        repeat (int): Corridas por caso
+        timeout (float): Segundos por corrida antes de declarar 'timeout'
+        log (callable): Función para el progreso (None = silencioso)
+
+    Returns:
+        dict: {'meta': {...}, 'cases': [...]} listo para guardar como JSON
+    """
+    pool = WorkerPool(1, start_method=config.ENGINE_START_METHOD,
+                      preload=('sympy', 'app.services.integration'))
+    cases = []
+    try:
+        for category, func_str, lower, upper in iter_cases(categories):
+            case = {'category': category, 'function': func_str, 'limits': [lower, upper]}
+            try:
+                case.update(pool.run(run_case, args=(func_str, lower, upper, repeat),
+                                     timeout=timeout * (repeat + 1)))
+            except EngineTimeout:
+                case['status'] = 'timeout'
+            except EngineError as e:
+                case.update(status='error', error=str(e))
+            cases.append(case)
+            if log:
+                log(_format_case(case))
+    finally:
+        pool.shutdown()
+
+    return {'meta': _meta(repeat, timeout), 'cases': cases}
+
+
+def _meta(repeat, timeout):
+    """Entorno de la corrida, para saber si dos resultados son comparables"""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'sympy': sp.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'timeout': timeout,
+    }
+
+
+def case_id(case):
+    """Identificador estable de un caso entre corridas"""
+    return f"{case['category']}:{case['function']}:{case['limits'][0]}:{case['limits'][1]}"
+
+
+def compare(current, baseline, threshold=0.25, min_delta=0.002, memory_delta=1 << 20):
+    """
+    Compara una corrida con una línea base guardada
+
+    Una etapa regresa si su mediana crece más de threshold (relativo) y más
+    de min_delta segundos (para ignorar el ruido de etapas de microsegundos);
+    la memoria pico, si crece más de threshold y más de memory_delta bytes.
+    Un caso que estaba 'ok' y ahora falla o excede el tiempo también cuenta.
+
+    Returns:
+        list: Regresiones como dicts {'case', 'stage', 'baseline', 'current', 'ratio'}
+    """
+    previous = {case_id(case): case for case in baseline['cases']}
+    regressions = []
+
+    for case in current['cases']:
+        old = previous.get(case_id(case))
+        if old is None or old['status'] != 'ok':
+            continue
+        if case['status'] != 'ok':
+            regressions.append({'case': case_id(case), 'stage': 'status',
+                                'baseline': old['status'], 'current': case['status'], 'ratio': None})
+            continue
+
+        checks = [(stage, old['stages'][stage]['median'], case['stages'][stage]['median'], min_delta)
+                  for stage in STAGES if stage in old['stages'] and stage in case['stages']]
+        checks.append(('peak_memory', old['peak_memory'], case['peak_memory'], memory_delta))
+
+        for stage, before, after, delta in checks:
+            if after > before * (1 + threshold) and after - before > delta:
+                regressions.append({
+                    'case': case_id(case),
+                    'stage': stage,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': after / before if before else None,
+                })
+    return regressions
+
+
+def _format_case(case):
+    """Línea de resumen de un caso: medianas en ms y memoria pico en MiB"""
+    label = f"{case['category']:<15} {case['function']:<36}"
+    if case['status'] != 'ok':
+        return f"{label} {case['status'].upper()} {case.get('error') or ''}".rstrip()
+
+    stages = ' '.join(f"{stage}={case['stages'][stage]['median'] * 1000:.1f}" for stage in STAGES)
+    return f"{label} {stages} peak={case['peak_memory'] / (1 << 20):.1f}MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='corridas por caso')
+    parser.add_argument('--category', action='append', choices=CATEGORIES,
+                        help='categoría a medir (se puede repetir; por defecto todas)')
+    parser.add_argument('--timeout', type=float, default=20.0, help='segundos por corrida')
+    parser.add_argument('--output', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--baseline', help='resultados JSON previos con los que comparar')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='crecimiento relativo tolerado por etapa (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.002,
+                        help='crecimiento absoluto mínimo en segundos para contar como regresión')
+    args = parser.parse_args()
+
+    results = run_suite(args.category, args.repeat, args.timeout)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Resultados guardados en {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for regression in regressions:
+            ratio = f"{regression['ratio']:.2f}x" if regression['ratio'] else ''
+            print(f"REGRESIÓN {regression['case']} [{regression['stage']}]: "
+                  f"{regression['baseline']} -> {regression['current']} {ratio}".rstrip())
+        if regressions:
+            sys.exit(1)
+        print('Sin regresiones respecto a la línea base')
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,11 @@ export async function calculateIntegral(functionValue, lowerLimit, upperLimit) {
     const requestData = {
         function: functionValue,
         lower_limit: lowerLimit,
-        upper_limit: upperLimit
+        upper_limit: upperLimit,
+        // El procedimiento se pide aparte cuando el usuario lo expande
+        include_procedure: false,
+        // La gráfica se dibuja en el navegador a partir de los datos muestreados
+        plot_mode: 'data'
     };
 
     const response = await fetch('/calculate', {
@@ -29,3 +33,46 @@ export async function calculateIntegral(functionValue, lowerLimit, upperLimit) {
 
     return data;
 }
+
+/**
+ * Obtiene el procedimiento paso a paso de un resultado ya calculado
+ */
+export async function fetchProcedure(resultId, functionValue) {
+    const params = new URLSearchParams({
+        id: resultId,
+        function: functionValue
+    });
+
+    const response = await fetch(`/procedure?${params.toString()}`);
+
+    const data = await response.json();
+
+    if (!response.ok || !data.success) {
+        throw new Error(data.error || 'Error al obtener el procedimiento');
+    }
+
+    return data;
+}
+
+/**
+ * Espera (long-poll) a que la gráfica de un trabajo esté lista
+ * y retorna la URL de la imagen
+ *
+ * Las esperas son cortas porque cada una ocupa un worker del servidor
+ */
+export async function waitForPlot(jobId, maxAttempts = 24) {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+        const response = await fetch(`/plot/${jobId}/status?wait=5`);
+        const data = await response.json();
+
+        if (data.status === 'ready') {
+            return data.plot_url;
+        }
+
+        if (data.status !== 'pending') {
+            throw new Error(data.error || 'No se pudo generar la gráfica');
+        }
+    }
+
+    throw new Error('La gráfica tardó demasiado en generarse');
+}
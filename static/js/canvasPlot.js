@@ -0,0 +1,243 @@
+/**
+ * Canvas Plot Module
+ * Dibuja en el navegador la gráfica a partir de los datos muestreados
+ * por el servidor (float32 en base64, NaN donde la curva se corta)
+ */
+
+const COLORS = {
+    grid: 'rgba(255, 255, 255, 0.12)',
+    axis: 'rgba(255, 255, 255, 0.6)',
+    text: 'rgba(255, 255, 255, 0.85)',
+    curve: '#4f8cff',
+    area: 'rgba(0, 255, 255, 0.3)',
+    limit: 'rgba(255, 80, 80, 0.7)'
+};
+
+const PADDING = { top: 32, right: 16, bottom: 32, left: 56 };
+
+/**
+ * Decodifica un arreglo float32 little-endian codificado en base64
+ */
+export function decodeFloat32(encoded) {
+    const binary = atob(encoded);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new Float32Array(bytes.buffer);
+}
+
+/**
+ * Dibuja la gráfica completa en el canvas
+ */
+export function drawPlot(canvas, plotData) {
+    const ctx = prepareCanvas(canvas);
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+
+    const xs = decodeFloat32(plotData.x);
+    const ys = decodeFloat32(plotData.y);
+    const area = plotData.area;
+
+    // Rango vertical con un margen (incluyendo el eje x si hay área sombreada)
+    let [yMin, yMax] = plotData.y_range;
+    if (area) {
+        yMin = Math.min(yMin, 0);
+        yMax = Math.max(yMax, 0);
+    }
+    const margin = (yMax - yMin) * 0.05 || 1;
+
+    const view = {
+        xMin: plotData.x_range[0],
+        xMax: plotData.x_range[1],
+        yMin: yMin - margin,
+        yMax: yMax + margin,
+        left: PADDING.left,
+        top: PADDING.top,
+        width: width - PADDING.left - PADDING.right,
+        height: height - PADDING.top - PADDING.bottom
+    };
+
+    ctx.clearRect(0, 0, width, height);
+    drawGrid(ctx, view);
+
+    if (area) {
+        drawArea(ctx, view, decodeFloat32(area.x), decodeFloat32(area.y));
+        drawLimits(ctx, view, area.limits);
+    }
+
+    drawCurve(ctx, view, xs, ys);
+    drawLabel(ctx, view, plotData.label);
+}
+
+/**
+ * Ajusta la resolución del canvas a la densidad de píxeles de la pantalla
+ */
+function prepareCanvas(canvas) {
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = Math.round(canvas.clientWidth * ratio);
+    canvas.height = Math.round(canvas.clientHeight * ratio);
+
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    return ctx;
+}
+
+function toPixelX(view, x) {
+    return view.left + (x - view.xMin) / (view.xMax - view.xMin) * view.width;
+}
+
+function toPixelY(view, y) {
+    return view.top + (view.yMax - y) / (view.yMax - view.yMin) * view.height;
+}
+
+/**
+ * Dibuja la grilla, los ejes y las marcas con sus valores
+ */
+function drawGrid(ctx, view) {
+    ctx.font = '11px sans-serif';
+    ctx.fillStyle = COLORS.text;
+    ctx.lineWidth = 1;
+
+    ctx.strokeStyle = COLORS.grid;
+    ctx.textAlign = 'center';
+    ctx.textBaseline = 'top';
+    niceTicks(view.xMin, view.xMax).forEach(tick => {
+        const px = toPixelX(view, tick);
+        line(ctx, px, view.top, px, view.top + view.height);
+        ctx.fillText(formatTick(tick), px, view.top + view.height + 6);
+    });
+
+    ctx.textAlign = 'right';
+    ctx.textBaseline = 'middle';
+    niceTicks(view.yMin, view.yMax).forEach(tick => {
+        const py = toPixelY(view, tick);
+        line(ctx, view.left, py, view.left + view.width, py);
+        ctx.fillText(formatTick(tick), view.left - 6, py);
+    });
+
+    // Ejes x = 0 e y = 0 si están dentro de la vista
+    ctx.strokeStyle = COLORS.axis;
+    if (view.yMin <= 0 && view.yMax >= 0) {
+        const py = toPixelY(view, 0);
+        line(ctx, view.left, py, view.left + view.width, py);
+    }
+    if (view.xMin <= 0 && view.xMax >= 0) {
+        const px = toPixelX(view, 0);
+        line(ctx, px, view.top, px, view.top + view.height);
+    }
+}
+
+/**
+ * Dibuja la curva, cortándola en los valores NaN
+ */
+function drawCurve(ctx, view, xs, ys) {
+    ctx.save();
+    clipToView(ctx, view);
+    ctx.strokeStyle = COLORS.curve;
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+
+    let drawing = false;
+    for (let i = 0; i < xs.length; i++) {
+        if (Number.isNaN(ys[i])) {
+            drawing = false;
+            continue;
+        }
+        const px = toPixelX(view, xs[i]);
+        const py = toPixelY(view, ys[i]);
+        if (drawing) {
+            ctx.lineTo(px, py);
+        } else {
+            ctx.moveTo(px, py);
+            drawing = true;
+        }
+    }
+
+    ctx.stroke();
+    ctx.restore();
+}
+
+/**
+ * Sombrea el área entre la curva y el eje x
+ */
+function drawArea(ctx, view, xs, ys) {
+    if (xs.length === 0) {
+        return;
+    }
+
+    ctx.save();
+    clipToView(ctx, view);
+    ctx.fillStyle = COLORS.area;
+    ctx.beginPath();
+    ctx.moveTo(toPixelX(view, xs[0]), toPixelY(view, 0));
+    for (let i = 0; i < xs.length; i++) {
+        ctx.lineTo(toPixelX(view, xs[i]), toPixelY(view, ys[i]));
+    }
+    ctx.lineTo(toPixelX(view, xs[xs.length - 1]), toPixelY(view, 0));
+    ctx.closePath();
+    ctx.fill();
+    ctx.restore();
+}
+
+/**
+ * Dibuja las líneas verticales de los límites de integración
+ */
+function drawLimits(ctx, view, limits) {
+    ctx.save();
+    ctx.strokeStyle = COLORS.limit;
+    ctx.setLineDash([6, 4]);
+    limits.forEach(limit => {
+        const px = toPixelX(view, limit);
+        line(ctx, px, view.top, px, view.top + view.height);
+    });
+    ctx.restore();
+}
+
+/**
+ * Escribe la etiqueta de la función sobre la gráfica
+ */
+function drawLabel(ctx, view, label) {
+    ctx.font = 'bold 13px sans-serif';
+    ctx.fillStyle = COLORS.text;
+    ctx.textAlign = 'left';
+    ctx.textBaseline = 'bottom';
+    ctx.fillText(label, view.left, view.top - 8);
+}
+
+function clipToView(ctx, view) {
+    ctx.beginPath();
+    ctx.rect(view.left, view.top, view.width, view.height);
+    ctx.clip();
+}
+
+function line(ctx, x1, y1, x2, y2) {
+    ctx.beginPath();
+    ctx.moveTo(x1, y1);
+    ctx.lineTo(x2, y2);
+    ctx.stroke();
+}
+
+/**
+ * Calcula marcas "redondas" (1, 2, 5 × 10^n) para un rango
+ */
+function niceTicks(min, max, count = 8) {
+    const span = max - min;
+    if (!(span > 0)) {
+        return [min];
+    }
+
+    const raw = span / count;
+    const magnitude = Math.pow(10, Math.floor(Math.log10(raw)));
+    const step = [1, 2, 5, 10].map(f => f * magnitude).find(s => s >= raw);
+
+    const ticks = [];
+    for (let tick = Math.ceil(min / step) * step; tick <= max; tick += step) {
+        ticks.push(Math.abs(tick) < step * 1e-9 ? 0 : tick);
+    }
+    return ticks;
+}
+
+function formatTick(value) {
+    return Number(value.toPrecision(6)).toString();
+}
@@ -28,13 +28,16 @@ export const DOM = {
     definiteValueDiv: document.getElementById('definite-value'),
     procedureSection: document.getElementById('procedure-section'),
     procedureContainer: document.getElementById('integration-procedure'),
+    procedureToggle: document.getElementById('procedure-toggle'),
     plotSection: document.getElementById('plot-section'),
-    plotImage: document.getElementById('plot-image')
+    plotImage: document.getElementById('plot-image'),
+    plotCanvas: document.getElementById('plot-canvas')
 };
 
 /**
  * Application State
  */
 export const State = {
-    isCalculating: false
+    isCalculating: false,
+    plotJob: null
 };
@@ -3,21 +3,28 @@
  * Maneja la visualización de resultados
  */
 
-import { DOM } from './dom.js';
+import { DOM, State } from './dom.js';
 import { hideAllResults } from './ui.js';
+import { fetchProcedure, waitForPlot } from './api.js';
+import { drawPlot } from './canvasPlot.js';
 
 /**
  * Muestra los resultados de la integral
  */
 export function displayResults(data) {
     hideAllResults();
+    State.plotJob = data.plot_job || null;
     DOM.resultsSection.classList.remove('hidden');
 
     // Mostrar función original
     DOM.originalFunctionDiv.innerHTML = `\\[f(x) = ${data.original_function}\\]`;
 
-    // Mostrar integral indefinida
-    DOM.indefiniteIntegralDiv.innerHTML = `\\[\\int f(x) \\, dx = ${data.indefinite_integral} + C\\]`;
+    // Mostrar integral indefinida (en modo auto puede faltar si no salió a tiempo)
+    if (data.indefinite_integral !== null && data.indefinite_integral !== undefined) {
+        DOM.indefiniteIntegralDiv.innerHTML = `\\[\\int f(x) \\, dx = ${data.indefinite_integral} + C\\]`;
+    } else {
+        DOM.indefiniteIntegralDiv.textContent = 'La integral indefinida no se pudo calcular a tiempo; se muestra el valor numérico.';
+    }
 
     // Mostrar integral definida si aplica
     if (data.is_definite && data.definite_integral !== undefined) {
@@ -34,27 +41,104 @@ export function displayResults(data) {
         }
     }
 
-    // Mostrar procedimiento si está disponible
+    // Mostrar procedimiento si está disponible, o permitir pedirlo bajo demanda
     if (data.procedure && data.procedure.length > 0) {
         displayProcedure(data.procedure);
+    } else if (data.result_id) {
+        setupLazyProcedure(data.result_id);
     }
 
-    // Mostrar gráfica si está disponible
-    if (data.plot_url) {
-        DOM.plotSection.classList.remove('hidden');
-        DOM.plotImage.src = data.plot_url;
-        DOM.plotImage.alt = 'Gráfica de la función';
+    // Mostrar gráfica si está disponible, o esperarla si se está generando
+    if (data.plot_data) {
+        displayPlotData(data.plot_data);
+    } else if (data.plot_url) {
+        displayPlot(data.plot_url);
+    } else if (data.plot_job) {
+        loadPlotWhenReady(data.plot_job);
     }
 
     // Re-renderizar MathJax
+    typesetMath(DOM.resultsSection);
+
+    // Scroll a resultados
+    DOM.resultsSection.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+/**
+ * Muestra la imagen de la gráfica
+ */
+function displayPlot(plotUrl) {
+    DOM.plotSection.classList.remove('hidden');
+    DOM.plotCanvas.classList.add('hidden');
+    DOM.plotImage.classList.remove('hidden');
+    DOM.plotImage.src = plotUrl;
+    DOM.plotImage.alt = 'Gráfica de la función';
+}
+
+/**
+ * Dibuja la gráfica en el canvas con los datos enviados por el servidor
+ */
+function displayPlotData(plotData) {
+    DOM.plotSection.classList.remove('hidden');
+    DOM.plotImage.classList.add('hidden');
+    DOM.plotCanvas.classList.remove('hidden');
+    drawPlot(DOM.plotCanvas, plotData);
+}
+
+/**
+ * Inserta la gráfica cuando el servidor termina de generarla
+ */
+async function loadPlotWhenReady(jobId) {
+    try {
+        const plotUrl = await waitForPlot(jobId);
+
+        // Ignorar si mientras tanto se calculó otra integral
+        if (State.plotJob === jobId) {
+            displayPlot(plotUrl);
+        }
+    } catch (error) {
+        console.error('Plot error:', error);
+    }
+}
+
+/**
+ * Re-renderiza las fórmulas LaTeX de un elemento
+ */
+function typesetMath(element) {
     if (window.MathJax) {
-        MathJax.typesetPromise([DOM.resultsSection]).catch((err) => {
+        MathJax.typesetPromise([element]).catch((err) => {
             console.error('MathJax rendering error:', err);
         });
     }
+}
 
-    // Scroll a resultados
-    DOM.resultsSection.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+/**
+ * Prepara el botón que pide el procedimiento al servidor al expandirlo
+ */
+function setupLazyProcedure(resultId) {
+    const functionValue = DOM.functionInput.value.trim();
+    const toggle = DOM.procedureToggle;
+
+    DOM.procedureSection.classList.remove('hidden');
+    DOM.procedureContainer.innerHTML = '';
+    toggle.classList.remove('hidden');
+    toggle.disabled = false;
+    toggle.textContent = 'Ver procedimiento paso a paso';
+
+    toggle.onclick = async () => {
+        toggle.disabled = true;
+        toggle.textContent = 'Cargando procedimiento...';
+
+        try {
+            const data = await fetchProcedure(resultId, functionValue);
+            displayProcedure(data.procedure);
+            typesetMath(DOM.procedureContainer);
+        } catch (error) {
+            console.error('Procedure error:', error);
+            toggle.disabled = false;
+            toggle.textContent = 'Reintentar: ver procedimiento';
+        }
+    };
 }
 
 /**
@@ -62,6 +146,7 @@ export function displayResults(data) {
  */
 function displayProcedure(procedure) {
     DOM.procedureSection.classList.remove('hidden');
+    DOM.procedureToggle.classList.add('hidden');
     DOM.procedureContainer.innerHTML = '';
 
     procedure.forEach(step => {
@@ -0,0 +1,25 @@
+"""
+Fixtures compartidas de los tests
+"""
+
+import pytest
+
+from app.services.integration import clear_caches
+
+
+@pytest.fixture
+def clean_caches():
+    """Vacía las cachés del servicio antes y después de cada test"""
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente de pruebas de Flask que calcula en el mismo proceso (sin motor)"""
+    from app import create_app
+    from app.config import config
+
+    monkeypatch.setattr(config, 'ENGINE_ENABLED', False)
+    return create_app().test_client()
@@ -0,0 +1,28 @@
+"""
+Tests de Server-Timing y del endpoint /metrics
+"""
+
+import pytest
+
+
+pytestmark = pytest.mark.usefixtures('clean_caches')
+
+
+def test_calculate_sends_server_timing(client):
+    response = client.post('/calculate', json={'function': 'x^2', 'lower_limit': '0',
+                                               'upper_limit': '1', 'plot_mode': 'none'})
+    assert response.status_code == 200
+    stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+    assert {'parse', 'integrate', 'definite', 'procedure'} <= set(stages)
+    assert stages[-1] == 'total'
+
+
+def test_metrics_endpoint_counts_requests(client):
+    client.post('/calculate', json={'function': 'sin(x)', 'plot_mode': 'none'})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'calculator_requests_total{endpoint="/calculate",status="200"}' in text
+    assert 'calculator_request_seconds_count{endpoint="/calculate"}' in text
+    assert 'calculator_cache_size{cache="parse"}' in text
@@ -0,0 +1,75 @@
+"""
+Tests de la integral definida vía antiderivada (F(b) - F(a)) y sus guardas
+"""
+
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from app.services.integration import (_calculate_definite_integral, _closed_form_mask,
+                                      _evaluate_antiderivative, calculate_integral)
+
+
+x = sp.Symbol('x')
+
+
+@pytest.mark.parametrize('expr, antiderivative, lower, upper, expected', [
+    (x ** 2, x ** 3 / 3, 0, 1, 1 / 3),
+    (sp.cos(x), sp.sin(x), 0, math.pi / 2, 1.0),
+    (1 / x, sp.log(x), 1, math.e, 1.0),
+    (sp.exp(x), sp.exp(x), 1, 0, 1 - math.e),
+])
+def test_antiderivative_method(expr, antiderivative, lower, upper, expected):
+    result = _calculate_definite_integral(expr, x, lower, upper, antiderivative, mode='symbolic')
+    assert result['definite_method'] == 'antiderivative'
+    assert result['definite_integral'] == pytest.approx(expected)
+
+
+def test_calculate_integral_reuses_antiderivative(clean_caches):
+    result = calculate_integral('3*x^2', '0', '2', mode='symbolic', include_procedure=False)
+    assert result['definite_method'] == 'antiderivative'
+    assert result['definite_integral'] == pytest.approx(8.0)
+
+
+@pytest.mark.parametrize('expr, antiderivative, lower, upper', [
+    # Integrando con polo dentro del intervalo: F(1) - F(-1) = -2 sería falso
+    (1 / x ** 2, -1 / x, -1, 1),
+    (1 / x, sp.log(sp.Abs(x)), -1, 2),
+    # Antiderivada con salto en pi aunque el integrando es continuo
+    (1 / (2 + sp.cos(x)), 2 / sp.sqrt(3) * sp.atan(sp.tan(x / 2) / sp.sqrt(3)), 0, 2 * math.pi),
+    # Funciones escalonadas
+    (sp.floor(x), x * sp.floor(x), 0, 2),
+    # Antiderivada sin evaluar
+    (sp.exp(x ** 3), sp.Integral(sp.exp(x ** 3), x), 0, 1),
+])
+def test_guard_rejects_interval(expr, antiderivative, lower, upper):
+    assert _evaluate_antiderivative(expr, antiderivative, x, lower, upper) is None
+
+
+def test_guard_falls_back_to_symbolic():
+    result = _calculate_definite_integral(1 / x ** 2, x, -1, 1, -1 / x, mode='symbolic')
+    assert result['definite_method'] == 'symbolic'
+    assert result['definite_integral'] == math.inf
+
+
+def test_discontinuous_antiderivative_falls_back():
+    expr = 1 / (2 + sp.cos(x))
+    antiderivative = 2 / sp.sqrt(3) * sp.atan(sp.tan(x / 2) / sp.sqrt(3))
+    for mode in ('symbolic', 'auto'):
+        result = _calculate_definite_integral(expr, x, 0, 2 * math.pi, antiderivative, mode=mode)
+        assert result['definite_method'] != 'antiderivative'
+        assert result['definite_integral'] == pytest.approx(2 * math.pi / math.sqrt(3))
+
+
+def test_closed_form_mask_per_interval():
+    lowers = np.array([1.0, -1.0, 0.0, 2.0])
+    uppers = np.array([2.0, 1.0, 0.5, 3.0])
+    mask = _closed_form_mask(1 / x, sp.log(x), x, lowers, uppers)
+    assert mask.tolist() == [True, False, False, True]
+
+
+def test_closed_form_mask_rejects_step_functions():
+    mask = _closed_form_mask(sp.sign(x), sp.Abs(x), x, np.array([1.0]), np.array([2.0]))
+    assert not mask.any()
@@ -0,0 +1,78 @@
+"""
+Tests de la cuadratura Gauss-Kronrod vectorizada
+"""
+
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from app.services.quadrature import (adaptive_quadrature, batched_quadrature,
+                                     cumulative_quadrature, numeric_integral)
+
+
+x = sp.Symbol('x')
+
+
+@pytest.mark.parametrize('func_str, lower, upper, expected', [
+    ('x**2', 0, 1, 1 / 3),
+    ('sin(x)', 0, math.pi, 2.0),
+    ('exp(-x**2)', -1, 1, math.sqrt(math.pi) * math.erf(1)),
+    ('1/(1 + x**2)', -1, 1, math.pi / 2),
+    ('sqrt(x)', 0, 1, 2 / 3),
+    ('log(x)', 0, 1, -1.0),
+])
+def test_known_values(func_str, lower, upper, expected):
+    result = numeric_integral(sp.sympify(func_str), x, lower, upper)
+    assert result['converged']
+    assert result['value'] == pytest.approx(expected, rel=1e-9, abs=1e-10)
+    assert result['error'] <= 1e-8
+
+
+@pytest.mark.parametrize('func_str, lower, upper, expected', [
+    ('exp(-x)', 0, math.inf, 1.0),
+    ('exp(-x**2)', -math.inf, math.inf, math.sqrt(math.pi)),
+    ('1/(1 + x**2)', -math.inf, 0, math.pi / 2),
+])
+def test_infinite_limits(func_str, lower, upper, expected):
+    result = numeric_integral(sp.sympify(func_str), x, lower, upper)
+    assert result['converged']
+    assert result['value'] == pytest.approx(expected, rel=1e-8)
+
+
+def test_reversed_and_empty_intervals():
+    f = lambda t: t ** 2
+    assert adaptive_quadrature(f, 1.0, 0.0)['value'] == pytest.approx(-1 / 3)
+    assert adaptive_quadrature(f, 2.0, 2.0) == {
+        'value': 0.0, 'error': 0.0, 'evaluations': 0, 'converged': True,
+    }
+
+
+def test_non_integrable_singularity_does_not_converge():
+    result = numeric_integral(1 / x, x, -1, 1)
+    assert not result['converged']
+
+
+def test_batched_matches_single_intervals():
+    f = lambda t: np.cos(t)
+    lowers = np.array([0.0, 1.0, -2.0])
+    uppers = np.array([1.0, 3.0, 2.0])
+    values, errors, converged = batched_quadrature(f, lowers, uppers)
+    assert converged.all()
+    np.testing.assert_allclose(values, np.sin(uppers) - np.sin(lowers), rtol=1e-10)
+
+
+def test_batched_parameters_are_aligned_per_interval():
+    f = lambda t, a: a * t
+    values, _, converged = batched_quadrature(f, np.zeros(3), np.ones(3),
+                                              params=(np.array([1.0, 2.0, 3.0]),))
+    assert converged.all()
+    np.testing.assert_allclose(values, [0.5, 1.0, 1.5])
+
+
+def test_cumulative_quadrature():
+    points = np.linspace(0, 2, 5)
+    values, _, failures = cumulative_quadrature(lambda t: 3 * t ** 2, points)
+    np.testing.assert_allclose(values, points ** 3, rtol=1e-10, atol=1e-12)
+    assert not failures.any()
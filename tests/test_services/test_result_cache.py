@@ -0,0 +1,52 @@
+"""
+Tests de la caché de resultados de integración
+"""
+
+import pytest
+
+from app.services import integration
+from app.services.integration import calculate_integral, get_cache_stats
+
+
+pytestmark = pytest.mark.usefixtures('clean_caches')
+
+
+def test_repeated_request_hits_cache():
+    first = calculate_integral('x**2', '0', '1', include_procedure=False)
+    second = calculate_integral('x**2', '0', '1', include_procedure=False)
+    assert first['success'] and first == second
+    stats = get_cache_stats()['results']
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_equivalent_inputs_share_key():
+    calculate_integral('x**2', '0', '1', include_procedure=False)
+    calculate_integral('x^2', ' 0 ', '1.0', include_procedure=False)
+    assert get_cache_stats()['results']['hits'] == 1
+
+
+def test_limits_and_mode_are_part_of_key():
+    calculate_integral('x**2', '0', '1', include_procedure=False)
+    calculate_integral('x**2', '0', '2', include_procedure=False)
+    calculate_integral('x**2', '0', '1', mode='numeric', include_procedure=False)
+    calculate_integral('x**2', include_procedure=False)
+    stats = get_cache_stats()['results']
+    assert (stats['hits'], stats['size']) == (0, 4)
+
+
+def test_cached_result_is_not_shared():
+    first = calculate_integral('sin(x)', include_procedure=False)
+    first['indefinite_integral'] = 'modificado'
+    second = calculate_integral('sin(x)', include_procedure=False)
+    assert second['indefinite_integral'] != 'modificado'
+
+
+def test_errors_are_not_cached():
+    assert not calculate_integral('x +* 2', include_procedure=False)['success']
+    assert get_cache_stats()['results']['size'] == 0
+
+
+def test_clear_caches_empties_results():
+    calculate_integral('x**3', include_procedure=False)
+    integration.clear_caches()
+    assert get_cache_stats()['results']['size'] == 0
@@ -0,0 +1,65 @@
+"""
+Tests de la caché de integrales por término (coeficiente factorizado)
+"""
+
+import pytest
+import sympy as sp
+
+from app.services import integration
+from app.services.integration import (get_antiderivative, get_cache_stats, integrate_by_terms,
+                                      integrate_term, mark_term_failed)
+
+
+x = sp.Symbol('x')
+
+pytestmark = pytest.mark.usefixtures('clean_caches')
+
+
+@pytest.fixture
+def integrate_calls(monkeypatch):
+    """Cuenta las llamadas a sp.integrate hechas por integrate_term"""
+    calls = []
+    original = sp.integrate
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(integration.sp, 'integrate', counting)
+    return calls
+
+
+def test_coefficient_is_factored_out(integrate_calls):
+    part = sp.exp(x) * sp.sin(x)
+    first = integrate_term(3 * part, x)
+    second = integrate_term(-5 * part / 2, x)
+    assert integrate_calls == [part]
+    assert sp.simplify(first.diff(x) - 3 * part) == 0
+    assert sp.simplify(second.diff(x) + 5 * part / 2) == 0
+
+
+def test_symbolic_coefficients_share_entry(integrate_calls):
+    a = sp.Symbol('a')
+    integrate_term(a * sp.exp(x) * sp.cos(x), x)
+    integrate_term(sp.pi * sp.exp(x) * sp.cos(x), x)
+    assert len(integrate_calls) == 1
+    assert get_cache_stats()['terms']['size'] == 1
+
+
+def test_sums_reuse_terms_across_functions(integrate_calls):
+    integrate_by_terms(2 * sp.exp(x) * sp.sin(x) + x, x)
+    integrate_by_terms(7 * sp.exp(x) * sp.sin(x) + sp.cos(x), x)
+    assert integrate_calls == [sp.exp(x) * sp.sin(x)]
+
+
+def test_failed_term_is_left_unevaluated(integrate_calls):
+    part = sp.exp(x) * sp.sin(x)
+    mark_term_failed(part, x)
+    result = integrate_term(4 * part, x)
+    assert result == 4 * sp.Integral(part, x)
+    assert not integrate_calls
+
+    # La antiderivada con un término fallido no se guarda en caché
+    antiderivative, _ = get_antiderivative(4 * part + x, x)
+    assert antiderivative.has(sp.Integral)
+    assert get_cache_stats()['antiderivatives']['size'] == 0
@@ -0,0 +1,41 @@
+"""
+Tests del aislamiento por término de las sumas largas
+"""
+
+import pytest
+
+from app.config import config
+from app.services import engine
+from app.services.engine import WorkerPool, run_integral
+
+
+SLOW_TERM = 'exp(sin(x))*log(x + 2)/(x**3 + 1)'
+
+
+@pytest.fixture
+def small_engine(monkeypatch, clean_caches):
+    """Pool propio de 2 workers (el mínimo con el que se aíslan términos)"""
+    pool = WorkerPool(2, start_method=config.ENGINE_START_METHOD,
+                      preload=('sympy', 'app.services.integration'))
+    monkeypatch.setattr(engine, '_engine', pool)
+    monkeypatch.setattr(config, 'ENGINE_WORKERS', 2)
+    monkeypatch.setattr(config, 'TERM_TIMEOUT', 1.0)
+    monkeypatch.setattr(config, 'INTEGRATION_TIMEOUT', 20.0)
+    yield pool
+    pool.shutdown()
+
+
+def test_default_pool_can_isolate_terms():
+    assert config.ENGINE_WORKERS >= 2
+
+
+def test_slow_term_is_reported_and_the_rest_returned(small_engine):
+    func_str = f'x + x**2 + x**3 + sin(x) + cos(x) + exp(x) + {SLOW_TERM}'
+    result = run_integral(func_str, include_procedure=False)
+
+    assert result['success'], result.get('error')
+    assert result['failed_terms'] == 1
+    text = result['indefinite_integral_text']
+    for part in ('x**2/2', 'x**3/3', 'x**4/4', 'cos(x)', 'sin(x)', 'exp(x)'):
+        assert part in text
+    assert 'Integral(' in text
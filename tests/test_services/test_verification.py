@@ -0,0 +1,60 @@
+"""
+Tests de la verificación de antiderivadas
+"""
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from app.config import config
+from app.services import verification
+from app.services.verification import verify_antiderivative
+
+
+x = sp.Symbol('x')
+
+
+def test_seed_fixes_sample_points(monkeypatch):
+    np.testing.assert_array_equal(verification._sample_points(12, 0),
+                                  verification._sample_points(12, 0))
+
+    # Sin semilla explícita se usa config.VERIFICATION_SEED
+    seen = []
+    original = verification._sample_points
+    monkeypatch.setattr(verification, '_sample_points',
+                        lambda count, seed=None: seen.append(seed) or original(count, seed))
+    monkeypatch.setattr(config, 'VERIFICATION_SEED', 7)
+    verify_antiderivative(sp.cos(x), sp.sin(x), x)
+    verify_antiderivative(sp.cos(x), sp.sin(x), x, seed=3)
+    assert seen == [7, 3]
+
+
+@pytest.mark.parametrize('expr, antiderivative', [
+    (sp.cos(x), sp.sin(x)),
+    (sp.cos(x), sp.sin(x) + 5),
+    (1 / x, sp.log(x)),
+    (sp.sqrt(x), 2 * x ** sp.Rational(3, 2) / 3),
+    (x * sp.exp(x), (x - 1) * sp.exp(x)),
+])
+def test_correct_antiderivative_is_verified_numerically(expr, antiderivative):
+    outcome = verify_antiderivative(expr, antiderivative, x, seed=0)
+    assert outcome['verified'] is True
+    assert outcome['method'] in ('numeric', 'mpmath')
+    assert outcome['points'] >= config.VERIFICATION_POINTS // 2
+    assert outcome['derivative'] == sp.diff(antiderivative, x)
+
+
+@pytest.mark.parametrize('expr, antiderivative', [
+    (sp.cos(x), -sp.sin(x)),
+    (sp.exp(x ** 2), sp.exp(x ** 2)),
+    (x ** 2, x ** 3 / 3 + x),
+])
+def test_wrong_antiderivative_is_refuted(expr, antiderivative):
+    outcome = verify_antiderivative(expr, antiderivative, x, seed=0)
+    assert outcome['verified'] is False
+
+
+def test_symbolic_mode_skips_sampling(monkeypatch):
+    monkeypatch.setattr(verification, '_sample_points', None)
+    outcome = verify_antiderivative(sp.cos(x), sp.sin(x), x, mode='symbolic')
+    assert (outcome['verified'], outcome['method'], outcome['points']) == (True, 'symbolic', 0)
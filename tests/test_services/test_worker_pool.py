@@ -0,0 +1,92 @@
+"""
+Tests del pool de workers: timeout, reemplazo y errores
+"""
+
+import math
+import os
+import threading
+import time
+
+import pytest
+
+from app.services.engine import EngineBusy, EngineError, EngineTimeout, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    """Pool de un solo worker para poder seguir su pid"""
+    pool = WorkerPool(1)
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_task_in_worker(pool):
+    assert pool.run(math.factorial, (10,), timeout=10) == 3628800
+    assert pool.run(os.getpid, timeout=10) != os.getpid()
+
+
+def test_timeout_replaces_worker(pool):
+    pid = pool.run(os.getpid, timeout=10)
+    started = time.monotonic()
+    with pytest.raises(EngineTimeout):
+        pool.run(time.sleep, (5,), timeout=0.5)
+    assert time.monotonic() - started < 2
+
+    # El worker colgado se mató y el nuevo atiende tareas
+    new_pid = pool.run(os.getpid, timeout=10)
+    assert new_pid != pid
+    with pytest.raises(OSError):
+        os.kill(pid, 0)
+
+
+def test_task_exception_keeps_worker(pool):
+    pid = pool.run(os.getpid, timeout=10)
+    with pytest.raises(EngineError, match='math domain error'):
+        pool.run(math.sqrt, (-1,), timeout=10)
+    assert pool.run(os.getpid, timeout=10) == pid
+
+
+def test_dead_worker_is_replaced(pool):
+    pid = pool.run(os.getpid, timeout=10)
+    with pytest.raises(EngineError):
+        pool.run(os._exit, (1,), timeout=10)
+    assert pool.run(os.getpid, timeout=10) not in (pid, None)
+
+
+def test_wait_for_worker_counts_against_budget(pool):
+    errors = []
+
+    def occupy():
+        try:
+            pool.run(time.sleep, (1.0,), timeout=10)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=occupy)
+    thread.start()
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    with pytest.raises(EngineTimeout):
+        pool.run(time.sleep, (1.0,), timeout=1.2)
+    elapsed = time.monotonic() - started
+    thread.join()
+
+    assert not errors
+    assert elapsed < 1.5
+
+
+def test_busy_pool_raises_engine_busy(pool):
+    thread = threading.Thread(target=pool.run, args=(time.sleep, (1.0,)), kwargs={'timeout': 10})
+    thread.start()
+    time.sleep(0.2)
+    with pytest.raises(EngineBusy):
+        pool.run(os.getpid, timeout=0.2)
+    thread.join()
+
+
+def test_closed_pool_rejects_tasks():
+    pool = WorkerPool(1)
+    pool.shutdown()
+    with pytest.raises(EngineError):
+        pool.run(os.getpid, timeout=1)
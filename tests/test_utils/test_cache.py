@@ -0,0 +1,67 @@
+"""
+Tests de la caché LRU con TTL
+"""
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj controlable para las expiraciones"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_get_and_counters():
+    cache = LRUCache(maxsize=4)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    assert cache.get('b', 'default') == 'default'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.set('a', 1)
+    clock[0] += 9
+    assert cache.get('a') == 1
+    clock[0] += 2
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.stats()['evictions'] == 1
+
+
+def test_set_refreshes_expiration(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.set('a', 1)
+    clock[0] += 8
+    cache.set('a', 2)
+    clock[0] += 8
+    assert cache.get('a') == 2
+
+
+def test_clear_resets_counters():
+    cache = LRUCache(maxsize=4)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.clear()
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses']) == (0, 0, 0)
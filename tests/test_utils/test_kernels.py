@@ -0,0 +1,53 @@
+"""
+Tests de la caché de kernels lambdify
+"""
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from app.utils.kernels import clear_kernel_cache, get_kernel, get_kernel_stats
+
+
+x = sp.Symbol('x')
+t = sp.Symbol('t')
+
+
+@pytest.fixture(autouse=True)
+def clean_kernel_cache():
+    clear_kernel_cache()
+    yield
+    clear_kernel_cache()
+
+
+def test_same_expression_reuses_kernel():
+    compiles = get_kernel_stats()['compiles']
+    first = get_kernel(sp.sin(x) * x)
+    second = get_kernel(sp.sympify('x*sin(x)'))
+    assert first is second
+    stats = get_kernel_stats()
+    assert stats['compiles'] == compiles + 1
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_key_includes_variable_and_assumptions():
+    assert get_kernel(t ** 2, t) is not get_kernel(x ** 2, x)
+    assert get_kernel(x ** 2) is get_kernel(x ** 2, x)
+    real_x = sp.Symbol('x', real=True)
+    assert get_kernel(real_x ** 2, real_x) is not get_kernel(x ** 2)
+
+
+def test_kernel_is_vectorized():
+    kernel = get_kernel(sp.exp(-x ** 2))
+    points = np.linspace(-1, 1, 5)
+    np.testing.assert_allclose(kernel(points), np.exp(-points ** 2))
+
+
+def test_clear_keeps_compile_counters():
+    get_kernel(sp.cos(x))
+    compiles = get_kernel_stats()['compiles']
+    clear_kernel_cache()
+    stats = get_kernel_stats()
+    assert stats['size'] == 0 and stats['compiles'] == compiles
+    get_kernel(sp.cos(x))
+    assert get_kernel_stats()['compiles'] == compiles + 1
@@ -0,0 +1,56 @@
+"""
+Tests de la impresión LaTeX memoizada
+"""
+
+import pytest
+import sympy as sp
+
+from app.utils.latex import clear_latex_cache, get_latex_cache_stats, latex, latex_scope
+
+
+x = sp.Symbol('x')
+
+
+@pytest.fixture(autouse=True)
+def clean_latex_cache():
+    clear_latex_cache()
+    yield
+    clear_latex_cache()
+
+
+def test_equal_keys_of_different_type_do_not_collide():
+    # 1 == 1.0 == True como claves de dict; el texto LaTeX es distinto
+    assert latex(1) == '1'
+    assert latex(1.0) == sp.latex(1.0)
+    assert latex(True) == sp.latex(True)
+    assert latex(sp.Integer(1)) == '1'
+    assert latex(sp.Float(1.0)) == sp.latex(sp.Float(1.0))
+    assert latex(1.0) != latex(1)
+
+
+def test_settings_are_part_of_key():
+    plain = latex(x ** 2 / 3)
+    inline = latex(x ** 2 / 3, mode='inline')
+    assert plain == sp.latex(x ** 2 / 3)
+    assert inline == sp.latex(x ** 2 / 3, mode='inline')
+    assert plain != inline
+
+
+def test_scope_memo_counts_hits():
+    with latex_scope() as scope:
+        latex(sp.sin(x))
+        latex(sp.sin(x))
+        latex(sp.cos(x))
+    assert (scope.calls, scope.hits) == (3, 1)
+
+    # El proceso conserva lo impreso para la siguiente petición
+    with latex_scope() as scope:
+        latex(sp.sin(x))
+    assert scope.hits == 1
+    assert get_latex_cache_stats()['size'] == 2
+
+
+def test_unhashable_values_bypass_cache():
+    matrix = sp.Matrix([[1, x]])
+    assert latex(matrix) == sp.latex(matrix)
+    assert get_latex_cache_stats()['size'] == 0
@@ -0,0 +1,57 @@
+"""
+Tests de los tiempos por etapa y la exportación de métricas
+"""
+
+import math
+
+from app.utils.metrics import (Histogram, increment, metrics_scope, observe_timings,
+                               render_prometheus, server_timing, timed)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (math.inf, 4)]
+    assert (histogram.count, histogram.sum) == (4, 3.65)
+
+
+def test_timed_stages_land_in_the_request_scope():
+    with metrics_scope() as scope:
+        with timed('parse'):
+            pass
+        with timed('integrate'):
+            pass
+        with timed('parse'):
+            pass
+        # Etapas medidas en un worker se suman en su orden
+        observe_timings([('procedure', 0.25)])
+    totals = scope.totals()
+    assert list(totals) == ['parse', 'integrate', 'procedure']
+    assert totals['procedure'] == 0.25
+
+    # Fuera del alcance no se registra nada en la petición
+    with timed('parse'):
+        pass
+    assert len(scope.timings) == 4
+
+
+def test_server_timing_header():
+    with metrics_scope() as scope:
+        observe_timings([('parse', 0.0004), ('integrate', 0.0128), ('parse', 0.0001)])
+    assert server_timing(scope, total=0.0151) == \
+        'parse;dur=0.500, integrate;dur=12.800, total;dur=15.100'
+    assert server_timing(scope) == 'parse;dur=0.500, integrate;dur=12.800'
+
+
+def test_prometheus_text():
+    increment('test_events', kind='a"b')
+    with timed('test_stage'):
+        pass
+    text = render_prometheus({'demo': {'hits': 3, 'misses': 1, 'evictions': 0,
+                                       'size': 2, 'hit_rate': 0.75}})
+    assert 'calculator_test_events_total{kind="a\\"b"}' in text
+    assert 'calculator_stage_seconds_bucket{stage="test_stage",le="+Inf"}' in text
+    assert 'calculator_cache_hits_total{cache="demo"} 3' in text
+    assert 'calculator_cache_hit_rate{cache="demo"} 0.75' in text
+    assert text.endswith('\n')
@@ -0,0 +1,55 @@
+"""
+Tests del parser de funciones
+"""
+
+import pytest
+import sympy as sp
+
+from app.services.integration import calculate_parametric_sweep
+from app.utils.parser import clear_parse_cache, parameter_symbol, parse_function
+
+
+x = sp.Symbol('x')
+
+
+@pytest.fixture(autouse=True)
+def clean_parse_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+@pytest.mark.parametrize('func_str, expected', [
+    ('x^2', x ** 2),
+    ('x*x', x ** 2),
+    ('sen(x)', sp.sin(x)),
+    ('tg(x)', sp.tan(x)),
+    ('2x^3 + senh(x)', 2 * x ** 3 + sp.sinh(x)),
+    ('asen(x)', sp.asin(x)),
+    ('sin(x)', sp.sin(x)),
+])
+def test_notation(func_str, expected):
+    assert parse_function(func_str) == expected
+
+
+@pytest.mark.parametrize('name', ['sena', 'tg', 'sen', 'xtg'])
+def test_parameter_names_are_not_rewritten(name):
+    symbol = parameter_symbol(name)
+    assert parse_function(f'{name}*x', (name,)) == symbol * x
+
+
+def test_sweep_with_spanish_looking_parameters():
+    result = calculate_parametric_sweep('sena*x + tg', {'sena': [1, 2], 'tg': [0, 1]},
+                                        [0], [1])
+    assert result['success'], result.get('error')
+
+
+def test_repeated_input_returns_cached_expression():
+    assert parse_function(' x^2 ') is parse_function('x^2')
+
+
+def test_invalid_input_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_function('x +* 2')
+    with pytest.raises(ValueError):
+        parse_function('a*x', ('x',))
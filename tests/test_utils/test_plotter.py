@@ -0,0 +1,52 @@
+"""
+Tests de la limpieza del directorio de gráficas
+"""
+
+import os
+import time
+
+import pytest
+
+from app.config import config
+from app.utils.plotter import _evict_plots
+
+
+@pytest.fixture
+def plots_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PLOTS_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _touch(directory, name, size=10, age=0):
+    path = directory / name
+    path.write_bytes(b'0' * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_size_limit_evicts_least_recent_png_only(plots_dir, monkeypatch):
+    monkeypatch.setattr(config, 'PLOTS_MAX_BYTES', 250)
+    old = _touch(plots_dir, 'plot_old.png', size=100, age=30)
+    new = _touch(plots_dir, 'plot_new.png', size=100, age=10)
+    temp = _touch(plots_dir, 'plot_new.png.1.2.tmp', size=100, age=60)
+    marker = _touch(plots_dir, 'plot_abc.job', size=0, age=60)
+
+    _touch(plots_dir, 'plot_newest.png', size=100)
+    _evict_plots(force=True)
+
+    assert not old.exists()
+    assert new.exists()
+    assert temp.exists() and marker.exists()
+
+
+def test_orphaned_temporaries_and_markers_expire(plots_dir):
+    temp = _touch(plots_dir, 'plot_a.png.1.2.tmp', age=config.PLOTS_MAX_AGE + 10)
+    marker = _touch(plots_dir, 'plot_b.job', age=config.PLOTS_MAX_AGE + 10)
+    stale_png = _touch(plots_dir, 'plot_c.png', age=config.PLOTS_MAX_AGE + 10)
+    other = _touch(plots_dir, 'keep.txt', age=config.PLOTS_MAX_AGE + 10)
+
+    _evict_plots(force=True)
+
+    assert not temp.exists() and not marker.exists() and not stale_png.exists()
+    assert other.exists()
@@ -0,0 +1,69 @@
+"""
+Tests del muestreo adaptativo de curvas
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.sampling import evaluate_real, sample_curve
+
+
+def _breaks(x_vals, y_vals):
+    """Devuelve las abscisas de los NaN que cortan la curva"""
+    return x_vals[np.isnan(y_vals)]
+
+
+def test_smooth_function_has_no_breaks():
+    x_vals, y_vals, (low, high) = sample_curve(np.sin, -5, 5)
+    assert np.all(np.diff(x_vals) > 0)
+    assert np.isfinite(y_vals).all()
+    assert low <= -0.99 and high >= 0.99
+
+
+@pytest.mark.parametrize('f, x_min, x_max, poles', [
+    (lambda t: 1 / t, -3, 3, [0.0]),
+    (lambda t: 1 / (t - 1.3), -2, 4, [1.3]),
+    (np.tan, -4, 4, [-np.pi / 2, np.pi / 2]),
+])
+def test_poles_are_split(f, x_min, x_max, poles):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_vals, y_vals, _ = sample_curve(f, x_min, x_max)
+    breaks = _breaks(x_vals, y_vals)
+    for pole in poles:
+        assert np.min(np.abs(breaks - pole)) < 1e-2
+    # Ningún tramo continuo atraviesa un polo
+    for pole in poles:
+        left = np.searchsorted(x_vals, pole)
+        segment = y_vals[max(left - 1, 0):left + 1]
+        assert np.isnan(segment).any() or np.isclose(x_vals[left], pole)
+
+
+def test_jump_is_split():
+    with np.errstate(invalid='ignore'):
+        x_vals, y_vals, _ = sample_curve(np.sign, -1, 1.7)
+    breaks = _breaks(x_vals, y_vals)
+    assert breaks.size >= 1
+    assert np.min(np.abs(breaks)) < 1e-2
+
+
+def test_continuous_steep_function_is_not_split():
+    _, y_vals, _ = sample_curve(lambda t: np.tanh(20 * t), -1, 1)
+    assert np.isfinite(y_vals).all()
+
+
+def test_point_budget_is_respected():
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_vals, _, _ = sample_curve(lambda t: np.sin(1 / t), -1, 1, max_points=300)
+    assert x_vals.size <= 300
+
+
+def test_no_finite_values_returns_none():
+    with np.errstate(invalid='ignore'):
+        assert sample_curve(lambda t: np.log(t), -3, -1) is None
+
+
+def test_evaluate_real_masks_invalid_values():
+    values = evaluate_real(lambda t: np.sqrt(t.astype(complex)), np.array([-1.0, 4.0]))
+    assert np.isnan(values[0])
+    assert values[1] == 4.0 ** 0.5
+    assert np.isnan(evaluate_real(lambda t: 1 / t, np.array([0.0]))).all()